@@ -0,0 +1,76 @@
+from helpers.tokens import count_tokens
+from models.db_schemes import RetrievedDocument
+from typing import List
+
+
+class ContextPacker:
+    """
+    Fits retrieved documents into a prompt token budget.
+
+    The system prompt and the footer (which holds the question) are always
+    kept whole. Documents are added best score first while they fit; the
+    ones that don't are dropped and reported. Only when not even the best
+    document fits is it cut to the remaining budget, so the model still gets
+    some context.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+
+    @staticmethod
+    def document_tokens(document: RetrievedDocument) -> int:
+        """Precomputed chunk token count, or counted now (chunks processed before it was stored)"""
+        if document.token_count is not None:
+            return document.token_count
+        return count_tokens(document.text)
+
+    def pack(self, system_prompt: str, footer_prompt: str,
+             documents: List[RetrievedDocument], document_overhead_tokens: int = 0):
+        """
+        Args:
+            system_prompt / footer_prompt: Sections kept intact
+            documents: Retrieved documents, in any order
+            document_overhead_tokens: Tokens the document template adds around each text
+
+        Returns:
+            Tuple of (packed documents best first, report dict)
+        """
+        fixed_tokens = count_tokens(system_prompt) + count_tokens(footer_prompt)
+        used_tokens = fixed_tokens
+
+        ranked = sorted(documents, key=lambda document: document.score, reverse=True)
+        packed, dropped = [], []
+
+        for rank, document in enumerate(ranked, start=1):
+            tokens = self.document_tokens(document) + document_overhead_tokens
+
+            if used_tokens + tokens > self.max_tokens:
+                dropped.append({"rank": rank, "score": document.score, "tokens": tokens})
+                continue
+
+            packed.append(document)
+            used_tokens += tokens
+
+        truncated = False
+        remaining_tokens = self.max_tokens - used_tokens - document_overhead_tokens
+        if not packed and ranked and remaining_tokens > 0:
+            document = ranked[0]
+            keep_characters = len(document.text) * remaining_tokens // max(1, self.document_tokens(document))
+            packed.append(document.model_copy(update={
+                "text": document.text[:keep_characters],
+                "token_count": remaining_tokens,
+            }))
+            used_tokens += remaining_tokens + document_overhead_tokens
+            truncated = True
+
+        report = {
+            "max_tokens": self.max_tokens,
+            "used_tokens": used_tokens,
+            "fixed_tokens": fixed_tokens,
+            "retrieved_documents": len(documents),
+            "packed_documents": len(packed),
+            "truncated": truncated,
+            "dropped_documents": dropped[1:] if truncated else dropped,
+        }
+
+        return packed, report
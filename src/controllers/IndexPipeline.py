@@ -0,0 +1,168 @@
+from typing import AsyncIterator, Awaitable, Callable, List
+from models.db_schemes import DataChunk
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel telling a stage worker that its input is exhausted
+_END = object()
+
+
+class IndexPipelineError(Exception):
+    """Raised by a pipeline stage to abort the whole push"""
+
+
+class StageStats:
+    """Items, batches and busy time of one pipeline stage"""
+
+    def __init__(self):
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def record(self, items: int, seconds: float):
+        self.items += items
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.items / self.busy_seconds, 1) if self.busy_seconds else None,
+        }
+
+
+class IndexPipeline:
+    """
+    Producer/consumer push of a project's chunks into the vector DB:
+
+        fetch pages --queue--> embed --queue--> upsert
+
+    The stages run concurrently and the bounded queues apply back-pressure, so
+    wall-clock time tends towards the slowest stage rather than the sum of all
+    three. The first stage error cancels the rest.
+    """
+
+    def __init__(self, nlp_controller, collection_name: str, tenant_id: str = None,
+                 queue_size: int = 4, embed_workers: int = 2, upsert_workers: int = 1,
+                 on_upserted: Callable[[List[DataChunk]], Awaitable] = None,
+                 bulk: bool = False):
+        self.nlp_controller = nlp_controller
+        self.bulk = bulk
+        self.on_upserted = on_upserted
+        self.collection_name = collection_name
+        self.tenant_id = tenant_id
+        self.queue_size = queue_size
+        self.embed_workers = embed_workers
+        self.upsert_workers = upsert_workers
+
+        self.stats = {
+            "fetch": StageStats(),
+            "embed": StageStats(),
+            "upsert": StageStats(),
+        }
+        self.wall_seconds = 0.0
+
+    async def run(self, chunk_pages: AsyncIterator[List[DataChunk]]) -> int:
+        """Push every page, returning the number of inserted chunks"""
+        embed_queue = asyncio.Queue(maxsize=self.queue_size)
+        upsert_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        started_at = time.perf_counter()
+
+        embed_tasks = [
+            asyncio.create_task(self._embed_stage(embed_queue, upsert_queue))
+            for _ in range(self.embed_workers)
+        ]
+        upsert_tasks = [
+            asyncio.create_task(self._upsert_stage(upsert_queue))
+            for _ in range(self.upsert_workers)
+        ]
+        tasks = [
+            asyncio.create_task(self._fetch_stage(chunk_pages, embed_queue)),
+            asyncio.create_task(self._close_after(embed_tasks, upsert_queue, self.upsert_workers)),
+            *embed_tasks,
+            *upsert_tasks,
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self.wall_seconds = time.perf_counter() - started_at
+
+        return self.stats["upsert"].items
+
+    async def _fetch_stage(self, chunk_pages, embed_queue: asyncio.Queue):
+        fetch_started_at = time.perf_counter()
+
+        async for page_chunks in chunk_pages:
+            self.stats["fetch"].record(len(page_chunks), time.perf_counter() - fetch_started_at)
+
+            # blocks while the embed stage is behind
+            await embed_queue.put(page_chunks)
+            fetch_started_at = time.perf_counter()
+
+        for _ in range(self.embed_workers):
+            await embed_queue.put(_END)
+
+    async def _embed_stage(self, embed_queue: asyncio.Queue, upsert_queue: asyncio.Queue):
+        while True:
+            page_chunks = await embed_queue.get()
+            if page_chunks is _END:
+                return
+
+            started_at = time.perf_counter()
+            vectors = await self.nlp_controller.embed_chunks(chunks=page_chunks)
+            if vectors is None:
+                raise IndexPipelineError("Embedding failed for a page of chunks")
+            self.stats["embed"].record(len(page_chunks), time.perf_counter() - started_at)
+
+            await upsert_queue.put((page_chunks, vectors))
+
+    @staticmethod
+    async def _close_after(tasks: list, queue: asyncio.Queue, workers: int):
+        """Signal end-of-input to the next stage once all of this stage's workers finish"""
+        await asyncio.gather(*tasks)
+        for _ in range(workers):
+            await queue.put(_END)
+
+    async def _upsert_stage(self, upsert_queue: asyncio.Queue):
+        while True:
+            item = await upsert_queue.get()
+            if item is _END:
+                return
+
+            page_chunks, vectors = item
+
+            started_at = time.perf_counter()
+            is_inserted = await self.nlp_controller.upsert_chunks(
+                collection_name=self.collection_name,
+                chunks=page_chunks,
+                vectors=vectors,
+                tenant_id=self.tenant_id,
+                bulk=self.bulk,
+            )
+            if not is_inserted:
+                raise IndexPipelineError("Vector DB upsert failed for a page of chunks")
+
+            if self.on_upserted:
+                await self.on_upserted(page_chunks)
+            self.stats["upsert"].record(len(page_chunks), time.perf_counter() - started_at)
+
+    def get_stats(self) -> dict:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "stages": {
+                stage: stage_stats.to_dict()
+                for stage, stage_stats in self.stats.items()
+            },
+        }
@@ -1,108 +1,572 @@
 from .BaseController import BaseController
-from models.db_schemes import Project, DataChunk
+from models.db_schemes import Project, DataChunk, RetrievedDocument
+from models import SearchModeEnum
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler
+from stores.cache import QueryEmbeddingCache, AnswerCache, AnswerCacheStatusEnum, SemanticAnswerCache
+from stores.lexical import LexicalIndexStore
+from helpers.execution import run_in_pool, ExecutionPoolEnum
+from helpers.tokens import count_tokens
+from helpers.singleflight import SingleFlight
+from .IndexPipeline import IndexPipeline, IndexPipelineError
+from .ContextPacker import ContextPacker
 from typing import List
+import asyncio
+import hashlib
+import inspect
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                embedding_client, template_parser):
+                embedding_client, template_parser,
+                embedding_scheduler: EmbeddingScheduler = None,
+                query_embedding_cache: QueryEmbeddingCache = None,
+                lexical_index: LexicalIndexStore = None,
+                answer_cache: AnswerCache = None,
+                semantic_answer_cache: SemanticAnswerCache = None,
+                single_flight: SingleFlight = None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.query_embedding_cache = query_embedding_cache
+        self.lexical_index = lexical_index
+        self.answer_cache = answer_cache
+        self.semantic_answer_cache = semantic_answer_cache
+        self.single_flight = single_flight
+        # query vectors embedded during this request, reused by the search
+        self.query_vectors = {}
+
+        self.embedding_scheduler = embedding_scheduler or EmbeddingScheduler(
+            embedding_client=embedding_client,
+            max_concurrency=self.app_settings.EMBEDDING_MAX_CONCURRENCY,
+            requests_per_minute=self.app_settings.EMBEDDING_REQUESTS_PER_MINUTE,
+            tokens_per_minute=self.app_settings.EMBEDDING_TOKENS_PER_MINUTE,
+            max_retries=self.app_settings.EMBEDDING_MAX_RETRIES,
+            backoff_base_seconds=self.app_settings.EMBEDDING_BACKOFF_BASE_SECONDS,
+            backoff_max_seconds=self.app_settings.EMBEDDING_BACKOFF_MAX_SECONDS,
+        )
 
     def create_collection_name(self, project_id: str):
+        if self.app_settings.VECTOR_DB_MULTI_TENANT:
+            return self.create_shared_collection_name(project_id=project_id)
+
         return f"collection_{project_id}".strip()
+
+    def create_shared_collection_name(self, project_id: str):
+        """Shared collection holding this project's points in multi-tenant mode"""
+        return self.shared_collection_name(
+            project_id=project_id,
+            base_name=self.app_settings.VECTOR_DB_SHARED_COLLECTION_NAME,
+            shards=self.app_settings.VECTOR_DB_TENANT_SHARDS,
+        )
+
+    @staticmethod
+    def shared_collection_name(project_id: str, base_name: str, shards: int = 1):
+        if shards <= 1:
+            return base_name
+
+        # stable across processes, unlike hash()
+        shard = int(hashlib.sha256(project_id.encode("utf-8")).hexdigest()[:8], 16) % shards
+        return f"{base_name}_{shard}"
+
+    def get_tenant_id(self, project: Project):
+        """Tenant key of the project's points (None when each project has its own collection)"""
+        if self.app_settings.VECTOR_DB_MULTI_TENANT:
+            return project.project_id
+        return None
     
-    def reset_vector_db_collection(self, project: Project):
+    async def coalesce(self, kind: str, key, fn, *args, **kwargs):
+        """Await fn, sharing one execution among identical concurrent calls (same kind and key)"""
+        if self.single_flight is None:
+            return await fn(*args, **kwargs)
+        return await self.single_flight.do(kind, key, fn, *args, **kwargs)
+
+    async def run_vectordb(self, fn, *args, **kwargs):
+        """Await an async vector DB client call, or run a blocking one on the vector DB pool"""
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        return await run_in_pool(ExecutionPoolEnum.VECTORDB, fn, *args, **kwargs)
+
+    async def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
-        return self.vectordb_client.delete_collection(collection_name=collection_name)
+        tenant_id = self.get_tenant_id(project=project)
+
+        if tenant_id is not None:
+            return await self.run_vectordb(self.vectordb_client.delete_tenant,
+                                           collection_name=collection_name,
+                                           tenant_id=tenant_id)
+
+        return await self.run_vectordb(self.vectordb_client.delete_collection,
+                                       collection_name=collection_name)
     
-    def get_vector_db_collection_info(self, project: Project):
+    async def get_vector_db_collection_info(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
-        collection_info = self.vectordb_client.get_collection_info(collection_name=collection_name)
+        collection_info = await self.run_vectordb(self.vectordb_client.get_collection_info,
+                                                  collection_name=collection_name)
 
-        return json.loads(
+        collection_info = json.loads(
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
+
+        tenant_id = self.get_tenant_id(project=project)
+        if tenant_id is not None and collection_info:
+            # the shared collection's counts cover every project
+            collection_info["project_points_count"] = await self.run_vectordb(
+                self.vectordb_client.count,
+                collection_name=collection_name,
+                tenant_id=tenant_id,
+            )
+
+        return collection_info
+
+    async def has_project_vectors(self, project: Project) -> bool:
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        tenant_id = self.get_tenant_id(project=project)
+
+        if tenant_id is not None:
+            points_count = await self.run_vectordb(self.vectordb_client.count,
+                                                   collection_name=collection_name,
+                                                   tenant_id=tenant_id)
+            return points_count > 0
+
+        return await self.run_vectordb(self.vectordb_client.is_collection_existed,
+                                       collection_name)
     
-    def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
-                                chunks_ids: List[int], 
-                                do_reset: bool = False):
-        
-        # step1: get collection name
+    async def ensure_collection(self, project: Project, do_reset: bool = False):
+        """
+        Create the project's collection if it doesn't exist. On reset, drop it
+        first, or in multi-tenant mode delete only the project's points.
+        """
         collection_name = self.create_collection_name(project_id=project.project_id)
+        multi_tenant = self.app_settings.VECTOR_DB_MULTI_TENANT
 
-        # step2: manage items
-        texts = [ c.chunk_text for c in chunks ]
-        metadata = [ c.chunk_metadata for c in  chunks]
-        vectors = [
-            self.embedding_client.embed_text(text=text, 
-                                            document_type=DocumentTypeEnum.DOCUMENT.value)
-            for text in texts
-        ]
+        if do_reset and multi_tenant:
+            _ = await self.reset_vector_db_collection(project=project)
 
-        # step3: create collection if not exists
-        _ = self.vectordb_client.create_collection(
+        _ = await self.run_vectordb(
+            self.vectordb_client.create_collection,
             collection_name=collection_name,
             embedding_size=self.embedding_client.embedding_size,
-            do_reset=do_reset,
+            do_reset=do_reset and not multi_tenant,
+            multi_tenant=multi_tenant,
+            tenant_payload_m=self.app_settings.VECTOR_DB_TENANT_PAYLOAD_M,
         )
 
-        # step4: insert into vector db
-        _ = self.vectordb_client.insert_many(
+        return collection_name
+
+    async def embed_chunks(self, chunks: List[DataChunk]):
+        """Embed chunk texts, returning None unless every chunk got a vector"""
+        texts = [ c.chunk_text for c in chunks ]
+        vectors = await self.embedding_scheduler.embed_batch(texts=texts,
+                                                    document_type=DocumentTypeEnum.DOCUMENT.value)
+
+        if not vectors or len(vectors) != len(texts):
+            return None
+
+        return vectors
+
+    async def upsert_chunks(self, collection_name: str, chunks: List[DataChunk], vectors: list,
+                            tenant_id: str = None, bulk: bool = False):
+        """
+        Upsert chunk vectors. The point ID is the chunk's DB UUID, so re-pushing
+        a chunk overwrites its point and deleted chunks can be removed by ID.
+        With bulk=True the points are uploaded without waiting (see bulk_load).
+        """
+        chunk_ids = [ c.id for c in chunks ]
+        token_counts = [ c.chunk_token_count for c in chunks ]
+
+        if bulk:
+            return await self.run_vectordb(
+                self.vectordb_client.insert_many,
+                collection_name=collection_name,
+                texts=[ c.chunk_text for c in chunks ],
+                metadata=[ c.chunk_metadata for c in chunks ],
+                vectors=vectors,
+                record_ids=chunk_ids,
+                chunk_ids=chunk_ids,
+                tenant_id=tenant_id,
+                token_counts=token_counts,
+                bulk=True,
+                batch_size=self.app_settings.VECTOR_DB_BULK_LOAD_BATCH_SIZE,
+                parallel=self.app_settings.VECTOR_DB_BULK_LOAD_PARALLEL,
+            )
+
+        return await self.run_vectordb(
+            self.vectordb_client.insert_many,
             collection_name=collection_name,
-            texts=texts,
-            metadata=metadata,
+            texts=[ c.chunk_text for c in chunks ],
+            metadata=[ c.chunk_metadata for c in chunks ],
             vectors=vectors,
-            record_ids=chunks_ids,
+            record_ids=chunk_ids,
+            chunk_ids=chunk_ids,
+            tenant_id=tenant_id,
+            token_counts=token_counts,
         )
 
-        return True
+    def use_bulk_load(self, do_reset: bool, do_bulk_load: bool = None) -> bool:
+        """
+        Bulk load pauses indexing of the whole collection, so it is never used on
+        the shared multi-tenant collection. By default only reset pushes use it.
+        """
+        if self.app_settings.VECTOR_DB_MULTI_TENANT:
+            return False
 
-    def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+        if do_bulk_load is not None:
+            return do_bulk_load
 
-        # step1: get collection name
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        return self.app_settings.VECTOR_DB_BULK_LOAD_ENABLED and do_reset
+
+    async def index_project_chunks(self, project: Project, chunk_model,
+                                   do_reset: bool = False, do_incremental: bool = False,
+                                   do_bulk_load: bool = None):
+        """
+        Push a project's chunks through the fetch -> embed -> upsert pipeline.
+
+        - reset: drop the collection and push every chunk
+        - full: upsert every chunk into the existing collection
+        - incremental: only chunks not yet indexed with the current embedding model
+
+        Vectors of chunks deleted since the last push are removed in every mode.
+        In bulk-load mode HNSW indexing is off during the upload and the push
+        only succeeds once the collection has been re-indexed.
+        Returns (inserted_count, stats), or (None, stats) on failure.
+        """
+        had_vectors = await self.has_project_vectors(project=project)
+
+        collection_name = await self.ensure_collection(project=project, do_reset=do_reset)
+
+        if do_reset:
+            push_mode = "reset"
+        elif do_incremental and had_vectors:
+            push_mode = "incremental"
+        else:
+            push_mode = "full"
+
+        bulk_load = self.use_bulk_load(do_reset=do_reset, do_bulk_load=do_bulk_load)
+
+        model_id = self.embedding_client.embedding_model_id
+        # bulk uploads aren't applied yet when upsert returns, so those chunks
+        # are marked indexed only after end_bulk_load confirms them
+        bulk_chunk_ids = []
+
+        async def mark_indexed(chunks: List[DataChunk]):
+            if bulk_load:
+                bulk_chunk_ids.extend(c.id for c in chunks)
+                return
+
+            await chunk_model.mark_chunks_indexed(
+                chunk_ids=[ c.id for c in chunks ], model_id=model_id
+            )
+
+        pipeline = IndexPipeline(
+            nlp_controller=self,
+            collection_name=collection_name,
+            tenant_id=self.get_tenant_id(project=project),
+            queue_size=self.app_settings.INDEX_PUSH_QUEUE_SIZE,
+            embed_workers=self.app_settings.INDEX_PUSH_EMBED_WORKERS,
+            upsert_workers=self.app_settings.INDEX_PUSH_UPSERT_WORKERS,
+            on_upserted=mark_indexed,
+            bulk=bulk_load,
+        )
+
+        chunk_pages = chunk_model.iter_project_chunks(
+            project_id=project.id,
+            page_size=self.app_settings.INDEX_PUSH_PAGE_SIZE,
+            pending_for_model=model_id if push_mode == "incremental" else None,
+        )
 
-        # step2: get text embedding vector
-        vector = self.embedding_client.embed_text(text=text, 
-                                                document_type=DocumentTypeEnum.QUERY.value)
+        bulk_load_seconds = None
+
+        try:
+            if bulk_load:
+                is_started = await self.run_vectordb(
+                    self.vectordb_client.begin_bulk_load, collection_name=collection_name
+                )
+                if not is_started:
+                    raise IndexPipelineError("Could not start bulk load")
+
+            try:
+                inserted_count = await pipeline.run(chunk_pages=chunk_pages)
+            finally:
+                if bulk_load:
+                    started_at = time.perf_counter()
+                    is_loaded = await self.run_vectordb(
+                        self.vectordb_client.end_bulk_load,
+                        collection_name=collection_name,
+                        timeout_seconds=self.app_settings.VECTOR_DB_BULK_LOAD_TIMEOUT_SECONDS,
+                    )
+                    bulk_load_seconds = round(time.perf_counter() - started_at, 3)
+
+            if bulk_load:
+                if not is_loaded:
+                    raise IndexPipelineError("Collection did not finish indexing after bulk load")
+
+                for i in range(0, len(bulk_chunk_ids), self.app_settings.INDEX_PUSH_PAGE_SIZE):
+                    await chunk_model.mark_chunks_indexed(
+                        chunk_ids=bulk_chunk_ids[i:i + self.app_settings.INDEX_PUSH_PAGE_SIZE],
+                        model_id=model_id,
+                    )
+
+            deleted_count = await self.delete_removed_chunks(
+                project=project,
+                chunk_model=chunk_model,
+                collection_name=collection_name,
+                # a fresh collection has no stale vectors
+                delete_vectors=push_mode != "reset",
+            )
+        except Exception as e:
+            logger.error(f"Index push failed for project {project.project_id}: {e}")
+            return None, {
+                "mode": push_mode,
+                "bulk_load": bulk_load,
+                "bulk_load_index_seconds": bulk_load_seconds,
+                **pipeline.get_stats(),
+            }
+
+        return inserted_count, {
+            "mode": push_mode,
+            "bulk_load": bulk_load,
+            "bulk_load_index_seconds": bulk_load_seconds,
+            "deleted_items_count": deleted_count,
+            **pipeline.get_stats(),
+        }
+
+    async def delete_removed_chunks(self, project: Project, chunk_model,
+                                    collection_name: str, delete_vectors: bool = True,
+                                    batch_size: int = 1000) -> int:
+        """Remove the vectors of chunks deleted from the DB since the last push"""
+        deleted_count = 0
+
+        while True:
+            chunk_ids = await chunk_model.get_deleted_chunk_ids(
+                project_id=project.id, limit=batch_size
+            )
+            if not chunk_ids:
+                break
+
+            if delete_vectors:
+                is_deleted = await self.run_vectordb(
+                    self.vectordb_client.delete_many,
+                    collection_name=collection_name,
+                    record_ids=chunk_ids,
+                )
+                if not is_deleted:
+                    raise IndexPipelineError("Deleting vectors of removed chunks failed")
+
+            await chunk_model.clear_deleted_chunk_ids(chunk_ids=chunk_ids)
+            deleted_count += len(chunk_ids)
+
+        return deleted_count
+
+    async def embed_query(self, text: str):
+        """Embed a search query, serving repeats from the in-memory query cache"""
+        model_id = self.embedding_client.embedding_model_id
+
+        if text in self.query_vectors:
+            return self.query_vectors[text]
+
+        if self.query_embedding_cache:
+            vector = self.query_embedding_cache.get(text=text, model_id=model_id)
+            if vector is not None:
+                return vector
+
+        vector = await self.coalesce(
+            "embedding", (model_id, QueryEmbeddingCache.normalize_query(text)),
+            self.embedding_scheduler.embed_text,
+            text=text, document_type=DocumentTypeEnum.QUERY.value,
+        )
+
+        if vector and self.query_embedding_cache:
+            self.query_embedding_cache.set(text=text, model_id=model_id, vector=vector)
+
+        if vector:
+            self.query_vectors[text] = vector
+        return vector
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          mode: str = None, chunk_model=None):
+        """
+        Retrieve a project's chunks for a query in one of the SearchModeEnum
+        modes (SEARCH_MODE by default). Lexical search needs chunk_model to
+        build the project's BM25 index; without it (or with the lexical index
+        disabled) every mode is dense.
+
+        When the query can't be embedded (provider down or erroring), dense
+        mode answers from the lexical index instead. Identical concurrent
+        searches share one execution.
+        """
+        mode = mode or self.app_settings.SEARCH_MODE
+        search_key = (project.id, project.index_version, QueryEmbeddingCache.normalize_query(text),
+                      limit, mode, chunk_model is not None)
+
+        return await self.coalesce("search", search_key, self.search_by_mode,
+                                   project=project, text=text, limit=limit,
+                                   mode=mode, chunk_model=chunk_model)
+
+    async def search_by_mode(self, project: Project, text: str, limit: int, mode: str, chunk_model=None):
+        has_lexical = self.lexical_index is not None and chunk_model is not None
+
+        if has_lexical and mode == SearchModeEnum.LEXICAL.value:
+            return await self.search_lexical(project=project, text=text, limit=limit,
+                                             chunk_model=chunk_model)
+
+        if has_lexical and mode == SearchModeEnum.HYBRID.value:
+            return await self.search_hybrid(project=project, text=text, limit=limit,
+                                            chunk_model=chunk_model)
+
+        if not has_lexical:
+            return await self.search_dense(project=project, text=text, limit=limit)
+
+        try:
+            vector = await self.embed_query(text=text)
+        except Exception as e:
+            logger.warning(f"Query embedding failed, falling back to lexical search: {e}")
+            vector = None
+
+        if not vector:
+            return await self.search_lexical(project=project, text=text, limit=limit,
+                                             chunk_model=chunk_model)
+
+        return await self.search_by_vector(project=project, vector=vector, limit=limit)
+
+    async def search_dense(self, project: Project, text: str, limit: int = 10):
+
+        # step1: get text embedding vector
+        vector = await self.embed_query(text=text)
 
         if not vector or len(vector) == 0:
             return False
 
-        # step3: do semantic search
-        results = self.vectordb_client.search_by_vector(
+        # step2: do semantic search
+        return await self.search_by_vector(project=project, vector=vector, limit=limit)
+
+    async def search_by_vector(self, project: Project, vector: list, limit: int = 10):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        results = await self.run_vectordb(
+            self.vectordb_client.search_by_vector,
             collection_name=collection_name,
             vector=vector,
-            limit=limit
+            limit=limit,
+            tenant_id=self.get_tenant_id(project=project)
         )
 
         if not results:
             return False
 
         return results
-    
-    def answer_rag_question(self, project: Project, query: str, limit: int = 10):
-        
-        answer, full_prompt, chat_history = None, None, None
 
-        # step1: retrieve related documents
-        retrieved_documents = self.search_vector_db_collection(
-            project=project,
-            text=query,
+    async def search_lexical(self, project: Project, text: str, limit: int, chunk_model):
+        """BM25 search over the project's chunk texts (no embedding call)"""
+        index = await self.lexical_index.get_index(project_id=project.id, chunk_model=chunk_model)
+
+        results = [
+            RetrievedDocument(score=score, text=chunk_text, metadata=metadata, token_count=token_count)
+            for score, chunk_text, metadata, token_count in index.search(text=text, limit=limit)
+        ]
+
+        return results or False
+
+    async def search_hybrid(self, project: Project, text: str, limit: int, chunk_model):
+        """
+        Fuse dense and lexical results with reciprocal rank fusion. The dense
+        half gets HYBRID_DENSE_TIMEOUT_SECONDS; if it is slower or fails, the
+        lexical results are returned alone (the dense search keeps running,
+        so its query embedding still lands in the cache).
+        """
+        candidates = max(limit, self.app_settings.HYBRID_CANDIDATES)
+
+        dense_task = asyncio.ensure_future(
+            self.search_dense(project=project, text=text, limit=candidates)
+        )
+        # consume the outcome of an abandoned task
+        dense_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+        lexical_results = await self.search_lexical(project=project, text=text, limit=candidates,
+                                                    chunk_model=chunk_model)
+
+        try:
+            dense_results = await asyncio.wait_for(
+                asyncio.shield(dense_task),
+                timeout=self.app_settings.HYBRID_DENSE_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Dense search timed out, answering from lexical search")
+            dense_results = None
+        except Exception as e:
+            logger.warning(f"Dense search failed, answering from lexical search: {e}")
+            dense_results = None
+
+        results = self.reciprocal_rank_fusion(
+            [ dense_results or [], lexical_results or [] ],
+            k=self.app_settings.HYBRID_RRF_K,
             limit=limit,
         )
 
-        if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+        return results or False
+
+    @staticmethod
+    def reciprocal_rank_fusion(result_lists: list, k: int = 60, limit: int = 10) -> list:
+        """
+        Score each document by sum(1 / (k + rank)) over the result lists it
+        appears in. Documents are matched on their text, since lexical results
+        come from chunks and dense results from vector DB payloads.
+        """
+        fused = {}
+        for results in result_lists:
+            seen = set()
+            for rank, document in enumerate(results, start=1):
+                # duplicate chunk texts count once per list, at their best rank
+                if document.text in seen:
+                    continue
+                seen.add(document.text)
+
+                score, first_seen = fused.get(document.text, (0.0, document))
+                fused[document.text] = (score + 1.0 / (k + rank), first_seen)
+
+        top = sorted(fused.values(), key=lambda item: item[0], reverse=True)[:limit]
+        return [
+            document.model_copy(update={"score": score})
+            for score, document in top
+        ]
+    
+    def pack_rag_context(self, query: str, retrieved_documents: list):
+        """
+        Keep the retrieved documents that fit RAG_CONTEXT_MAX_TOKENS together
+        with the system prompt and the question
+
+        Returns:
+            Tuple of (packed documents, best first; packing report)
+        """
+        system_prompt = self.template_parser.get("rag", "system_prompt")
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
+            "query": query
+        })
+        # template text around each chunk, plus the newline joining documents
+        document_overhead_tokens = count_tokens(self.template_parser.get("rag", "document_prompt", {
+            "doc_num": len(retrieved_documents),
+            "chunk_text": "",
+        })) + 1
+
+        packer = ContextPacker(max_tokens=self.app_settings.RAG_CONTEXT_MAX_TOKENS)
+        return packer.pack(
+            system_prompt=system_prompt,
+            footer_prompt=footer_prompt,
+            documents=retrieved_documents,
+            document_overhead_tokens=document_overhead_tokens,
+        )
+
+    def construct_rag_prompt(self, query: str, retrieved_documents: list):
         
-        # step2: Construct LLM prompt
+        # step1: Construct LLM prompt
         system_prompt = self.template_parser.get("rag", "system_prompt")
 
         documents_prompts = "\n".join([
@@ -117,7 +581,7 @@ class NLPController(BaseController):
             "query":query
         })
 
-        # step3: Construct Generation Client Prompts
+        # step2: Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
                 prompt=system_prompt,
@@ -127,10 +591,390 @@ class NLPController(BaseController):
 
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
+        return full_prompt, chat_history
+
+    def prompt_template_version(self) -> str:
+        """Fingerprint of the RAG templates (in the current language) and the context budget"""
+        placeholders = {"doc_num": "$doc_num", "chunk_text": "$chunk_text", "query": "$query"}
+        templates = [
+            self.template_parser.language,
+            str(self.app_settings.RAG_CONTEXT_MAX_TOKENS),
+        ] + [
+            self.template_parser.get("rag", key, placeholders)
+            for key in ("system_prompt", "document_prompt", "footer_prompt")
+        ]
+        return hashlib.sha256("\x1f".join(templates).encode("utf-8")).hexdigest()[:16]
+
+    def answer_cache_key(self, project: Project, query: str, limit: int, mode: str = None) -> str:
+        return AnswerCache.make_key(
+            project_id=project.id,
+            query=query,
+            limit=limit,
+            mode=mode or self.app_settings.SEARCH_MODE,
+            generation_model_id=self.generation_client.generation_model_id,
+            prompt_version=self.prompt_template_version(),
+            index_version=project.index_version,
+        )
+
+    def answer_variant(self, limit: int, mode: str = None) -> str:
+        """What, besides the query, an answer depends on (semantic cache entries must match it)"""
+        return "\x1f".join([
+            str(limit),
+            mode or self.app_settings.SEARCH_MODE,
+            str(self.generation_client.generation_model_id),
+            self.prompt_template_version(),
+        ])
+
+    async def find_similar_answer(self, project: Project, query: str, limit: int, mode: str = None):
+        """
+        Look the query's embedding up in the semantic answer cache. Lexical
+        searches skip it, since they are meant to need no embedding call.
+
+        Returns:
+            Tuple of (cached answer dict or None, query vector or None)
+        """
+        if (mode or self.app_settings.SEARCH_MODE) == SearchModeEnum.LEXICAL.value:
+            return None, None
+
+        try:
+            vector = await self.embed_query(text=query)
+        except Exception as e:
+            logger.warning(f"Query embedding failed, skipping the semantic answer cache: {e}")
+            return None, None
+
+        if not vector:
+            return None, None
+
+        found = self.semantic_answer_cache.get(
+            project_id=project.id,
+            index_version=project.index_version,
+            variant=self.answer_variant(limit=limit, mode=mode),
+            vector=vector,
+        )
+        if found is None:
+            return None, vector
+
+        cached, similarity = found
+        logger.debug(f"Semantic answer cache hit for project {project.project_id} "
+                     f"(similarity {similarity:.3f})")
+        return cached, vector
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  mode: str = None, chunk_model=None):
+        """
+        Answer from the answer caches when the same question (exact cache) or
+        a close paraphrase (semantic cache) was answered for the project's
+        current index version, else retrieve and generate.
+
+        Returns:
+            Tuple of (answer, full_prompt, chat_history, context report,
+            AnswerCacheStatusEnum value); all but the status are None when
+            nothing was retrieved
+        """
+        cache_key = None
+        if self.answer_cache is not None:
+            cache_key = self.answer_cache_key(project=project, query=query, limit=limit, mode=mode)
+            cached = await self.answer_cache.get(cache_key)
+            if cached is not None:
+                return cached["answer"], cached["full_prompt"], cached["chat_history"], \
+                    cached["context"], AnswerCacheStatusEnum.HIT.value
+
+        query_vector = None
+        if self.semantic_answer_cache is not None:
+            cached, query_vector = await self.find_similar_answer(project=project, query=query,
+                                                                  limit=limit, mode=mode)
+            if cached is not None:
+                return cached["answer"], cached["full_prompt"], cached["chat_history"], \
+                    cached["context"], AnswerCacheStatusEnum.SEMANTIC_HIT.value
+
+        answer, full_prompt, chat_history, context_report = await self.coalesce(
+            "answer", cache_key or self.answer_cache_key(project=project, query=query, limit=limit, mode=mode),
+            self.generate_rag_answer,
+            project=project, query=query, limit=limit, mode=mode, chunk_model=chunk_model,
+        )
+
+        if cache_key is None and query_vector is None:
+            return answer, full_prompt, chat_history, context_report, AnswerCacheStatusEnum.BYPASS.value
+
+        if answer:
+            await self.cache_answer(project=project, limit=limit, mode=mode,
+                                    cache_key=cache_key, query_vector=query_vector, cached={
+                                        "answer": answer,
+                                        "full_prompt": full_prompt,
+                                        "chat_history": chat_history,
+                                        "context": context_report,
+                                    })
+
+        return answer, full_prompt, chat_history, context_report, AnswerCacheStatusEnum.MISS.value
+
+    async def cache_answer(self, project: Project, limit: int, mode: str,
+                           cache_key: str, query_vector: list, cached: dict):
+        """Store an answer in the exact (by key) and semantic (by query vector) caches"""
+        if cache_key is not None and self.answer_cache is not None:
+            await self.answer_cache.set(cache_key, cached)
+
+        if query_vector is not None and self.semantic_answer_cache is not None:
+            self.semantic_answer_cache.set(
+                project_id=project.id,
+                index_version=project.index_version,
+                variant=self.answer_variant(limit=limit, mode=mode),
+                vector=query_vector,
+                value=cached,
+            )
+
+    async def generate_rag_answer(self, project: Project, query: str, limit: int = 10,
+                                  mode: str = None, chunk_model=None):
+        """
+        Returns:
+            Tuple of (answer, full_prompt, chat_history, context report),
+            all None when nothing was retrieved
+        """
+        
+        answer, full_prompt, chat_history, context_report = None, None, None, None
+
+        # step1: retrieve related documents
+        retrieved_documents = await self.search_vector_db_collection(
+            project=project,
+            text=query,
+            limit=limit,
+            mode=mode,
+            chunk_model=chunk_model,
+        )
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            return answer, full_prompt, chat_history, context_report
+        
+        return await self.generate_answer_from_documents(query=query,
+                                                         retrieved_documents=retrieved_documents)
+
+    async def generate_answer_from_documents(self, query: str, retrieved_documents: list):
+        """
+        Returns:
+            Tuple of (answer, full_prompt, chat_history, context report)
+        """
+        # step2: Construct LLM prompt from what fits the token budget
+        retrieved_documents, context_report = self.pack_rag_context(
+            query=query,
+            retrieved_documents=retrieved_documents,
+        )
+        full_prompt, chat_history = self.construct_rag_prompt(
+            query=query,
+            retrieved_documents=retrieved_documents,
+        )
+
+        # step3: Retrieve the Answer
+        answer = await self.generation_client.agenerate_text(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+        return answer, full_prompt, chat_history, context_report
+
+    async def embed_queries(self, texts: list) -> list:
+        """
+        Embed several queries in one batched call (repeats served from the
+        query cache). Returns one vector per text, None where embedding failed.
+        """
+        model_id = self.embedding_client.embedding_model_id
+        vectors = [
+            self.query_embedding_cache.get(text=text, model_id=model_id) if self.query_embedding_cache else None
+            for text in texts
+        ]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            try:
+                embedded = await self.embedding_scheduler.embed_batch(
+                    texts=[texts[i] for i in missing],
+                    document_type=DocumentTypeEnum.QUERY.value,
+                )
+            except Exception as e:
+                logger.warning(f"Batch query embedding failed: {e}")
+                embedded = None
+
+            for i, vector in zip(missing, embedded or []):
+                vectors[i] = vector or None
+                if vector and self.query_embedding_cache:
+                    self.query_embedding_cache.set(text=texts[i], model_id=model_id, vector=vector)
+
+        return vectors
+
+    async def answer_rag_batch(self, project: Project, questions: List[str], limit: int = 10,
+                               mode: str = None, chunk_model=None):
+        """
+        Answer a list of questions, yielding one result dict per question in
+        completion order: index (position in questions), question, and either
+        answer, context and cache, or error.
+
+        Cached answers come out first. The other questions are embedded in
+        one batched call and searched with one batched vector search, then
+        generated at most BATCH_ANSWER_CONCURRENCY at a time.
+        """
+        mode = mode or self.app_settings.SEARCH_MODE
+        has_lexical = self.lexical_index is not None and chunk_model is not None
+        uses_vectors = not (has_lexical and mode == SearchModeEnum.LEXICAL.value)
+        candidates = limit
+        if has_lexical and mode == SearchModeEnum.HYBRID.value:
+            candidates = max(limit, self.app_settings.HYBRID_CANDIDATES)
+
+        def result(index: int, cached: dict, cache_status: str) -> dict:
+            return {
+                "index": index,
+                "question": questions[index],
+                "answer": cached["answer"],
+                "context": cached["context"],
+                "cache": cache_status,
+            }
+
+        def error(index: int, message: str) -> dict:
+            return {
+                "index": index,
+                "question": questions[index],
+                "error": message,
+            }
+
+        pending = []
+        cache_keys = {}
+        for index, question in enumerate(questions):
+            if self.answer_cache is not None:
+                cache_keys[index] = self.answer_cache_key(project=project, query=question,
+                                                          limit=limit, mode=mode)
+                cached = await self.answer_cache.get(cache_keys[index])
+                if cached is not None:
+                    yield result(index, cached, AnswerCacheStatusEnum.HIT.value)
+                    continue
+            pending.append(index)
+
+        # step1: one embedding call and one vector search for every uncached question
+        vectors, dense_results = {}, {}
+        if pending and uses_vectors:
+            embedded = await self.embed_queries([questions[index] for index in pending])
+            vectors = {index: vector for index, vector in zip(pending, embedded) if vector}
+
+            if self.semantic_answer_cache is not None:
+                variant = self.answer_variant(limit=limit, mode=mode)
+                for index in list(pending):
+                    found = index in vectors and self.semantic_answer_cache.get(
+                        project_id=project.id, index_version=project.index_version,
+                        variant=variant, vector=vectors[index],
+                    )
+                    if found:
+                        pending.remove(index)
+                        yield result(index, found[0], AnswerCacheStatusEnum.SEMANTIC_HIT.value)
+
+            searchable = [index for index in pending if index in vectors]
+            if searchable:
+                batch_results = await self.run_vectordb(
+                    self.vectordb_client.search_by_vectors,
+                    collection_name=self.create_collection_name(project_id=project.project_id),
+                    vectors=[vectors[index] for index in searchable],
+                    limit=candidates,
+                    tenant_id=self.get_tenant_id(project=project),
+                )
+                dense_results = dict(zip(searchable, batch_results or []))
+
+        async def retrieve(index: int):
+            question = questions[index]
+            dense = dense_results.get(index)
+
+            if not has_lexical:
+                return dense
+            if mode == SearchModeEnum.DENSE.value and index in vectors:
+                return dense
+
+            # lexical mode, hybrid, or dense without an embedding
+            lexical = await self.search_lexical(project=project, text=question,
+                                                limit=candidates, chunk_model=chunk_model)
+            if mode != SearchModeEnum.HYBRID.value:
+                return lexical
+
+            return self.reciprocal_rank_fusion(
+                [ dense or [], lexical or [] ],
+                k=self.app_settings.HYBRID_RRF_K,
+                limit=limit,
+            )
+
+        semaphore = asyncio.Semaphore(self.app_settings.BATCH_ANSWER_CONCURRENCY)
+
+        async def answer_one(index: int) -> dict:
+            question = questions[index]
+            async with semaphore:
+                try:
+                    retrieved_documents = await retrieve(index)
+                    if not retrieved_documents:
+                        return error(index, "No documents retrieved")
+
+                    answer, full_prompt, chat_history, context_report = \
+                        await self.generate_answer_from_documents(query=question,
+                                                                  retrieved_documents=retrieved_documents)
+                except Exception as e:
+                    logger.error(f"Batch answer {index} failed: {e}")
+                    return error(index, str(e))
+
+            if not answer:
+                return error(index, "LLM returned no answer")
+
+            cached = {
+                "answer": answer,
+                "full_prompt": full_prompt,
+                "chat_history": chat_history,
+                "context": context_report,
+            }
+            await self.cache_answer(project=project, limit=limit, mode=mode,
+                                    cache_key=cache_keys.get(index),
+                                    query_vector=vectors.get(index), cached=cached)
+
+            cache_status = AnswerCacheStatusEnum.MISS.value
+            if self.answer_cache is None and self.semantic_answer_cache is None:
+                cache_status = AnswerCacheStatusEnum.BYPASS.value
+            return result(index, cached, cache_status)
+
+        tasks = [asyncio.ensure_future(answer_one(index)) for index in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # the client went away: stop generating
+            for task in tasks:
+                task.cancel()
+
+    async def stream_rag_answer(self, project: Project, query: str, limit: int = 10,
+                                mode: str = None, chunk_model=None):
+        """
+        Retrieve documents for a query and start a streaming generation
+
+        Returns:
+            Tuple of (documents in the prompt, token_stream, context report);
+            token_stream is an async generator of text pieces, or None when
+            nothing was retrieved
+        """
+
+        # step1: retrieve related documents
+        retrieved_documents = await self.search_vector_db_collection(
+            project=project,
+            text=query,
+            limit=limit,
+            mode=mode,
+            chunk_model=chunk_model,
+        )
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            return None, None, None
+
+        # step2: Construct LLM prompt from what fits the token budget
+        retrieved_documents, context_report = self.pack_rag_context(
+            query=query,
+            retrieved_documents=retrieved_documents,
+        )
+        full_prompt, chat_history = self.construct_rag_prompt(
+            query=query,
+            retrieved_documents=retrieved_documents,
+        )
+
+        # step3: Stream the Answer
+        token_stream = self.generation_client.astream_text(
             prompt=full_prompt,
             chat_history=chat_history
         )
 
-        return answer, full_prompt, chat_history
\ No newline at end of file
+        return retrieved_documents, token_stream, context_report
@@ -3,6 +3,7 @@ from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from models import ProcessingEnum
+from helpers.tokens import count_tokens
 import tempfile
 import os
 
@@ -109,4 +110,36 @@ class ProcessController(BaseController):
             metadatas=file_content_metadata
         )
 
-        return chunks
\ No newline at end of file
+        return chunks
+
+
+def load_and_split_file(project_id: str, file_bytes: bytes, file_id: str,
+                        chunk_size: int, overlap_size: int):
+    """
+    Parse a file and split it into chunks.
+
+    Module-level so it can run on the CPU process pool; returns plain
+    (page_content, metadata, token_count) tuples, or None if the file could
+    not be loaded.
+    """
+    process_controller = ProcessController(project_id=project_id)
+
+    file_content = process_controller.get_file_content_from_bytes(
+        file_bytes=file_bytes,
+        file_id=file_id
+    )
+
+    if file_content is None:
+        return None
+
+    file_chunks = process_controller.process_file_content(
+        file_content=file_content,
+        file_id=file_id,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size
+    )
+
+    return [
+        (chunk.page_content, chunk.metadata, count_tokens(chunk.page_content))
+        for chunk in file_chunks
+    ]
@@ -1,4 +1,4 @@
 from .DataController import DataController
 from .ProjectController import ProjectController
-from .ProcessController import ProcessController
+from .ProcessController import ProcessController, load_and_split_file
 from .NLPController import NLPController
\ No newline at end of file
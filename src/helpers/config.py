@@ -24,6 +24,17 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = os.environ.get("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.environ.get("SUPABASE_KEY", "")
     SUPABASE_BUCKET: str = "rag-files"
+    SUPABASE_DB_TIMEOUT_SECONDS: float = 30.0
+    SUPABASE_DB_MAX_CONNECTIONS: int = 50
+    SUPABASE_DB_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    # Data backend for the model layer: "SUPABASE" (PostgREST) or "POSTGRES" (direct asyncpg pool)
+    DATA_BACKEND: str = "SUPABASE"
+    POSTGRES_DSN: Optional[str] = None
+    POSTGRES_POOL_MIN_SIZE: int = 2
+    POSTGRES_POOL_MAX_SIZE: int = 10
+    POSTGRES_COMMAND_TIMEOUT_SECONDS: float = 30.0
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
     
     # LLM Config - Generation uses OpenRouter, Embeddings use Gemini
     GENERATION_BACKEND: str = "OPENROUTER"
@@ -43,12 +54,154 @@ class Settings(BaseSettings):
     GENERATION_DEFAULT_MAX_TOKENS: Optional[int] = 500
     GENERATION_DEFAULT_TEMPERATURE: Optional[float] = 0.7
 
+    # RAG prompts are packed to RAG_CONTEXT_MAX_TOKENS (system prompt + question always
+    # kept, chunks added best first); INPUT_DEFAULT_MAX_CHARACTERS only limits embedding
+    # input. Set GENERATION_INPUT_MAX_CHARACTERS to also hard-cut generation prompts.
+    RAG_CONTEXT_MAX_TOKENS: int = 3000
+    GENERATION_INPUT_MAX_CHARACTERS: Optional[int] = None
+
+    # Generation targets in fallback order, a JSON list of {"provider", "model", "api_key"}
+    # (api_key defaults to the provider's key); empty = GENERATION_BACKEND only. An attempt
+    # slower than the GENERATION_HEDGE_PERCENTILE of its target's recent latencies (the
+    # default delay until GENERATION_HEDGE_MIN_SAMPLES) is hedged on the next target.
+    GENERATION_TARGETS: List[dict] = []
+    GENERATION_HEDGE_ENABLED: bool = True
+    GENERATION_HEDGE_PERCENTILE: float = 0.95
+    GENERATION_HEDGE_MIN_SAMPLES: int = 20
+    GENERATION_HEDGE_DEFAULT_DELAY_SECONDS: float = 10.0
+    GENERATION_HEDGE_MIN_DELAY_SECONDS: float = 0.5
+    GENERATION_MAX_IN_FLIGHT: int = 2
+
+    # Pooled async HTTP client shared by the LLM providers
+    LLM_HTTP_TIMEOUT_SECONDS: float = 60.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_HTTP2_ENABLED: bool = True
+
+    # Embedding scheduler - concurrency, per provider/key budgets and retries
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_REQUESTS_PER_MINUTE: int = 100
+    EMBEDDING_TOKENS_PER_MINUTE: int = 1000000
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_BACKOFF_BASE_SECONDS: float = 1.0
+    EMBEDDING_BACKOFF_MAX_SECONDS: float = 30.0
+
+    # Persistent embedding cache (SQLite, packed float32 vectors, LRU by size)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "assets/cache/embeddings.sqlite3"
+    EMBEDDING_CACHE_MAX_SIZE_BYTES: int = 536870912
+
+    # In-memory query embedding cache for /index/search and /index/answer
+    QUERY_EMBEDDING_CACHE_ENABLED: bool = True
+    QUERY_EMBEDDING_CACHE_MAX_SIZE_BYTES: int = 67108864
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 86400
+
+    # Exact-match answer cache for /index/answer, keyed on the project's index version
+    # (bumped on process, push and asset deletion). "LRU" is per worker, "REDIS" shared.
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_BACKEND: str = "LRU"
+    ANSWER_CACHE_MAX_ENTRIES: int = 1024
+    ANSWER_CACHE_TTL_SECONDS: Optional[int] = 3600
+    ANSWER_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Semantic answer cache: reuse the answer of an earlier query whose embedding has at
+    # least this cosine similarity (same project, limit, mode, model and index version)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES_PER_PROJECT: int = 512
+    SEMANTIC_CACHE_MAX_PROJECTS: int = 64
+
+    # Coalesce identical concurrent query embeddings, searches and answers into one call
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # /index/answer/batch: questions per request, answers generated at once
+    BATCH_ANSWER_MAX_QUESTIONS: int = 1000
+    BATCH_ANSWER_CONCURRENCY: int = 8
+
+    # Lexical (BM25) search over chunk texts with Arabic normalization, one in-memory
+    # index per recently searched project, rebuilt after LEXICAL_INDEX_TTL_SECONDS
+    LEXICAL_INDEX_ENABLED: bool = True
+    LEXICAL_INDEX_MAX_PROJECTS: int = 32
+    LEXICAL_INDEX_TTL_SECONDS: Optional[int] = 600
+    LEXICAL_BM25_K1: float = 1.2
+    LEXICAL_BM25_B: float = 0.75
+
+    # Default search mode: "dense", "lexical" or "hybrid" (reciprocal rank fusion of the
+    # top HYBRID_CANDIDATES of both; lexical only if dense takes over HYBRID_DENSE_TIMEOUT_SECONDS)
+    SEARCH_MODE: str = "dense"
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATES: int = 20
+    HYBRID_DENSE_TIMEOUT_SECONDS: Optional[float] = 2.0
+
+    # Page size for scanning a project's chunks during /index/push (keyset pagination)
+    INDEX_PUSH_PAGE_SIZE: int = 200
+    # Pipelined push: bounded queue size between stages and workers per stage
+    INDEX_PUSH_QUEUE_SIZE: int = 4
+    INDEX_PUSH_EMBED_WORKERS: int = 2
+    INDEX_PUSH_UPSERT_WORKERS: int = 1
+
+    # Bounded executors for blocking work inside async routes
+    EXECUTOR_STORAGE_WORKERS: int = 8
+    EXECUTOR_DATABASE_WORKERS: int = 16
+    EXECUTOR_VECTORDB_WORKERS: int = 8
+    EXECUTOR_CPU_WORKERS: int = 2
+
+    # Fake provider (GENERATION_BACKEND / EMBEDDING_BACKEND = "FAKE") for offline runs
+    FAKE_LLM_LATENCY_SECONDS: float = 0.0
+    FAKE_LLM_RATE_LIMIT_ERROR_RATE: float = 0.0
+    FAKE_LLM_MAX_REQUESTS_PER_MINUTE: Optional[int] = None
+
     # Qdrant Cloud Config
     VECTOR_DB_BACKEND: str = "QDRANT"
     QDRANT_URL: Optional[str] = os.environ.get("QDRANT_URL", None)
     QDRANT_API_KEY: Optional[str] = os.environ.get("QDRANT_API_KEY", None)
     VECTOR_DB_DISTANCE_METHOD: Optional[str] = "cosine"
 
+    # LOCAL backend: memory-mapped float32/float16 matrices under LOCAL_VECTOR_DB_PATH, brute-force
+    # search; collections of LOCAL_VECTOR_DB_HNSW_THRESHOLD+ points use hnswlib when installed
+    LOCAL_VECTOR_DB_PATH: str = "local_vectordb"
+    LOCAL_VECTOR_DB_DTYPE: str = "float32"
+    LOCAL_VECTOR_DB_HNSW_THRESHOLD: Optional[int] = 50000
+
+    # PGVECTOR backend: embeddings in Postgres next to the chunks (migrations/004_pgvector.sql),
+    # on the POSTGRES_DSN pool; async only; needs pgvector 0.8+ for PGVECTOR_ITERATIVE_SCAN
+    PGVECTOR_EF_SEARCH: Optional[int] = 100
+    PGVECTOR_ITERATIVE_SCAN: Optional[str] = "relaxed_order"
+
+    # Async Qdrant client for the API (awaited on the event loop, optionally over gRPC)
+    VECTOR_DB_ASYNC_CLIENT: bool = True
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_TIMEOUT_SECONDS: Optional[int] = None
+
+    # Multi-tenant mode: all projects share one collection (or VECTOR_DB_TENANT_SHARDS
+    # collections), partitioned by a project_id payload index with per-tenant HNSW graphs
+    VECTOR_DB_MULTI_TENANT: bool = False
+    VECTOR_DB_SHARED_COLLECTION_NAME: str = "rag_chunks"
+    VECTOR_DB_TENANT_SHARDS: int = 1
+    VECTOR_DB_TENANT_PAYLOAD_M: int = 16
+
+    # Vector storage of new collections. Quantization ("none", "scalar" int8, "binary")
+    # keeps compact vectors in RAM; searches rescore candidates with the originals,
+    # which can stay on disk (VECTOR_DB_VECTORS_ON_DISK)
+    VECTOR_DB_QUANTIZATION: str = "none"
+    VECTOR_DB_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_DB_VECTORS_ON_DISK: bool = False
+    VECTOR_DB_HNSW_M: int = 16
+    VECTOR_DB_HNSW_EF_CONSTRUCT: int = 100
+    VECTOR_DB_HNSW_ON_DISK: bool = False
+    VECTOR_DB_SEARCH_HNSW_EF: Optional[int] = None
+    VECTOR_DB_SEARCH_RESCORE: bool = True
+    VECTOR_DB_SEARCH_OVERSAMPLING: float = 2.0
+
+    # Bulk load: reset pushes into per-project collections upload with HNSW indexing
+    # off and build the index once at the end
+    VECTOR_DB_BULK_LOAD_ENABLED: bool = True
+    VECTOR_DB_BULK_LOAD_BATCH_SIZE: int = 256
+    VECTOR_DB_BULK_LOAD_PARALLEL: int = 1
+    VECTOR_DB_BULK_LOAD_TIMEOUT_SECONDS: int = 600
+
     PRIMARY_LANG: str = "ar"
     DEFAULT_LANG: str = "ar"
     
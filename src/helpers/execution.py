@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from helpers.config import get_settings
+import asyncio
+import logging
+import multiprocessing
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionPoolEnum(Enum):
+    STORAGE = "storage"      # Supabase Storage uploads/downloads
+    DATABASE = "database"    # PostgREST .execute() calls
+    VECTORDB = "vectordb"    # Vector DB client calls
+    CPU = "cpu"              # Document parsing and splitting (process pool)
+
+
+class BoundedPool:
+    """Executor wrapper that tracks in-flight work so queue depth can be reported"""
+
+    def __init__(self, name: str, executor, max_workers: int):
+        self.name = name
+        self.executor = executor
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            result = await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+        return result
+
+    def get_stats(self) -> dict:
+        in_flight = self.in_flight
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.max_workers),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutionPools:
+    """
+    One bounded pool per class of blocking work, so a slow upload or a large
+    PDF parse only queues behind work of the same kind. Network I/O runs on
+    thread pools; CPU-bound parsing runs on a process pool.
+    """
+
+    def __init__(self, storage_workers: int, database_workers: int,
+                 vectordb_workers: int, cpu_workers: int):
+        self.pools = {
+            ExecutionPoolEnum.STORAGE: self._thread_pool(ExecutionPoolEnum.STORAGE, storage_workers),
+            ExecutionPoolEnum.DATABASE: self._thread_pool(ExecutionPoolEnum.DATABASE, database_workers),
+            ExecutionPoolEnum.VECTORDB: self._thread_pool(ExecutionPoolEnum.VECTORDB, vectordb_workers),
+            ExecutionPoolEnum.CPU: BoundedPool(
+                name=ExecutionPoolEnum.CPU.value,
+                # spawn: forking a process that already runs event-loop and pool threads is unsafe
+                executor=ProcessPoolExecutor(max_workers=cpu_workers,
+                                             mp_context=multiprocessing.get_context("spawn")),
+                max_workers=cpu_workers,
+            ),
+        }
+
+    @staticmethod
+    def _thread_pool(pool: ExecutionPoolEnum, max_workers: int) -> BoundedPool:
+        return BoundedPool(
+            name=pool.value,
+            executor=ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{pool.value}-pool"),
+            max_workers=max_workers,
+        )
+
+    async def run(self, pool: ExecutionPoolEnum, fn, *args, **kwargs):
+        return await self.pools[pool].run(fn, *args, **kwargs)
+
+    def get_stats(self) -> dict:
+        return {
+            pool.value: bounded_pool.get_stats()
+            for pool, bounded_pool in self.pools.items()
+        }
+
+    def shutdown(self):
+        for bounded_pool in self.pools.values():
+            bounded_pool.shutdown()
+
+
+_execution_pools = None
+_execution_pools_lock = threading.Lock()
+
+
+def get_execution_pools() -> ExecutionPools:
+    """Process-wide pools, created from settings on first use"""
+    global _execution_pools
+
+    with _execution_pools_lock:
+        if _execution_pools is None:
+            settings = get_settings()
+            _execution_pools = ExecutionPools(
+                storage_workers=settings.EXECUTOR_STORAGE_WORKERS,
+                database_workers=settings.EXECUTOR_DATABASE_WORKERS,
+                vectordb_workers=settings.EXECUTOR_VECTORDB_WORKERS,
+                cpu_workers=settings.EXECUTOR_CPU_WORKERS,
+            )
+            logger.info("Execution pools created")
+
+    return _execution_pools
+
+
+async def run_in_pool(pool: ExecutionPoolEnum, fn, *args, **kwargs):
+    """Run a blocking callable on the pool for its class of work"""
+    return await get_execution_pools().run(pool, fn, *args, **kwargs)
+
+
+def shutdown_execution_pools():
+    global _execution_pools
+
+    with _execution_pools_lock:
+        if _execution_pools is not None:
+            _execution_pools.shutdown()
+            _execution_pools = None
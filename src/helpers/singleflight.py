@@ -0,0 +1,66 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in
+    flight, later calls with the same key await its result instead of
+    running again. Nothing is kept once the call finishes (that is what the
+    caches are for).
+
+    The shared call runs as its own task, so a caller that gets cancelled
+    (e.g. a client disconnecting) doesn't cancel it for the others.
+    Event-loop only, like the rest of the request path.
+    """
+
+    def __init__(self):
+        # (kind, key) -> running task
+        self._in_flight = {}
+        # kind -> {"calls", "executions", "coalesced", "failed"}
+        self._stats = {}
+
+    def _kind_stats(self, kind: str) -> dict:
+        return self._stats.setdefault(kind, {"calls": 0, "executions": 0, "coalesced": 0, "failed": 0})
+
+    async def do(self, kind: str, key, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs), or the in-flight call of the same kind and key"""
+        stats = self._kind_stats(kind)
+        stats["calls"] += 1
+
+        flight_key = (kind, key)
+        task = self._in_flight.get(flight_key)
+
+        if task is not None:
+            stats["coalesced"] += 1
+        else:
+            stats["executions"] += 1
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._finish(flight_key, done, stats))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key, task: asyncio.Task, stats: dict):
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+
+        # retrieve the exception so an abandoned task doesn't log "never retrieved"
+        if task.cancelled() or task.exception() is not None:
+            stats["failed"] += 1
+
+    def get_stats(self) -> dict:
+        in_flight = {}
+        for kind, _ in self._in_flight:
+            in_flight[kind] = in_flight.get(kind, 0) + 1
+
+        return {
+            kind: {
+                **stats,
+                "coalesced_rate": round(stats["coalesced"] / stats["calls"], 4) if stats["calls"] else 0.0,
+                "in_flight": in_flight.get(kind, 0),
+            }
+            for kind, stats in self._stats.items()
+        }
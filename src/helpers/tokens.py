@@ -0,0 +1,47 @@
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# tiktoken encoding used when the package is installed; the generation models
+# (Qwen, Gemini, Command) tokenize differently, so counts are approximate anyway
+TIKTOKEN_ENCODING = "cl100k_base"
+
+# lazily loaded tiktoken encoding, False once it turned out to be unavailable
+_encoding = None
+
+
+def get_encoding():
+    global _encoding
+
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        except Exception as e:
+            # not installed, or its BPE file can't be downloaded
+            logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+            _encoding = False
+
+    return _encoding or None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Character-based estimate: ~4 ASCII characters per token, ~2 for other
+    scripts (Arabic words split into more, shorter tokens than English).
+    """
+    ascii_characters = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_characters / 4 + (len(text) - ascii_characters) / 2)
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in a text (tiktoken when installed, else an estimate)"""
+    if not text:
+        return 0
+
+    encoding = get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+
+    return len(encoding.encode(text, disallowed_special=()))
@@ -3,9 +3,22 @@ from contextlib import asynccontextmanager
 from routes import base, data, nlp, health
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.LLMRouter import LLMRouter
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler, ProviderBudgets
+from stores.llm.AsyncHTTPClient import create_async_http_client
+from stores.cache import EmbeddingCache, QueryEmbeddingCache
+from stores.cache import AnswerCache, AnswerCacheBackendEnum, LRUAnswerCacheBackend, RedisAnswerCacheBackend
+from stores.cache import SemanticAnswerCache
+from stores.lexical import LexicalIndexStore
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.AsyncVectorDBInterface import AsyncVectorDBInterface
+from stores.vectordb.VectorDBEnums import VectorDBEnums
 from stores.llm.templates.template_parser import TemplateParser
 from stores.supabase.SupabaseProvider import SupabaseProvider
+from stores.postgres import PostgresProvider
+from models.enums.DataBackendEnums import DataBackendEnum
+from helpers.execution import get_execution_pools, shutdown_execution_pools
+from helpers.singleflight import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,22 +29,58 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events"""
     # Startup
     settings = get_settings()
+
+    # Bounded pools for blocking storage, database, vector DB and parsing work
+    app.execution_pools = get_execution_pools()
     
     # Initialize Supabase client
     supabase_provider = SupabaseProvider(settings)
     supabase_provider.connect()
     app.supabase_provider = supabase_provider
-    app.db_client = supabase_provider.get_client()
+
+    # Model layer: direct Postgres pool, or the async Supabase client
+    # (awaited PostgREST queries, pooled connections)
+    app.postgres_provider = None
+    if settings.DATA_BACKEND == DataBackendEnum.POSTGRES.value:
+        app.postgres_provider = PostgresProvider(settings)
+        await app.postgres_provider.connect()
+        app.db_client = app.postgres_provider
+    else:
+        await supabase_provider.aconnect()
+        app.db_client = supabase_provider.get_async_client()
     
     # Ensure storage bucket exists
     await supabase_provider.ensure_bucket_exists()
     
-    llm_provider_factory = LLMProviderFactory(settings)
+    # Pooled keep-alive HTTP client for the async LLM provider methods
+    app.llm_http_client = create_async_http_client(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        timeout=settings.LLM_HTTP_TIMEOUT_SECONDS,
+        http2=settings.LLM_HTTP2_ENABLED,
+    )
+
+    llm_provider_factory = LLMProviderFactory(settings, http_client=app.llm_http_client)
     vectordb_provider_factory = VectorDBProviderFactory(settings)
     
-    # Generation client
-    app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
-    app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+    # Generation client: one provider, or a router hedging and failing over across targets
+    app.llm_router = None
+    if settings.GENERATION_TARGETS:
+        app.llm_router = LLMRouter.from_targets(
+            llm_provider_factory=llm_provider_factory,
+            targets=settings.GENERATION_TARGETS,
+            hedge_enabled=settings.GENERATION_HEDGE_ENABLED,
+            hedge_percentile=settings.GENERATION_HEDGE_PERCENTILE,
+            hedge_min_samples=settings.GENERATION_HEDGE_MIN_SAMPLES,
+            hedge_default_delay_seconds=settings.GENERATION_HEDGE_DEFAULT_DELAY_SECONDS,
+            hedge_min_delay_seconds=settings.GENERATION_HEDGE_MIN_DELAY_SECONDS,
+            max_in_flight=settings.GENERATION_MAX_IN_FLIGHT,
+        )
+        app.generation_client = app.llm_router
+    else:
+        app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
+        app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
 
     # Embedding client
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
@@ -40,11 +89,89 @@ async def lifespan(app: FastAPI):
         embedding_size=settings.EMBEDDING_MODEL_SIZE
     )
 
-    # Vector DB client 
-    app.vectordb_client = vectordb_provider_factory.create(
-        provider=settings.VECTOR_DB_BACKEND
+    # Persistent embedding cache
+    app.embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_cache = EmbeddingCache(
+            db_path=settings.EMBEDDING_CACHE_PATH,
+            max_size_bytes=settings.EMBEDDING_CACHE_MAX_SIZE_BYTES,
+        )
+        app.embedding_cache.connect()
+
+    # In-memory query embedding cache
+    app.query_embedding_cache = None
+    if settings.QUERY_EMBEDDING_CACHE_ENABLED:
+        app.query_embedding_cache = QueryEmbeddingCache(
+            max_size_bytes=settings.QUERY_EMBEDDING_CACHE_MAX_SIZE_BYTES,
+            ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        )
+
+    # In-memory BM25 indexes for lexical and hybrid search
+    app.lexical_index = None
+    if settings.LEXICAL_INDEX_ENABLED:
+        app.lexical_index = LexicalIndexStore(
+            max_projects=settings.LEXICAL_INDEX_MAX_PROJECTS,
+            ttl_seconds=settings.LEXICAL_INDEX_TTL_SECONDS,
+            k1=settings.LEXICAL_BM25_K1,
+            b=settings.LEXICAL_BM25_B,
+        )
+
+    # Exact-match answer cache, per worker (LRU) or shared (Redis)
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        if settings.ANSWER_CACHE_BACKEND == AnswerCacheBackendEnum.REDIS.value:
+            answer_cache_backend = RedisAnswerCacheBackend(url=settings.ANSWER_CACHE_REDIS_URL)
+        else:
+            answer_cache_backend = LRUAnswerCacheBackend(max_entries=settings.ANSWER_CACHE_MAX_ENTRIES)
+        await answer_cache_backend.connect()
+        app.answer_cache = AnswerCache(
+            backend=answer_cache_backend,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+        )
+
+    # Answers looked up by query embedding similarity (paraphrases), per worker
+    app.semantic_answer_cache = None
+    if settings.SEMANTIC_CACHE_ENABLED:
+        app.semantic_answer_cache = SemanticAnswerCache(
+            threshold=settings.SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+            max_entries_per_project=settings.SEMANTIC_CACHE_MAX_ENTRIES_PER_PROJECT,
+            max_projects=settings.SEMANTIC_CACHE_MAX_PROJECTS,
+        )
+
+    # Identical concurrent embeddings, searches and answers share one execution
+    app.single_flight = SingleFlight() if settings.SINGLE_FLIGHT_ENABLED else None
+
+    # Embedding scheduler (concurrency, rate limits and retries for the embedding client);
+    # rate budgets per provider/key live in a registry owned by this lifespan
+    app.embedding_budgets = ProviderBudgets()
+    app.embedding_scheduler = EmbeddingScheduler(
+        embedding_client=app.embedding_client,
+        max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+        requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+        backoff_base_seconds=settings.EMBEDDING_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds=settings.EMBEDDING_BACKOFF_MAX_SECONDS,
+        cache=app.embedding_cache,
+        budgets=app.embedding_budgets,
     )
-    app.vectordb_client.connect()
+
+    # Vector DB client (async when enabled and the backend has one; sync
+    # clients run on the vector DB pool)
+    app.vectordb_client = None
+    if settings.VECTOR_DB_ASYNC_CLIENT or settings.VECTOR_DB_BACKEND == VectorDBEnums.PGVECTOR.value:
+        app.vectordb_client = vectordb_provider_factory.create_async(
+            provider=settings.VECTOR_DB_BACKEND,
+            postgres_provider=app.postgres_provider,
+        )
+
+    if app.vectordb_client is not None:
+        await app.vectordb_client.connect()
+    else:
+        app.vectordb_client = vectordb_provider_factory.create(
+            provider=settings.VECTOR_DB_BACKEND
+        )
+        app.vectordb_client.connect()
 
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
@@ -53,13 +180,25 @@ async def lifespan(app: FastAPI):
     
     logger.info("Application started successfully")
     logger.info(f"Connected to Supabase: {settings.SUPABASE_URL}")
-    logger.info(f"Connected to Qdrant Cloud: {settings.QDRANT_URL}")
+    logger.info(f"Vector DB backend: {settings.VECTOR_DB_BACKEND}")
     
     yield
     
     # Shutdown
     app.supabase_provider.disconnect()
-    app.vectordb_client.disconnect()
+    await app.supabase_provider.adisconnect()
+    if app.postgres_provider:
+        await app.postgres_provider.disconnect()
+    if isinstance(app.vectordb_client, AsyncVectorDBInterface):
+        await app.vectordb_client.disconnect()
+    else:
+        app.vectordb_client.disconnect()
+    await app.llm_http_client.aclose()
+    if app.embedding_cache:
+        app.embedding_cache.disconnect()
+    if app.answer_cache:
+        await app.answer_cache.backend.disconnect()
+    shutdown_execution_pools()
     logger.info("Application shutdown complete")
 
 
@@ -0,0 +1,13 @@
+-- =============================================
+-- Keyset pagination over a project's chunks
+-- =============================================
+-- chunk_order restarts at 1 for every asset, so project scans page on the
+-- composite key (chunk_asset_id, chunk_order, id) within a project. This
+-- index serves both the filter and the ORDER BY, so every page is an index
+-- range scan regardless of how deep into the project it starts.
+
+CREATE INDEX IF NOT EXISTS idx_chunks_project_asset_order
+    ON chunks(chunk_project_id, chunk_asset_id, chunk_order, id);
+
+-- Superseded by the composite index above (it is a prefix of it)
+DROP INDEX IF EXISTS idx_chunks_project_id;
@@ -0,0 +1,45 @@
+-- =============================================
+-- Incremental indexing
+-- =============================================
+-- Which embedding model each chunk was last pushed to the vector DB with.
+-- An incremental push only embeds chunks whose chunk_indexed_model is NULL
+-- or differs from the current EMBEDDING_MODEL_ID.
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS chunk_indexed_model VARCHAR(255);
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS chunk_indexed_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_project_indexed_model
+    ON chunks(chunk_project_id, chunk_indexed_model);
+
+-- =============================================
+-- Deleted chunks whose vectors still have to be removed
+-- =============================================
+-- Filled by a trigger (so cascades from asset/project deletes are caught too)
+-- and drained by the next index push for the project.
+
+CREATE TABLE IF NOT EXISTS chunk_deletions (
+    chunk_id UUID PRIMARY KEY,
+    chunk_project_id UUID NOT NULL,
+    deleted_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_deletions_project_id ON chunk_deletions(chunk_project_id);
+
+CREATE OR REPLACE FUNCTION record_chunk_deletion()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Chunks that were never pushed have no vectors to remove
+    IF OLD.chunk_indexed_model IS NOT NULL THEN
+        INSERT INTO chunk_deletions (chunk_id, chunk_project_id)
+        VALUES (OLD.id, OLD.chunk_project_id)
+        ON CONFLICT (chunk_id) DO NOTHING;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_chunks_deletion ON chunks;
+CREATE TRIGGER record_chunks_deletion
+    AFTER DELETE ON chunks
+    FOR EACH ROW
+    EXECUTE FUNCTION record_chunk_deletion();
@@ -0,0 +1,54 @@
+-- =============================================
+-- pgvector backend (VECTOR_DB_BACKEND = "PGVECTOR")
+-- =============================================
+-- Embeddings live next to the chunks they were computed from, keyed by
+-- chunk id, so a search returns chunk text and metadata in one query and
+-- no text is duplicated into a vector DB payload.
+--
+-- The dimension must match EMBEDDING_MODEL_SIZE (768 for text-embedding-004).
+-- The HNSW operator class must match VECTOR_DB_DISTANCE_METHOD:
+-- vector_cosine_ops for "cosine", vector_ip_ops for "dot".
+--
+-- Every collection shares the HNSW index, so searches filter its nearest rows
+-- by collection; pgvector 0.8+ iterative scans (PGVECTOR_ITERATIVE_SCAN) keep
+-- scanning until a small project has enough matches.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+DO $$
+BEGIN
+    IF string_to_array((SELECT extversion FROM pg_extension WHERE extname = 'vector'), '.')::int[]
+       < ARRAY[0, 8] THEN
+        RAISE EXCEPTION 'pgvector 0.8 or newer is required, run: ALTER EXTENSION vector UPDATE';
+    END IF;
+END $$;
+
+-- One row per vector DB collection (a project, or a shared multi-tenant collection)
+CREATE TABLE IF NOT EXISTS vector_collections (
+    name VARCHAR(255) PRIMARY KEY,
+    embedding_size INTEGER NOT NULL,
+    multi_tenant BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    collection_name VARCHAR(255) NOT NULL REFERENCES vector_collections(name) ON DELETE CASCADE,
+    chunk_id UUID NOT NULL REFERENCES chunks(id) ON DELETE CASCADE,
+    tenant_id VARCHAR(255),
+    embedding vector(768) NOT NULL,
+    indexed_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (collection_name, chunk_id)
+);
+
+-- Deleting a chunk cascades to its embedding (the chunk_deletions entries
+-- it leaves behind are drained as no-op deletes)
+CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_chunk_id ON chunk_embeddings(chunk_id);
+CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_tenant ON chunk_embeddings(collection_name, tenant_id);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_hnsw
+    ON chunk_embeddings USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- IVFFlat alternative (faster to build, needs rows before it is created):
+-- CREATE INDEX idx_chunk_embeddings_ivfflat
+--     ON chunk_embeddings USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
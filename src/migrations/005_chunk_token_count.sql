@@ -0,0 +1,9 @@
+-- =============================================
+-- Chunk token counts
+-- =============================================
+-- Token count of chunk_text, computed when a file is processed, so the RAG
+-- prompt can be packed to a token budget without re-tokenizing retrieved
+-- chunks (see helpers/tokens.py). NULL for chunks processed before this
+-- migration; they are counted when retrieved.
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS chunk_token_count INTEGER;
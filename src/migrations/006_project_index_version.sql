@@ -0,0 +1,31 @@
+-- =============================================
+-- Project index version
+-- =============================================
+-- Bumped whenever what a project's searches can return changes (chunks
+-- processed or reset, an index push, an asset deleted). Cached answers are
+-- keyed on it, so a bump invalidates them without deleting anything.
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS index_version BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_project_index_version(p_project_id UUID)
+RETURNS BIGINT AS $$
+    UPDATE projects
+    SET index_version = index_version + 1
+    WHERE id = p_project_id
+    RETURNING index_version;
+$$ LANGUAGE sql;
+
+-- Asset deletes (and their chunk cascades) bump the version however they happen
+CREATE OR REPLACE FUNCTION bump_asset_project_index_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_project_index_version(OLD.asset_project_id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_assets_project_index_version ON assets;
+CREATE TRIGGER bump_assets_project_index_version
+    AFTER DELETE ON assets
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_asset_project_index_version();
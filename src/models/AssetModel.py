@@ -1,5 +1,6 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Asset
+from stores.postgres import PostgresProvider
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,13 +16,18 @@ class AssetModel(BaseDataModel):
     @classmethod
     async def create_instance(cls, db_client):
         """Factory method to create AssetModel instance"""
+        if isinstance(db_client, PostgresProvider):
+            # Imported here: PgAssetModel subclasses this model
+            from .PgAssetModel import PgAssetModel
+            return PgAssetModel(db_client)
+
         instance = cls(db_client)
         return instance
 
     async def create_asset(self, asset: Asset) -> Asset:
         """Create a new asset in the database"""
         try:
-            result = self.table().insert(asset.to_db_dict()).execute()
+            result = await self.execute(self.table().insert(asset.to_db_dict()))
             
             if result.data and len(result.data) > 0:
                 asset.id = result.data[0].get("id")
@@ -34,11 +40,11 @@ class AssetModel(BaseDataModel):
     async def get_all_project_assets(self, asset_project_id: str, asset_type: str):
         """Get all assets for a project by type"""
         try:
-            result = self.table().select("*").eq(
+            result = await self.execute(self.table().select("*").eq(
                 "asset_project_id", asset_project_id
             ).eq(
                 "asset_type", asset_type
-            ).execute()
+            ))
             
             return [
                 Asset.from_db_record(record)
@@ -51,11 +57,11 @@ class AssetModel(BaseDataModel):
     async def get_asset_record(self, asset_project_id: str, asset_name: str):
         """Get a specific asset by project ID and name"""
         try:
-            result = self.table().select("*").eq(
+            result = await self.execute(self.table().select("*").eq(
                 "asset_project_id", asset_project_id
             ).eq(
                 "asset_name", asset_name
-            ).execute()
+            ))
             
             if result.data and len(result.data) > 0:
                 return Asset.from_db_record(result.data[0])
@@ -68,7 +74,7 @@ class AssetModel(BaseDataModel):
     async def get_asset_by_id(self, asset_id: str):
         """Get asset by its ID"""
         try:
-            result = self.table().select("*").eq("id", asset_id).execute()
+            result = await self.execute(self.table().select("*").eq("id", asset_id))
             
             if result.data and len(result.data) > 0:
                 return Asset.from_db_record(result.data[0])
@@ -81,7 +87,7 @@ class AssetModel(BaseDataModel):
     async def delete_asset(self, asset_id: str) -> bool:
         """Delete an asset by ID"""
         try:
-            self.table().delete().eq("id", asset_id).execute()
+            await self.execute(self.table().delete().eq("id", asset_id))
             return True
         except Exception as e:
             logger.error(f"Error deleting asset: {e}")
@@ -1,3 +1,7 @@
+from helpers.execution import run_in_pool, ExecutionPoolEnum
+import inspect
+
+
 class BaseDataModel:
     """Base class for all data models using Supabase"""
 
@@ -7,4 +11,15 @@ class BaseDataModel:
     
     def table(self):
         """Get table reference"""
-        return self.supabase_client.table(self.table_name)
\ No newline at end of file
+        return self.supabase_client.table(self.table_name)
+
+    async def execute(self, query):
+        """
+        Execute a query builder. Builders from the async client are awaited
+        directly; sync builders run on the database pool so they don't block
+        the event loop.
+        """
+        if inspect.iscoroutinefunction(query.execute):
+            return await query.execute()
+
+        return await run_in_pool(ExecutionPoolEnum.DATABASE, query.execute)
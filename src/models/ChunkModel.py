@@ -1,5 +1,7 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import DataChunk
+from stores.postgres import PostgresProvider
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,13 +17,18 @@ class ChunkModel(BaseDataModel):
     @classmethod
     async def create_instance(cls, db_client):
         """Factory method to create ChunkModel instance"""
+        if isinstance(db_client, PostgresProvider):
+            # Imported here: PgChunkModel subclasses this model
+            from .PgChunkModel import PgChunkModel
+            return PgChunkModel(db_client)
+
         instance = cls(db_client)
         return instance
             
     async def create_chunk(self, chunk: DataChunk) -> DataChunk:
         """Create a new chunk in the database"""
         try:
-            result = self.table().insert(chunk.to_db_dict()).execute()
+            result = await self.execute(self.table().insert(chunk.to_db_dict()))
             
             if result.data and len(result.data) > 0:
                 chunk.id = result.data[0].get("id")
@@ -34,7 +41,7 @@ class ChunkModel(BaseDataModel):
     async def get_chunk(self, chunk_id: str):
         """Get a chunk by ID"""
         try:
-            result = self.table().select("*").eq("id", chunk_id).execute()
+            result = await self.execute(self.table().select("*").eq("id", chunk_id))
             
             if result.data and len(result.data) > 0:
                 return DataChunk.from_db_record(result.data[0])
@@ -54,7 +61,7 @@ class ChunkModel(BaseDataModel):
                 
                 batch_data = [chunk.to_db_dict() for chunk in batch]
                 
-                result = self.table().insert(batch_data).execute()
+                result = await self.execute(self.table().insert(batch_data))
                 total_inserted += len(result.data) if result.data else 0
             
             return total_inserted
@@ -66,13 +73,13 @@ class ChunkModel(BaseDataModel):
         """Delete all chunks for a project"""
         try:
             # First count how many will be deleted
-            count_result = self.table().select("id", count="exact").eq(
+            count_result = await self.execute(self.table().select("id", count="exact").eq(
                 "chunk_project_id", project_id
-            ).execute()
+            ))
             deleted_count = count_result.count or 0
             
             # Delete the chunks
-            self.table().delete().eq("chunk_project_id", project_id).execute()
+            await self.execute(self.table().delete().eq("chunk_project_id", project_id))
             
             return deleted_count
         except Exception as e:
@@ -84,13 +91,17 @@ class ChunkModel(BaseDataModel):
         try:
             offset = (page_no - 1) * page_size
             
-            result = self.table().select("*").eq(
+            result = await self.execute(self.table().select("*").eq(
                 "chunk_project_id", project_id
+            ).order(
+                "chunk_asset_id"
             ).order(
                 "chunk_order"
+            ).order(
+                "id"
             ).range(
                 offset, offset + page_size - 1
-            ).execute()
+            ))
             
             return [
                 DataChunk.from_db_record(record)
@@ -98,4 +109,115 @@ class ChunkModel(BaseDataModel):
             ]
         except Exception as e:
             logger.error(f"Error getting project chunks: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def get_project_chunks_after(self, project_id: str, after: DataChunk = None,
+                                       page_size: int = 100, pending_for_model: str = None):
+        """
+        Get the next page of a project's chunks after `after` (keyset pagination
+        on chunk_asset_id, chunk_order, id), or the first page if `after` is None.
+        With `pending_for_model`, only chunks not yet indexed with that model.
+        """
+        try:
+            query = self.table().select("*").eq("chunk_project_id", project_id)
+
+            conditions = []
+            if pending_for_model is not None:
+                conditions.append(
+                    f'chunk_indexed_model.is.null,chunk_indexed_model.neq."{pending_for_model}"'
+                )
+            if after is not None:
+                conditions.append(
+                    f"chunk_asset_id.gt.{after.chunk_asset_id},"
+                    f"and(chunk_asset_id.eq.{after.chunk_asset_id},chunk_order.gt.{after.chunk_order}),"
+                    f"and(chunk_asset_id.eq.{after.chunk_asset_id},chunk_order.eq.{after.chunk_order},id.gt.{after.id})"
+                )
+
+            if len(conditions) == 1:
+                query = query.or_(conditions[0])
+            elif conditions:
+                # one or= parameter, AND-ing both groups
+                query = query.or_("and(" + ",".join(f"or({c})" for c in conditions) + ")")
+
+            result = await self.execute(query.order(
+                "chunk_asset_id"
+            ).order(
+                "chunk_order"
+            ).order(
+                "id"
+            ).limit(page_size))
+
+            return [
+                DataChunk.from_db_record(record)
+                for record in result.data
+            ]
+        except Exception as e:
+            logger.error(f"Error getting project chunks after key: {e}")
+            raise
+
+    async def iter_project_chunks(self, project_id: str, page_size: int = 100,
+                                  pending_for_model: str = None):
+        """Iterate over all chunks of a project, one page (list of chunks) at a time"""
+        last_chunk = None
+
+        while True:
+            page_chunks = await self.get_project_chunks_after(
+                project_id=project_id,
+                after=last_chunk,
+                page_size=page_size,
+                pending_for_model=pending_for_model
+            )
+
+            if not page_chunks:
+                break
+
+            yield page_chunks
+
+            if len(page_chunks) < page_size:
+                break
+
+            last_chunk = page_chunks[-1]
+
+    async def mark_chunks_indexed(self, chunk_ids: list, model_id: str,
+                                  batch_size: int = 100) -> int:
+        """Record that chunks were pushed to the vector DB with the given embedding model"""
+        try:
+            indexed_at = datetime.now(timezone.utc).isoformat()
+            total_updated = 0
+
+            for i in range(0, len(chunk_ids), batch_size):
+                result = await self.execute(self.table().update({
+                    "chunk_indexed_model": model_id,
+                    "chunk_indexed_at": indexed_at,
+                }).in_("id", chunk_ids[i:i + batch_size]))
+                total_updated += len(result.data) if result.data else 0
+
+            return total_updated
+        except Exception as e:
+            logger.error(f"Error marking chunks indexed: {e}")
+            raise
+
+    async def get_deleted_chunk_ids(self, project_id: str, limit: int = 1000) -> list:
+        """IDs of deleted chunks whose vectors haven't been removed yet"""
+        try:
+            result = await self.execute(self.supabase_client.table("chunk_deletions").select(
+                "chunk_id"
+            ).eq(
+                "chunk_project_id", project_id
+            ).limit(limit))
+
+            return [record["chunk_id"] for record in result.data]
+        except Exception as e:
+            logger.error(f"Error getting deleted chunk IDs: {e}")
+            raise
+
+    async def clear_deleted_chunk_ids(self, chunk_ids: list, batch_size: int = 100):
+        """Forget deleted chunks once their vectors are gone"""
+        try:
+            for i in range(0, len(chunk_ids), batch_size):
+                await self.execute(self.supabase_client.table("chunk_deletions").delete().in_(
+                    "chunk_id", chunk_ids[i:i + batch_size]
+                ))
+        except Exception as e:
+            logger.error(f"Error clearing deleted chunk IDs: {e}")
+            raise
@@ -0,0 +1,104 @@
+from .AssetModel import AssetModel
+from .db_schemes import Asset
+from stores.postgres import PostgresProvider
+from datetime import datetime, timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+ASSET_COLUMNS = """
+    id, asset_project_id, asset_type, asset_name, asset_size,
+    asset_config, asset_storage_path, asset_pushed_at
+"""
+
+
+class PgAssetModel(AssetModel):
+    """Asset model using a direct asyncpg connection pool"""
+
+    INSERT_ASSET = f"""
+        INSERT INTO assets (asset_project_id, asset_type, asset_name, asset_size,
+                            asset_config, asset_storage_path, asset_pushed_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        RETURNING id
+    """
+    SELECT_BY_PROJECT_AND_TYPE = f"SELECT {ASSET_COLUMNS} FROM assets WHERE asset_project_id = $1 AND asset_type = $2"
+    SELECT_BY_PROJECT_AND_NAME = f"SELECT {ASSET_COLUMNS} FROM assets WHERE asset_project_id = $1 AND asset_name = $2"
+    SELECT_BY_ID = f"SELECT {ASSET_COLUMNS} FROM assets WHERE id = $1"
+
+    def __init__(self, db_client: PostgresProvider):
+        super().__init__(supabase_client=None)
+        self.db_client = db_client
+
+    async def create_asset(self, asset: Asset) -> Asset:
+        """Create a new asset in the database"""
+        try:
+            asset_id = await self.db_client.fetchval(
+                self.INSERT_ASSET,
+                asset.asset_project_id,
+                asset.asset_type,
+                asset.asset_name,
+                asset.asset_size,
+                asset.asset_config,
+                asset.asset_storage_path,
+                asset.asset_pushed_at or datetime.now(timezone.utc),
+            )
+
+            if asset_id:
+                asset.id = asset_id
+                return asset
+            return None
+        except Exception as e:
+            logger.error(f"Error creating asset: {e}")
+            raise
+
+    async def get_all_project_assets(self, asset_project_id: str, asset_type: str):
+        """Get all assets for a project by type"""
+        try:
+            records = await self.db_client.fetch(
+                self.SELECT_BY_PROJECT_AND_TYPE, asset_project_id, asset_type
+            )
+
+            return [
+                Asset.from_db_record(record)
+                for record in records
+            ]
+        except Exception as e:
+            logger.error(f"Error getting project assets: {e}")
+            raise
+
+    async def get_asset_record(self, asset_project_id: str, asset_name: str):
+        """Get a specific asset by project ID and name"""
+        try:
+            record = await self.db_client.fetchrow(
+                self.SELECT_BY_PROJECT_AND_NAME, asset_project_id, asset_name
+            )
+
+            if record:
+                return Asset.from_db_record(record)
+
+            return None
+        except Exception as e:
+            logger.error(f"Error getting asset record: {e}")
+            raise
+
+    async def get_asset_by_id(self, asset_id: str):
+        """Get asset by its ID"""
+        try:
+            record = await self.db_client.fetchrow(self.SELECT_BY_ID, asset_id)
+
+            if record:
+                return Asset.from_db_record(record)
+
+            return None
+        except Exception as e:
+            logger.error(f"Error getting asset by ID: {e}")
+            raise
+
+    async def delete_asset(self, asset_id: str) -> bool:
+        """Delete an asset by ID"""
+        try:
+            await self.db_client.execute("DELETE FROM assets WHERE id = $1", asset_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting asset: {e}")
+            return False
@@ -0,0 +1,204 @@
+from .ChunkModel import ChunkModel
+from .db_schemes import DataChunk
+from stores.postgres import PostgresProvider
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHUNK_COLUMNS = """
+    id, chunk_text, chunk_metadata, chunk_order, chunk_project_id, chunk_asset_id, chunk_token_count
+"""
+
+COPY_COLUMNS = [
+    "chunk_text", "chunk_metadata", "chunk_order", "chunk_project_id", "chunk_asset_id",
+    "chunk_token_count",
+]
+
+
+class PgChunkModel(ChunkModel):
+    """Chunk model using a direct asyncpg connection pool"""
+
+    INSERT_CHUNK = """
+        INSERT INTO chunks (chunk_text, chunk_metadata, chunk_order, chunk_project_id, chunk_asset_id,
+                            chunk_token_count)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING id
+    """
+    SELECT_BY_ID = f"SELECT {CHUNK_COLUMNS} FROM chunks WHERE id = $1"
+    SELECT_PROJECT_PAGE = f"""
+        SELECT {CHUNK_COLUMNS} FROM chunks
+        WHERE chunk_project_id = $1
+        ORDER BY chunk_asset_id, chunk_order, id
+        LIMIT $2 OFFSET $3
+    """
+    # $2 is the embedding model to skip chunks already indexed with (NULL: all chunks)
+    SELECT_PROJECT_FIRST_KEYSET_PAGE = f"""
+        SELECT {CHUNK_COLUMNS} FROM chunks
+        WHERE chunk_project_id = $1
+          AND ($2::varchar IS NULL OR chunk_indexed_model IS DISTINCT FROM $2)
+        ORDER BY chunk_asset_id, chunk_order, id
+        LIMIT $3
+    """
+    SELECT_PROJECT_NEXT_KEYSET_PAGE = f"""
+        SELECT {CHUNK_COLUMNS} FROM chunks
+        WHERE chunk_project_id = $1
+          AND ($2::varchar IS NULL OR chunk_indexed_model IS DISTINCT FROM $2)
+          AND (chunk_asset_id, chunk_order, id) > ($3, $4, $5)
+        ORDER BY chunk_asset_id, chunk_order, id
+        LIMIT $6
+    """
+    MARK_INDEXED = """
+        UPDATE chunks SET chunk_indexed_model = $2, chunk_indexed_at = NOW()
+        WHERE id = ANY($1::uuid[])
+    """
+    SELECT_DELETED_IDS = "SELECT chunk_id FROM chunk_deletions WHERE chunk_project_id = $1 LIMIT $2"
+    CLEAR_DELETED_IDS = "DELETE FROM chunk_deletions WHERE chunk_id = ANY($1::uuid[])"
+
+    def __init__(self, db_client: PostgresProvider):
+        super().__init__(supabase_client=None)
+        self.db_client = db_client
+
+    @staticmethod
+    def _to_record(chunk: DataChunk) -> tuple:
+        return (
+            chunk.chunk_text,
+            chunk.chunk_metadata,
+            chunk.chunk_order,
+            chunk.chunk_project_id,
+            chunk.chunk_asset_id,
+            chunk.chunk_token_count,
+        )
+
+    async def create_chunk(self, chunk: DataChunk) -> DataChunk:
+        """Create a new chunk in the database"""
+        try:
+            chunk_id = await self.db_client.fetchval(self.INSERT_CHUNK, *self._to_record(chunk))
+
+            if chunk_id:
+                chunk.id = chunk_id
+                return chunk
+            return None
+        except Exception as e:
+            logger.error(f"Error creating chunk: {e}")
+            raise
+
+    async def get_chunk(self, chunk_id: str):
+        """Get a chunk by ID"""
+        try:
+            record = await self.db_client.fetchrow(self.SELECT_BY_ID, chunk_id)
+
+            if record:
+                return DataChunk.from_db_record(record)
+
+            return None
+        except Exception as e:
+            logger.error(f"Error getting chunk: {e}")
+            raise
+
+    async def insert_many_chunks(self, chunks: list, batch_size: int = 100) -> int:
+        """
+        Insert multiple chunks with a single COPY in one transaction.
+        batch_size is kept for signature compatibility; COPY streams all rows.
+        """
+        try:
+            if not chunks:
+                return 0
+
+            records = [self._to_record(chunk) for chunk in chunks]
+
+            async with self.db_client.acquire() as connection:
+                async with connection.transaction():
+                    status = await connection.copy_records_to_table(
+                        "chunks", records=records, columns=COPY_COLUMNS
+                    )
+
+            # status is "COPY <n>"
+            return int(status.split()[-1])
+        except Exception as e:
+            logger.error(f"Error inserting many chunks: {e}")
+            raise
+
+    async def delete_chunks_by_project_id(self, project_id: str) -> int:
+        """Delete all chunks for a project"""
+        try:
+            status = await self.db_client.execute(
+                "DELETE FROM chunks WHERE chunk_project_id = $1", project_id
+            )
+
+            # status is "DELETE <n>"
+            return int(status.split()[-1])
+        except Exception as e:
+            logger.error(f"Error deleting chunks by project ID: {e}")
+            raise
+
+    async def get_poject_chunks(self, project_id: str, page_no: int = 1, page_size: int = 50):
+        """Get chunks for a project with pagination"""
+        try:
+            records = await self.db_client.fetch(
+                self.SELECT_PROJECT_PAGE, project_id, page_size, (page_no - 1) * page_size
+            )
+
+            return [
+                DataChunk.from_db_record(record)
+                for record in records
+            ]
+        except Exception as e:
+            logger.error(f"Error getting project chunks: {e}")
+            raise
+
+    async def get_project_chunks_after(self, project_id: str, after: DataChunk = None,
+                                       page_size: int = 100, pending_for_model: str = None):
+        """
+        Get the next page of a project's chunks after `after` (row comparison on
+        chunk_asset_id, chunk_order, id), or the first page if `after` is None.
+        With `pending_for_model`, only chunks not yet indexed with that model.
+        """
+        try:
+            if after is None:
+                records = await self.db_client.fetch(
+                    self.SELECT_PROJECT_FIRST_KEYSET_PAGE, project_id,
+                    pending_for_model, page_size
+                )
+            else:
+                records = await self.db_client.fetch(
+                    self.SELECT_PROJECT_NEXT_KEYSET_PAGE, project_id, pending_for_model,
+                    after.chunk_asset_id, after.chunk_order, after.id, page_size
+                )
+
+            return [
+                DataChunk.from_db_record(record)
+                for record in records
+            ]
+        except Exception as e:
+            logger.error(f"Error getting project chunks after key: {e}")
+            raise
+
+    async def mark_chunks_indexed(self, chunk_ids: list, model_id: str,
+                                  batch_size: int = 100) -> int:
+        """Record that chunks were pushed to the vector DB with the given embedding model"""
+        try:
+            # one statement regardless of batch_size
+            status = await self.db_client.execute(self.MARK_INDEXED, chunk_ids, model_id)
+
+            # status is "UPDATE <n>"
+            return int(status.split()[-1])
+        except Exception as e:
+            logger.error(f"Error marking chunks indexed: {e}")
+            raise
+
+    async def get_deleted_chunk_ids(self, project_id: str, limit: int = 1000) -> list:
+        """IDs of deleted chunks whose vectors haven't been removed yet"""
+        try:
+            records = await self.db_client.fetch(self.SELECT_DELETED_IDS, project_id, limit)
+            return [record["chunk_id"] for record in records]
+        except Exception as e:
+            logger.error(f"Error getting deleted chunk IDs: {e}")
+            raise
+
+    async def clear_deleted_chunk_ids(self, chunk_ids: list, batch_size: int = 100):
+        """Forget deleted chunks once their vectors are gone"""
+        try:
+            await self.db_client.execute(self.CLEAR_DELETED_IDS, chunk_ids)
+        except Exception as e:
+            logger.error(f"Error clearing deleted chunk IDs: {e}")
+            raise
@@ -0,0 +1,89 @@
+from .ProjectModel import ProjectModel
+from .db_schemes import Project
+from stores.postgres import PostgresProvider
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PgProjectModel(ProjectModel):
+    """Project model using a direct asyncpg connection pool"""
+
+    SELECT_BY_PROJECT_ID = "SELECT id, project_id, index_version FROM projects WHERE project_id = $1"
+
+    # DO UPDATE (a no-op) so RETURNING also yields the row when it already exists
+    INSERT_PROJECT = """
+        INSERT INTO projects (project_id) VALUES ($1)
+        ON CONFLICT (project_id) DO UPDATE SET project_id = EXCLUDED.project_id
+        RETURNING id, project_id, index_version
+    """
+
+    def __init__(self, db_client: PostgresProvider):
+        super().__init__(supabase_client=None)
+        self.db_client = db_client
+
+    async def create_project(self, project: Project) -> Project:
+        """Create a new project in the database"""
+        try:
+            record = await self.db_client.fetchrow(self.INSERT_PROJECT, project.project_id)
+
+            if record:
+                project.id = record.get("id")
+                project.index_version = record.get("index_version")
+                return project
+            return None
+        except Exception as e:
+            logger.error(f"Error creating project: {e}")
+            raise
+
+    async def get_project_or_create(self, project_id: str) -> Project:
+        """Get existing project or create new one"""
+        try:
+            record = await self.db_client.fetchrow(self.SELECT_BY_PROJECT_ID, project_id)
+
+            if record:
+                return Project.from_db_record(record)
+
+            project = Project(project_id=project_id)
+            return await self.create_project(project=project)
+        except Exception as e:
+            logger.error(f"Error in get_project_or_create: {e}")
+            raise
+
+    async def bump_index_version(self, project: Project):
+        """Bump the project's index version (invalidating its cached answers)"""
+        try:
+            index_version = await self.db_client.fetchval(
+                "SELECT bump_project_index_version($1)", project.id
+            )
+
+            if index_version is not None:
+                project.index_version = index_version
+            return project.index_version
+        except Exception as e:
+            logger.error(f"Error bumping project index version: {e}")
+            return None
+
+    async def get_all_projects(self, page: int = 1, page_size: int = 10):
+        """Get all projects with pagination"""
+        try:
+            total_documents = await self.db_client.fetchval("SELECT COUNT(*) FROM projects")
+
+            total_pages = total_documents // page_size
+            if total_documents % page_size > 0:
+                total_pages += 1
+
+            records = await self.db_client.fetch(
+                "SELECT id, project_id, index_version FROM projects ORDER BY created_at, id LIMIT $1 OFFSET $2",
+                page_size, (page - 1) * page_size
+            )
+
+            projects = [
+                Project.from_db_record(record)
+                for record in records
+            ]
+
+            return projects, total_pages
+        except Exception as e:
+            logger.error(f"Error getting all projects: {e}")
+            raise
@@ -1,5 +1,6 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
+from stores.postgres import PostgresProvider
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,13 +16,18 @@ class ProjectModel(BaseDataModel):
     @classmethod
     async def create_instance(cls, db_client):
         """Factory method to create ProjectModel instance"""
+        if isinstance(db_client, PostgresProvider):
+            # Imported here: PgProjectModel subclasses this model
+            from .PgProjectModel import PgProjectModel
+            return PgProjectModel(db_client)
+
         instance = cls(db_client)
         return instance
 
     async def create_project(self, project: Project) -> Project:
         """Create a new project in the database"""
         try:
-            result = self.table().insert(project.to_db_dict()).execute()
+            result = await self.execute(self.table().insert(project.to_db_dict()))
             
             if result.data and len(result.data) > 0:
                 project.id = result.data[0].get("id")
@@ -35,7 +41,7 @@ class ProjectModel(BaseDataModel):
         """Get existing project or create new one"""
         try:
             # Try to find existing project
-            result = self.table().select("*").eq("project_id", project_id).execute()
+            result = await self.execute(self.table().select("*").eq("project_id", project_id))
             
             if result.data and len(result.data) > 0:
                 return Project.from_db_record(result.data[0])
@@ -47,11 +53,25 @@ class ProjectModel(BaseDataModel):
             logger.error(f"Error in get_project_or_create: {e}")
             raise
 
+    async def bump_index_version(self, project: Project):
+        """Bump the project's index version (invalidating its cached answers)"""
+        try:
+            result = await self.execute(self.supabase_client.rpc(
+                "bump_project_index_version", {"p_project_id": project.id}
+            ))
+
+            if result.data is not None:
+                project.index_version = result.data
+            return project.index_version
+        except Exception as e:
+            logger.error(f"Error bumping project index version: {e}")
+            return None
+
     async def get_all_projects(self, page: int = 1, page_size: int = 10):
         """Get all projects with pagination"""
         try:
             # Get total count
-            count_result = self.table().select("*", count="exact").execute()
+            count_result = await self.execute(self.table().select("*", count="exact"))
             total_documents = count_result.count or 0
             
             # Calculate total pages
@@ -61,7 +81,7 @@ class ProjectModel(BaseDataModel):
             
             # Get paginated results
             offset = (page - 1) * page_size
-            result = self.table().select("*").range(offset, offset + page_size - 1).execute()
+            result = await self.execute(self.table().select("*").range(offset, offset + page_size - 1))
             
             projects = [
                 Project.from_db_record(record)
@@ -1,2 +1,3 @@
 from .enums.ResponseEnums import ResponseSignal
-from .enums.ProcessingEnums import ProcessingEnum
\ No newline at end of file
+from .enums.ProcessingEnums import ProcessingEnum
+from .enums.SearchModeEnums import SearchModeEnum
@@ -10,6 +10,7 @@ class DataChunk(BaseModel):
     chunk_order: int = Field(..., gt=0)
     chunk_project_id: str
     chunk_asset_id: str
+    chunk_token_count: Optional[int] = Field(default=None)
     
     model_config = {
         "arbitrary_types_allowed": True,
@@ -24,6 +25,8 @@ class DataChunk(BaseModel):
             "chunk_project_id": self.chunk_project_id,
             "chunk_asset_id": self.chunk_asset_id,
         }
+        if self.chunk_token_count is not None:
+            data["chunk_token_count"] = self.chunk_token_count
         if self.id:
             data["id"] = self.id
         return data
@@ -41,10 +44,13 @@ class DataChunk(BaseModel):
             chunk_metadata=metadata,
             chunk_order=record.get("chunk_order"),
             chunk_project_id=record.get("chunk_project_id"),
-            chunk_asset_id=record.get("chunk_asset_id")
+            chunk_asset_id=record.get("chunk_asset_id"),
+            chunk_token_count=record.get("chunk_token_count")
         )
 
         
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    metadata: Optional[dict] = None
+    token_count: Optional[int] = None
@@ -6,6 +6,8 @@ import uuid
 class Project(BaseModel):
     id: Optional[str] = Field(default=None)
     project_id: str = Field(..., min_length=1)
+    # bumped on every change to the project's searchable chunks (see migrations/006)
+    index_version: int = Field(default=0)
 
     @validator('project_id')
     def validate_project_id(cls, value):
@@ -31,5 +33,6 @@ class Project(BaseModel):
         """Create Project from database record"""
         return cls(
             id=record.get("id"),
-            project_id=record.get("project_id")
-        )
\ No newline at end of file
+            project_id=record.get("project_id"),
+            index_version=record.get("index_version") or 0
+        )
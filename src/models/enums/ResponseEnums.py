@@ -18,4 +18,6 @@ class ResponseSignal(Enum):
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
     RAG_ANSWER_ERROR = "rag_answer_error"
-    RAG_ANSWER_SUCCESS = "rag_answer_success"
\ No newline at end of file
+    RAG_ANSWER_SUCCESS = "rag_answer_success"
+    BATCH_TOO_LARGE_ERROR = "batch_too_large"
+    NLP_STATS_RETRIEVED = "nlp_stats_retrieved"
\ No newline at end of file
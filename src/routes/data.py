@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 from helpers.config import get_settings, Settings 
-from controllers import DataController, ProcessController
+from controllers import DataController, load_and_split_file
+from helpers.execution import run_in_pool, ExecutionPoolEnum
 import logging
 from .schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
@@ -53,7 +54,9 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
         file_content = await file.read()
         
         # Upload to Supabase Storage
-        upload_result = request.app.supabase_provider.upload_file(
+        upload_result = await run_in_pool(
+            ExecutionPoolEnum.STORAGE,
+            request.app.supabase_provider.upload_file,
             file_path=storage_path,
             file_content=file_content,
             content_type=file.content_type
@@ -154,8 +157,6 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             }
         )
     
-    process_controller = ProcessController(project_id=project_id)
-
     no_records = 0 
     no_files = 0 
     
@@ -167,10 +168,15 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
         _ = await chunk_model.delete_chunks_by_project_id(
             project_id=project.id
         )
+        if request.app.lexical_index:
+            request.app.lexical_index.invalidate(project_id=project.id)
+        _ = await project_model.bump_index_version(project=project)
         
     for asset_id, asset in project_files.items():
         # Download file from Supabase Storage
-        file_bytes = request.app.supabase_provider.download_file(
+        file_bytes = await run_in_pool(
+            ExecutionPoolEnum.STORAGE,
+            request.app.supabase_provider.download_file,
             file_path=asset.asset_storage_path
         )
         
@@ -178,22 +184,20 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             logger.error(f"Error downloading file: {asset.asset_name}")
             continue
         
-        # Process file content from bytes
-        file_content = process_controller.get_file_content_from_bytes(
+        # Parse and split the file on the CPU process pool
+        file_chunks = await run_in_pool(
+            ExecutionPoolEnum.CPU,
+            load_and_split_file,
+            project_id=project_id,
             file_bytes=file_bytes,
-            file_id=asset.asset_name
-        )
-        
-        if file_content is None:
-            logger.error(f"Error processing file: {asset.asset_name}")
-            continue
-        
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
             file_id=asset.asset_name,
             chunk_size=chunk_size,
             overlap_size=overlap
         )
+        
+        if file_chunks is None:
+            logger.error(f"Error processing file: {asset.asset_name}")
+            continue
 
         if file_chunks is None or len(file_chunks) == 0:
             return JSONResponse(
@@ -205,16 +209,21 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
         
         file_chunks_records = [
             DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
+                chunk_text=page_content,
+                chunk_metadata=metadata,
                 chunk_order=i + 1,
                 chunk_project_id=project.id,
-                chunk_asset_id=asset_id
+                chunk_asset_id=asset_id,
+                chunk_token_count=token_count
             )
-            for i, chunk in enumerate(file_chunks)
+            for i, (page_content, metadata, token_count) in enumerate(file_chunks)
         ]
         
         no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+        if request.app.lexical_index:
+            request.app.lexical_index.add_chunks(project_id=project.id, chunks=file_chunks_records)
+        # lexical search sees new chunks right away: invalidate cached answers
+        _ = await project_model.bump_index_version(project=project)
         no_files += 1
         
     return JSONResponse(
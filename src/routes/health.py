@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from datetime import datetime 
+from helpers.execution import get_execution_pools
 
 
 health_router = APIRouter(
@@ -16,4 +17,15 @@ async def health_check():
     return {
         "status": "ok",
         "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
\ No newline at end of file
+    }
+
+
+@health_router.get("/health/executors")
+async def executors_health():
+    """
+    In-flight work and queue depth of each execution pool.
+    """
+    return {
+        "status": "ok",
+        "executors": get_execution_pools().get_stats()
+    }
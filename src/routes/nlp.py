@@ -1,12 +1,14 @@
-from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi import FastAPI, APIRouter, Depends, status, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, BatchAnswerRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from controllers import NLPController
 from models import ResponseSignal
+from helpers.config import get_settings, Settings
 
 import logging
+import json
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -15,6 +17,20 @@ nlp_router = APIRouter(
     tags=["api_v1", "nlp"],
 )
 
+def get_nlp_controller(request: Request) -> NLPController:
+    return NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        lexical_index=request.app.lexical_index,
+        answer_cache=request.app.answer_cache,
+        semantic_answer_cache=request.app.semantic_answer_cache,
+        single_flight=request.app.single_flight,
+    )
+
 @nlp_router.post("/index/push/{project_id}")
 async def index_project(request: Request, project_id: str, push_request: PushRequest):
 
@@ -38,51 +54,33 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
             }
         )
     
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
+    nlp_controller = get_nlp_controller(request=request)
     
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
+    inserted_items_count, push_stats = await nlp_controller.index_project_chunks(
+        project=project,
+        chunk_model=chunk_model,
+        do_reset=bool(push_request.do_reset),
+        do_incremental=bool(push_request.do_incremental),
+        do_bulk_load=None if push_request.do_bulk_load is None else bool(push_request.do_bulk_load)
+    )
 
-        chunks_ids =  list(range(idx, idx + len(page_chunks)))
-        idx += len(page_chunks)
-        
-        is_inserted = nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            do_reset=push_request.do_reset,
-            chunks_ids=chunks_ids
-        )
+    # even a failed push may have changed some vectors
+    _ = await project_model.bump_index_version(project=project)
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
-        
-        inserted_items_count += len(page_chunks)
+    if inserted_items_count is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value,
+                "stats": push_stats
+            }
+        )
         
     return JSONResponse(
         content={
             "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "inserted_items_count": inserted_items_count,
+            "stats": push_stats
         }
     )
 
@@ -97,14 +95,9 @@ async def get_project_index_info(request: Request, project_id: str):
         project_id=project_id
     )
 
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
-    )
+    nlp_controller = get_nlp_controller(request=request)
 
-    collection_info = nlp_controller.get_vector_db_collection_info(project=project)
+    collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
 
     return JSONResponse(
         content={
@@ -124,15 +117,15 @@ async def search_index(request: Request, project_id: str, search_request: Search
         project_id=project_id
     )
 
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
+    chunk_model = await ChunkModel.create_instance(
+        db_client=request.app.db_client
     )
 
-    results = nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+    nlp_controller = get_nlp_controller(request=request)
+
+    results = await nlp_controller.search_vector_db_collection(
+        project=project, text=search_request.text, limit=search_request.limit,
+        mode=search_request.mode, chunk_model=chunk_model
     )
 
     if not results:
@@ -162,17 +155,18 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
             project_id=project_id
         )
 
-        nlp_controller = NLPController(
-            vectordb_client=request.app.vectordb_client,
-            generation_client=request.app.generation_client,
-            embedding_client=request.app.embedding_client,
-            template_parser=request.app.template_parser,
+        chunk_model = await ChunkModel.create_instance(
+            db_client=request.app.db_client
         )
 
-        answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
+        nlp_controller = get_nlp_controller(request=request)
+
+        answer, full_prompt, chat_history, context_report, cache_status = await nlp_controller.answer_rag_question(
             project=project,
             query=search_request.text,
             limit=search_request.limit,
+            mode=search_request.mode,
+            chunk_model=chunk_model,
         )
 
         if not answer:
@@ -195,7 +189,9 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
                 "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
                 "answer": answer,
                 "full_prompt": full_prompt,
-                "chat_history": chat_history
+                "chat_history": chat_history,
+                "context": context_report,
+                "cache": cache_status
             }
         )
     except Exception as e:
@@ -207,4 +203,145 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
                 "error": str(e),
                 "error_type": type(e).__name__
             }
-        )
\ No newline at end of file
+        )
+
+def format_sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(request: Request, project_id: str, search_request: SearchRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create(
+        project_id=project_id
+    )
+
+    chunk_model = await ChunkModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    nlp_controller = get_nlp_controller(request=request)
+
+    packed_documents, token_stream, context_report = await nlp_controller.stream_rag_answer(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        mode=search_request.mode,
+        chunk_model=chunk_model,
+    )
+
+    if token_stream is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+            }
+        )
+
+    async def event_stream():
+        # Sources go out first so the client can render them while the model is still thinking
+        yield format_sse_event("sources", {
+            "results": [ doc.dict() for doc in packed_documents ],
+            "context": context_report
+        })
+
+        try:
+            async for text in token_stream:
+                yield format_sse_event("token", {"text": text})
+        except Exception as e:
+            logger.error(f"Error in answer_rag_stream: {str(e)}")
+            yield format_sse_event("error", {
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value,
+                "error": str(e),
+                "error_type": type(e).__name__
+            })
+            return
+
+        yield format_sse_event("done", {
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+@nlp_router.post("/index/answer/batch/{project_id}")
+async def answer_rag_batch(request: Request, project_id: str, batch_request: BatchAnswerRequest,
+                           app_settings: Settings = Depends(get_settings)):
+    """Answer many questions, streamed back as NDJSON lines in completion order"""
+
+    max_questions = app_settings.BATCH_ANSWER_MAX_QUESTIONS
+    if len(batch_request.questions) > max_questions:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.BATCH_TOO_LARGE_ERROR.value,
+                "max_questions": max_questions,
+            }
+        )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create(
+        project_id=project_id
+    )
+
+    chunk_model = await ChunkModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    nlp_controller = get_nlp_controller(request=request)
+
+    async def ndjson_stream():
+        try:
+            async for result in nlp_controller.answer_rag_batch(
+                project=project,
+                questions=batch_request.questions,
+                limit=batch_request.limit,
+                mode=batch_request.mode,
+                chunk_model=chunk_model,
+            ):
+                signal = ResponseSignal.RAG_ANSWER_ERROR if "error" in result else ResponseSignal.RAG_ANSWER_SUCCESS
+                yield json.dumps({"signal": signal.value, **result}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Error in answer_rag_batch: {str(e)}")
+            yield json.dumps({
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+@nlp_router.get("/stats")
+async def get_nlp_stats(request: Request):
+
+    query_embedding_cache = request.app.query_embedding_cache
+    lexical_index = request.app.lexical_index
+    answer_cache = request.app.answer_cache
+    semantic_answer_cache = request.app.semantic_answer_cache
+    single_flight = request.app.single_flight
+    llm_router = request.app.llm_router
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.NLP_STATS_RETRIEVED.value,
+            "embedding_scheduler": request.app.embedding_scheduler.get_stats(),
+            "query_embedding_cache": query_embedding_cache.get_stats() if query_embedding_cache else None,
+            "lexical_index": lexical_index.get_stats() if lexical_index else None,
+            "answer_cache": answer_cache.get_stats() if answer_cache else None,
+            "semantic_answer_cache": semantic_answer_cache.get_stats() if semantic_answer_cache else None,
+            "single_flight": single_flight.get_stats() if single_flight else None,
+            "generation_router": llm_router.get_stats() if llm_router else None,
+        }
+    )
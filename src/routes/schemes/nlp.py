@@ -1,9 +1,20 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    # only push chunks not yet indexed with the current embedding model
+    do_incremental: Optional[int] = 0
+    # defer HNSW indexing until the upload finishes; unset = only on reset pushes
+    do_bulk_load: Optional[int] = None
 
 class SearchRequest(BaseModel):
     text: str
-    limit: Optional[int] = 5
\ No newline at end of file
+    limit: Optional[int] = 5
+    # "dense", "lexical" (BM25, no embedding call) or "hybrid"; unset = SEARCH_MODE
+    mode: Optional[Literal["dense", "lexical", "hybrid"]] = None
+
+class BatchAnswerRequest(BaseModel):
+    questions: List[str] = Field(..., min_length=1)
+    limit: Optional[int] = 5
+    mode: Optional[Literal["dense", "lexical", "hybrid"]] = None
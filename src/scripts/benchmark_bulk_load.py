@@ -0,0 +1,121 @@
+"""
+Compare Qdrant ingestion throughput of the standard insert_many path with
+bulk-load mode (indexing deferred, wait=False uploads, index built at the end).
+
+Run from src/ against a local Qdrant:
+
+    docker run -p 6333:6333 qdrant/qdrant
+    python -m scripts.benchmark_bulk_load --points 100000 --dim 768
+
+Both runs time the upload *and* the wait until the collection is green with
+its HNSW index built, so the numbers are comparable end to end.
+"""
+from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+from qdrant_client import models
+import argparse
+import logging
+import random
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def make_points(count: int, dim: int, seed: int):
+    rng = random.Random(seed)
+    vectors = [[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(count)]
+    ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(count)]
+    texts = [f"chunk {i}" for i in range(count)]
+    return texts, vectors, ids
+
+
+def run(provider: QdrantDBProvider, collection_name: str, texts: list, vectors: list,
+        ids: list, page_size: int, bulk: bool, batch_size: int, parallel: int) -> dict:
+    provider.create_collection(collection_name=collection_name,
+                               embedding_size=len(vectors[0]), do_reset=True)
+
+    started_at = time.perf_counter()
+    if bulk:
+        provider.begin_bulk_load(collection_name=collection_name)
+
+    # pages mimic the index push pipeline handing over one page at a time
+    for i in range(0, len(texts), page_size):
+        is_inserted = provider.insert_many(
+            collection_name=collection_name,
+            texts=texts[i:i + page_size],
+            vectors=vectors[i:i + page_size],
+            record_ids=ids[i:i + page_size],
+            chunk_ids=ids[i:i + page_size],
+            batch_size=batch_size if bulk else 50,
+            bulk=bulk,
+            parallel=parallel,
+        )
+        if not is_inserted:
+            raise RuntimeError("insert_many failed")
+    uploaded_at = time.perf_counter()
+
+    if bulk:
+        is_loaded = provider.end_bulk_load(collection_name=collection_name)
+    else:
+        is_loaded = wait_green(provider, collection_name)
+    finished_at = time.perf_counter()
+
+    total_seconds = finished_at - started_at
+    return {
+        "mode": "bulk" if bulk else "standard",
+        "points": provider.count(collection_name=collection_name),
+        "upload_seconds": round(uploaded_at - started_at, 2),
+        "index_seconds": round(finished_at - uploaded_at, 2),
+        "total_seconds": round(total_seconds, 2),
+        "points_per_second": round(len(texts) / total_seconds, 1),
+        "indexed": is_loaded,
+    }
+
+
+def wait_green(provider: QdrantDBProvider, collection_name: str, timeout_seconds: float = 600) -> bool:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        status = provider.client.get_collection(collection_name=collection_name).status
+        if status == models.CollectionStatus.GREEN:
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--memory", action="store_true",
+                        help="use an in-process :memory: client (smoke test only, it has no HNSW)")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--page-size", type=int, default=200,
+                        help="points handed to insert_many per call, like INDEX_PUSH_PAGE_SIZE")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--parallel", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    provider = QdrantDBProvider(url=None if args.memory else args.url,
+                                api_key=None, distance_method="cosine")
+    provider.connect()
+
+    texts, vectors, ids = make_points(args.points, args.dim, args.seed)
+    logger.info(f"Generated {args.points} points of dim {args.dim}")
+
+    collection_name = "benchmark_bulk_load"
+    try:
+        for bulk in (False, True):
+            result = run(provider, collection_name, texts, vectors, ids,
+                         page_size=args.page_size, bulk=bulk,
+                         batch_size=args.batch_size, parallel=args.parallel)
+            logger.info(result)
+    finally:
+        provider.delete_collection(collection_name=collection_name)
+        provider.disconnect()
+
+
+if __name__ == "__main__":
+    main()
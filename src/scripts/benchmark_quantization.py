@@ -0,0 +1,194 @@
+"""
+Compare recall and search latency of Qdrant storage settings (quantization,
+on-disk vectors, rescoring/oversampling) on the same set of vectors.
+
+Run from src/ against a local Qdrant:
+
+    docker run -p 6333:6333 qdrant/qdrant
+    python -m scripts.benchmark_quantization --points 50000
+    python -m scripts.benchmark_quantization --source-collection collection_myproject
+
+Recall@k is measured against an exact (brute-force) search of the
+unquantized vectors. Synthetic vectors are clustered so that they behave
+more like text embeddings than uniform noise does, but real vectors from
+--source-collection give the numbers worth deciding on.
+"""
+from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+from stores.vectordb.VectorDBEnums import QuantizationEnums
+from qdrant_client import models
+import argparse
+import logging
+import math
+import random
+import statistics
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# (label, provider options) compared on every run
+CONFIGS = [
+    ("float32", {}),
+    ("float32 on_disk", {"vectors_on_disk": True}),
+    ("scalar", {"quantization": QuantizationEnums.SCALAR.value, "search_rescore": False}),
+    ("scalar rescore x2", {"quantization": QuantizationEnums.SCALAR.value,
+                           "vectors_on_disk": True, "search_oversampling": 2.0}),
+    ("binary", {"quantization": QuantizationEnums.BINARY.value, "search_rescore": False}),
+    ("binary rescore x2", {"quantization": QuantizationEnums.BINARY.value,
+                           "vectors_on_disk": True, "search_oversampling": 2.0}),
+    ("binary rescore x4", {"quantization": QuantizationEnums.BINARY.value,
+                           "vectors_on_disk": True, "search_oversampling": 4.0}),
+]
+
+# bytes per dimension of the quantized copy kept in RAM
+RAM_BYTES_PER_DIM = {
+    QuantizationEnums.SCALAR.value: 1,
+    QuantizationEnums.BINARY.value: 1 / 8,
+}
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int, seed: int) -> list:
+    rng = random.Random(seed)
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+
+    vectors = []
+    for _ in range(count):
+        center = rng.choice(centers)
+        vector = [c + rng.gauss(0, 0.6) for c in center]
+        norm = math.sqrt(sum(v * v for v in vector))
+        vectors.append([v / norm for v in vector])
+    return vectors
+
+
+def source_vectors(provider: QdrantDBProvider, collection_name: str, limit: int) -> list:
+    vectors, offset = [], None
+    while len(vectors) < limit:
+        points, offset = provider.client.scroll(
+            collection_name=collection_name,
+            limit=min(256, limit - len(vectors)),
+            offset=offset,
+            with_vectors=True,
+        )
+        vectors.extend(point.vector for point in points)
+        if offset is None:
+            break
+    return vectors
+
+
+def load(provider: QdrantDBProvider, collection_name: str, vectors: list, ids: list):
+    provider.create_collection(collection_name=collection_name,
+                               embedding_size=len(vectors[0]), do_reset=True)
+    provider.begin_bulk_load(collection_name=collection_name)
+    provider.insert_many(
+        collection_name=collection_name,
+        texts=ids,
+        vectors=vectors,
+        record_ids=ids,
+        chunk_ids=ids,
+        batch_size=256,
+        bulk=True,
+    )
+    if not provider.end_bulk_load(collection_name=collection_name):
+        raise RuntimeError(f"{collection_name} did not finish indexing")
+
+
+def exact_neighbours(provider: QdrantDBProvider, collection_name: str,
+                     queries: list, limit: int) -> list:
+    return [
+        {
+            str(point.id)
+            for point in provider.client.search(
+                collection_name=collection_name,
+                query_vector=query,
+                search_params=models.SearchParams(exact=True),
+                limit=limit,
+            )
+        }
+        for query in queries
+    ]
+
+
+def measure(provider: QdrantDBProvider, collection_name: str, queries: list,
+            truth: list, limit: int) -> dict:
+    latencies, hits = [], 0
+
+    for query, expected in zip(queries, truth):
+        started_at = time.perf_counter()
+        results = provider.search_by_vector(collection_name=collection_name,
+                                            vector=query, limit=limit) or []
+        latencies.append((time.perf_counter() - started_at) * 1000)
+
+        # the payload text holds the point ID
+        hits += len(expected & { r.text for r in results })
+
+    latencies.sort()
+    return {
+        f"recall@{limit}": round(hits / (len(queries) * limit), 4),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--memory", action="store_true",
+                        help="use an in-process :memory: client (smoke test only, it ignores quantization)")
+    parser.add_argument("--source-collection", default=None,
+                        help="benchmark the vectors of an existing collection instead of synthetic ones")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--hnsw-ef", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    url = None if args.memory else args.url
+
+    base = QdrantDBProvider(url=url, api_key=None, distance_method="cosine")
+    base.connect()
+
+    if args.source_collection:
+        vectors = source_vectors(base, args.source_collection, args.points + args.queries)
+    else:
+        vectors = synthetic_vectors(args.points + args.queries, args.dim, args.clusters, args.seed)
+
+    # held-out vectors act as queries
+    random.Random(args.seed).shuffle(vectors)
+    queries, vectors = vectors[:args.queries], vectors[args.queries:]
+    ids = [str(uuid.uuid5(uuid.NAMESPACE_OID, str(i))) for i in range(len(vectors))]
+    dim = len(vectors[0])
+    logger.info(f"{len(vectors)} points, {len(queries)} queries, dim {dim}")
+
+    collection_name = "benchmark_quantization"
+    truth = None
+
+    try:
+        for label, options in CONFIGS:
+            provider = QdrantDBProvider(url=url, api_key=None, distance_method="cosine",
+                                        search_hnsw_ef=args.hnsw_ef, **options)
+            provider.client = base.client
+
+            load(provider, collection_name, vectors, ids)
+            if truth is None:
+                truth = exact_neighbours(provider, collection_name, queries, args.limit)
+
+            result = measure(provider, collection_name, queries, truth, args.limit)
+            # quantized vectors stay in RAM, originals only when not on disk
+            ram_mb = 0.0
+            if provider.quantization != QuantizationEnums.NONE.value:
+                ram_mb += len(vectors) * dim * RAM_BYTES_PER_DIM[provider.quantization] / 2**20
+            if not provider.vectors_on_disk:
+                ram_mb += len(vectors) * dim * 4 / 2**20
+
+            logger.info({"config": label, **result, "vector_ram_mb": round(ram_mb, 1)})
+    finally:
+        base.delete_collection(collection_name=collection_name)
+        base.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare search latency and recall of the LOCAL vector DB backend (brute
+force, and HNSW when hnswlib is installed) with Qdrant on the same vectors.
+
+Runs fully offline by default (Qdrant in-process :memory:). From src/:
+
+    python -m scripts.benchmark_vector_search --points 5000 --dim 768
+    python -m scripts.benchmark_vector_search --qdrant-url http://localhost:6333
+
+Recall@k is measured against LOCAL brute force, which is exact.
+"""
+from stores.vectordb.providers import QdrantDBProvider, LocalVectorDBProvider
+import numpy as np
+import argparse
+import tempfile
+import logging
+import shutil
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def measure(provider, collection_name: str, queries: np.ndarray, limit: int, truth: list = None):
+    latencies, results = [], []
+    for query in queries:
+        started_at = time.perf_counter()
+        documents = provider.search_by_vector(collection_name=collection_name,
+                                              vector=query.tolist(), limit=limit) or []
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        results.append({ d.text for d in documents })
+
+    stats = {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+    if truth is not None:
+        hits = sum(len(expected & found) for expected, found in zip(truth, results))
+        stats[f"recall@{limit}"] = round(hits / (len(queries) * limit), 4)
+    return stats, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--dtype", default="float32", choices=["float32", "float16"])
+    parser.add_argument("--hnsw-ef", type=int, default=128)
+    parser.add_argument("--qdrant-url", default=None, help="Qdrant server (default: in-process :memory:)")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    rng = np.random.default_rng(args.seed)
+    vectors = rng.normal(size=(args.points, args.dim)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    ids = [ str(i) for i in range(args.points) ]
+
+    db_path = tempfile.mkdtemp(prefix="local_vectordb_")
+    collection_name = "benchmark_vector_search"
+
+    providers = [
+        ("local exact", LocalVectorDBProvider(db_path=db_path, distance_method="cosine",
+                                              dtype=args.dtype)),
+        ("local hnsw", LocalVectorDBProvider(db_path=db_path, distance_method="cosine",
+                                             dtype=args.dtype, hnsw_threshold=0,
+                                             search_hnsw_ef=args.hnsw_ef)),
+        ("qdrant", QdrantDBProvider(url=args.qdrant_url, distance_method="cosine")),
+    ]
+
+    truth = None
+    try:
+        for label, provider in providers:
+            provider.connect()
+            if label == "local hnsw" and provider.hnswlib is None:
+                logger.info({"backend": label, "skipped": "hnswlib is not installed"})
+                continue
+
+            if not provider.is_collection_existed(collection_name):
+                provider.create_collection(collection_name=collection_name, embedding_size=args.dim)
+                started_at = time.perf_counter()
+                provider.insert_many(collection_name=collection_name, texts=ids,
+                                     vectors=vectors.tolist(), record_ids=ids, batch_size=256)
+                logger.info(f"{label}: inserted {args.points} points in {time.perf_counter() - started_at:.2f}s")
+
+            # warm up (loads or builds the HNSW graph)
+            provider.search_by_vector(collection_name=collection_name,
+                                      vector=queries[0].tolist(), limit=args.limit)
+
+            stats, results = measure(provider, collection_name, queries, args.limit, truth)
+            if truth is None:
+                truth = results
+            logger.info({"backend": label, **stats})
+    finally:
+        for label, provider in providers:
+            if label == "qdrant" and args.qdrant_url:
+                provider.delete_collection(collection_name=collection_name)
+            provider.disconnect()
+        shutil.rmtree(db_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Copy per-project Qdrant collections (collection_<project_id>) into the shared
+multi-tenant collection(s), tagging every point with its project_id.
+
+Run from src/ before setting VECTOR_DB_MULTI_TENANT=true:
+
+    python -m scripts.migrate_to_multi_tenant --dry-run
+    python -m scripts.migrate_to_multi_tenant
+    python -m scripts.migrate_to_multi_tenant --delete-source
+
+Points are copied with their vectors, so nothing is re-embedded. Points with
+integer IDs come from pushes made before point IDs were chunk UUIDs. They
+can't be matched to their chunks, so they are skipped; push those projects
+again with do_reset=1 after switching.
+"""
+from helpers.config import get_settings
+from controllers.NLPController import NLPController
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.providers.QdrantDBProvider import TENANT_PAYLOAD_KEY
+from qdrant_client import models
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+SOURCE_PREFIX = "collection_"
+
+
+def migrate_collection(vectordb_client, source_name: str, project_id: str,
+                       target_name: str, batch_size: int, dry_run: bool) -> dict:
+    client = vectordb_client.client
+    source_info = client.get_collection(collection_name=source_name)
+    embedding_size = source_info.config.params.vectors.size
+
+    if not dry_run:
+        vectordb_client.create_collection(
+            collection_name=target_name,
+            embedding_size=embedding_size,
+            multi_tenant=True,
+            tenant_payload_m=get_settings().VECTOR_DB_TENANT_PAYLOAD_M,
+        )
+
+    copied, skipped = 0, 0
+    offset = None
+
+    while True:
+        points, offset = client.scroll(
+            collection_name=source_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+
+        batch = []
+        for point in points:
+            if isinstance(point.id, int):
+                skipped += 1
+                continue
+
+            batch.append(models.PointStruct(
+                id=point.id,
+                vector=point.vector,
+                payload={**(point.payload or {}), TENANT_PAYLOAD_KEY: project_id},
+            ))
+
+        if batch and not dry_run:
+            client.upsert(collection_name=target_name, points=batch, wait=True)
+        copied += len(batch)
+
+        if offset is None:
+            break
+
+    return {
+        "source": source_name,
+        "target": target_name,
+        "copied": copied,
+        "skipped_integer_ids": skipped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report what would be copied")
+    parser.add_argument("--delete-source", action="store_true",
+                        help="drop each per-project collection once its points are verified in the target")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    settings = get_settings()
+    vectordb_client = VectorDBProviderFactory(settings).create(provider=settings.VECTOR_DB_BACKEND)
+    vectordb_client.connect()
+
+    source_names = [
+        collection.name
+        for collection in vectordb_client.list_all_collections().collections
+        if collection.name.startswith(SOURCE_PREFIX)
+    ]
+    logger.info(f"Found {len(source_names)} per-project collections")
+
+    for source_name in sorted(source_names):
+        project_id = source_name[len(SOURCE_PREFIX):]
+        target_name = NLPController.shared_collection_name(
+            project_id=project_id,
+            base_name=settings.VECTOR_DB_SHARED_COLLECTION_NAME,
+            shards=settings.VECTOR_DB_TENANT_SHARDS,
+        )
+
+        result = migrate_collection(
+            vectordb_client=vectordb_client,
+            source_name=source_name,
+            project_id=project_id,
+            target_name=target_name,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+        logger.info(result)
+
+        if args.dry_run or not args.delete_source:
+            continue
+
+        if result["skipped_integer_ids"]:
+            logger.warning(f"Keeping {source_name}: it has integer point IDs, re-push the project with do_reset=1")
+            continue
+
+        target_count = vectordb_client.count(collection_name=target_name, tenant_id=project_id)
+        if target_count < result["copied"]:
+            logger.warning(f"Keeping {source_name}: only {target_count}/{result['copied']} points found in {target_name}")
+            continue
+
+        vectordb_client.delete_collection(collection_name=source_name)
+        logger.info(f"Deleted {source_name}")
+
+    vectordb_client.disconnect()
+
+
+if __name__ == "__main__":
+    main()
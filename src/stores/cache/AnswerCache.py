@@ -0,0 +1,73 @@
+from .AnswerCacheBackendInterface import AnswerCacheBackendInterface
+from .QueryEmbeddingCache import QueryEmbeddingCache
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerCache:
+    """
+    Exact-match cache of RAG answers.
+
+    Keys cover everything the answer depends on: project, normalized query,
+    limit, search mode, generation model, prompt template version and the
+    project's index version. Bumping the index version (on push, reset or
+    asset deletion) makes the project's old entries unreachable; they age out
+    of the backend by LRU or TTL. Backend errors count as misses.
+    """
+
+    def __init__(self, backend: AnswerCacheBackendInterface, ttl_seconds: int = 3600):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(project_id: str, query: str, limit: int, mode: str,
+                 generation_model_id: str, prompt_version: str, index_version: int) -> str:
+        parts = [
+            project_id,
+            QueryEmbeddingCache.normalize_query(query),
+            str(limit),
+            str(mode),
+            str(generation_model_id),
+            prompt_version,
+            str(index_version),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    async def get(self, key: str):
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Answer cache lookup failed: {e}")
+            self.errors += 1
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: dict):
+        try:
+            await self.backend.set(key, value, ttl_seconds=self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Answer cache store failed: {e}")
+            self.errors += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "ttl_seconds": self.ttl_seconds,
+            **self.backend.get_stats(),
+        }
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+
+
+class AnswerCacheBackendInterface(ABC):
+    """Storage for AnswerCache entries: JSON-serializable dicts under string keys"""
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def get(self, key: str):
+        """The stored value, or None when missing or expired"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl_seconds: int = None):
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        pass
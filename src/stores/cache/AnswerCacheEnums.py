@@ -0,0 +1,11 @@
+from enum import Enum
+
+class AnswerCacheBackendEnum(Enum):
+    LRU = "LRU"
+    REDIS = "REDIS"
+
+class AnswerCacheStatusEnum(Enum):
+    HIT = "hit"
+    SEMANTIC_HIT = "semantic_hit"
+    MISS = "miss"
+    BYPASS = "bypass"
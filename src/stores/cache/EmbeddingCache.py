@@ -0,0 +1,207 @@
+from array import array
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    On-disk, content-addressed embedding cache backed by SQLite.
+
+    Entries are keyed on (embedding model id, task type, embedding size, text hash)
+    and stored as packed float32 blobs. When the stored size exceeds
+    `max_size_bytes`, least recently used entries are evicted.
+    """
+
+    # Per-row overhead (key, size and timestamp columns, b-tree bookkeeping)
+    ROW_OVERHEAD_BYTES = 64
+    # SQLite's default limit on bound parameters per statement is 999
+    LOOKUP_BATCH_SIZE = 500
+    # Evict down to this fraction of the budget so eviction does not run on every write
+    EVICTION_TARGET_RATIO = 0.9
+
+    def __init__(self, db_path: str, max_size_bytes: int):
+        self.db_path = db_path
+        self.max_size_bytes = max_size_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self.connection = None
+        self._total_bytes = 0
+
+    def connect(self):
+        """Open the SQLite database and create the table if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                cache_key BLOB PRIMARY KEY,
+                vector BLOB NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                last_accessed_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_accessed_at ON embeddings(last_accessed_at)"
+        )
+
+        row = self.connection.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM embeddings").fetchone()
+        self._total_bytes = row[0]
+        logger.info(f"Embedding cache opened at {self.db_path} ({self._total_bytes} bytes)")
+
+    def disconnect(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    @staticmethod
+    def make_key(model_id: str, task_type: str, embedding_size: int, text: str) -> bytes:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            f"{model_id}\x1f{task_type}\x1f{embedding_size}\x1f{text_hash}".encode("utf-8")
+        ).digest()
+
+    @staticmethod
+    def pack_vector(vector: list) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def unpack_vector(blob: bytes) -> list:
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Look up cached vectors
+
+        Args:
+            keys: Keys built with make_key
+
+        Returns:
+            Dict of key -> vector for the keys that were found
+        """
+        found = {}
+        if not keys or not self.connection:
+            return found
+
+        unique_keys = list(dict.fromkeys(keys))
+        now = time.time()
+
+        with self._lock:
+            for i in range(0, len(unique_keys), self.LOOKUP_BATCH_SIZE):
+                batch = unique_keys[i:i + self.LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT cache_key, vector FROM embeddings WHERE cache_key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+
+                for cache_key, blob in rows:
+                    found[cache_key] = self.unpack_vector(blob)
+
+            if found:
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_accessed_at = ? WHERE cache_key = ?",
+                    [(now, key) for key in found],
+                )
+
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+
+        return found
+
+    def set_many(self, items: list):
+        """
+        Store vectors
+
+        Args:
+            items: List of (key, vector) tuples
+        """
+        if not items or not self.connection:
+            return
+
+        now = time.time()
+        rows = []
+        # a key repeated within items is stored (and counted) once, with its last vector
+        for key, vector in dict(items).items():
+            blob = self.pack_vector(vector)
+            rows.append((key, blob, len(blob) + len(key) + self.ROW_OVERHEAD_BYTES, now))
+
+        with self._lock:
+            self.connection.execute("BEGIN")
+            try:
+                # Replacing an existing key must not count its size twice
+                for i in range(0, len(rows), self.LOOKUP_BATCH_SIZE):
+                    batch_keys = [row[0] for row in rows[i:i + self.LOOKUP_BATCH_SIZE]]
+                    placeholders = ",".join("?" * len(batch_keys))
+                    replaced = self.connection.execute(
+                        f"SELECT COALESCE(SUM(size_bytes), 0) FROM embeddings WHERE cache_key IN ({placeholders})",
+                        batch_keys,
+                    ).fetchone()[0]
+                    self._total_bytes -= replaced
+
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (cache_key, vector, size_bytes, last_accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._total_bytes += sum(row[2] for row in rows)
+
+                if self._total_bytes > self.max_size_bytes:
+                    self._evict()
+
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                self._total_bytes = self.connection.execute(
+                    "SELECT COALESCE(SUM(size_bytes), 0) FROM embeddings"
+                ).fetchone()[0]
+                raise
+
+    def _evict(self):
+        """Delete least recently used rows until the cache is under its target size"""
+        target = int(self.max_size_bytes * self.EVICTION_TARGET_RATIO)
+
+        while self._total_bytes > target:
+            rows = self.connection.execute(
+                "SELECT cache_key, size_bytes FROM embeddings ORDER BY last_accessed_at LIMIT ?",
+                (self.LOOKUP_BATCH_SIZE,),
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+
+            evicted = []
+            for cache_key, size_bytes in rows:
+                if self._total_bytes <= target:
+                    break
+                evicted.append((cache_key,))
+                self._total_bytes -= size_bytes
+
+            self.connection.executemany("DELETE FROM embeddings WHERE cache_key = ?", evicted)
+            self.evictions += len(evicted)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size_bytes": self._total_bytes,
+            "max_size_bytes": self.max_size_bytes,
+        }
@@ -0,0 +1,63 @@
+from .AnswerCacheBackendInterface import AnswerCacheBackendInterface
+from collections import OrderedDict
+import threading
+import time
+
+
+class LRUAnswerCacheBackend(AnswerCacheBackendInterface):
+    """
+    Process-local answer cache holding up to `max_entries` answers (LRU).
+    Each worker has its own copy; use the Redis backend to share answers.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+
+        # key -> (value, expires_at or None)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.expirations = 0
+        self.evictions = 0
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: dict, ttl_seconds: int = None):
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "LRU",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
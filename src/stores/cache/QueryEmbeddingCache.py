@@ -0,0 +1,106 @@
+from array import array
+from collections import OrderedDict
+import re
+import threading
+import time
+import unicodedata
+
+
+class QueryEmbeddingCache:
+    """
+    Process-local LRU/TTL cache for query embeddings.
+
+    Keys are (normalized query text, embedding model id); vectors are kept as
+    float32 arrays. The cache is bounded by an approximate byte budget and
+    entries older than `ttl_seconds` are treated as misses.
+    """
+
+    # Approximate per-entry overhead (OrderedDict slot, tuple key, array header, timestamp)
+    ENTRY_OVERHEAD_BYTES = 200
+
+    def __init__(self, max_size_bytes: int, ttl_seconds: int = 3600):
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_query(text: str) -> str:
+        text = unicodedata.normalize("NFKC", text).casefold()
+        return re.sub(r"\s+", " ", text).strip()
+
+    def make_key(self, text: str, model_id: str):
+        return self.normalize_query(text), model_id
+
+    def _entry_size(self, key, vector: array) -> int:
+        return len(key[0].encode("utf-8")) + vector.itemsize * len(vector) + self.ENTRY_OVERHEAD_BYTES
+
+    def _remove(self, key):
+        vector, _ = self._entries.pop(key)
+        self._size_bytes -= self._entry_size(key, vector)
+
+    def get(self, text: str, model_id: str):
+        """Return the cached vector as a list, or None on miss/expiry"""
+        key = self.make_key(text=text, model_id=model_id)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, stored_at = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return vector.tolist()
+
+    def set(self, text: str, model_id: str, vector: list):
+        key = self.make_key(text=text, model_id=model_id)
+        packed = array("f", vector)
+        size = self._entry_size(key, packed)
+        if size > self.max_size_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (packed, time.monotonic())
+            self._size_bytes += size
+
+            while self._size_bytes > self.max_size_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self._size_bytes,
+            "max_size_bytes": self.max_size_bytes,
+        }
@@ -0,0 +1,56 @@
+from .AnswerCacheBackendInterface import AnswerCacheBackendInterface
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RedisAnswerCacheBackend(AnswerCacheBackendInterface):
+    """
+    Answer cache shared by every worker, stored in Redis as JSON strings.
+    Entries expire through Redis TTLs; size is bounded by the server's
+    maxmemory policy (allkeys-lru recommended).
+    """
+
+    def __init__(self, url: str, key_prefix: str = "rag:answer:"):
+        self.url = url
+        self.key_prefix = key_prefix
+        self.client = None
+
+    async def connect(self):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            logger.warning("redis is not installed, the answer cache is disabled")
+            return
+
+        self.client = redis.from_url(self.url)
+        logger.info(f"Answer cache connected to Redis: {self.url}")
+
+    async def disconnect(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def get(self, key: str):
+        if self.client is None:
+            return None
+
+        raw = await self.client.get(self.key_prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: dict, ttl_seconds: int = None):
+        if self.client is None:
+            return
+
+        await self.client.set(self.key_prefix + key,
+                              json.dumps(value, ensure_ascii=False),
+                              ex=ttl_seconds or None)
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "REDIS",
+            "connected": self.client is not None,
+        }
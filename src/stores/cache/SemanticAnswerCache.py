@@ -0,0 +1,168 @@
+from collections import OrderedDict
+import threading
+import numpy as np
+
+
+class _ProjectAnswers:
+    """One project's cached answers: unit query vectors stacked in a matrix"""
+
+    def __init__(self, index_version: int, dim: int, capacity: int):
+        self.index_version = index_version
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.last_used = np.empty(capacity, dtype=np.int64)
+        self.variant_ids = np.empty(capacity, dtype=np.int32)
+        # variant string -> small int, so the variant filter is vectorized too
+        self.variant_codes = {}
+        self.entries = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def grow(self, max_entries: int):
+        capacity = min(max_entries, 2 * len(self.vectors))
+        vectors = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+        last_used = np.empty(capacity, dtype=np.int64)
+        variant_ids = np.empty(capacity, dtype=np.int32)
+        vectors[:len(self)] = self.vectors[:len(self)]
+        last_used[:len(self)] = self.last_used[:len(self)]
+        variant_ids[:len(self)] = self.variant_ids[:len(self)]
+        self.vectors, self.last_used, self.variant_ids = vectors, last_used, variant_ids
+
+    def variant_id(self, variant: str) -> int:
+        return self.variant_codes.setdefault(variant, len(self.variant_codes))
+
+
+class SemanticAnswerCache:
+    """
+    Process-local cache of RAG answers looked up by query embedding.
+
+    A lookup returns the answer of the most similar earlier query of the
+    same project and variant (limit, mode, model, prompt) when their cosine
+    similarity is at least `threshold`. Each project's query vectors form one
+    NumPy matrix, so a lookup is a single matrix-vector product. Projects hold
+    up to `max_entries_per_project` answers (least recently used evicted) and
+    at most `max_projects` projects are kept. A project's answers are dropped
+    when a newer index version shows up; callers still holding an older
+    version (loaded just before a bump) miss and don't write.
+    """
+
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, threshold: float = 0.95, max_entries_per_project: int = 512,
+                 max_projects: int = 64):
+        self.threshold = threshold
+        self.max_entries_per_project = max_entries_per_project
+        self.max_projects = max_projects
+
+        self._projects = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _unit(vector: list) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _current(self, project_id: str, index_version: int):
+        """The project's answers at index_version, dropping those of an older version"""
+        answers = self._projects.get(project_id)
+        if answers is not None and index_version > answers.index_version:
+            del self._projects[project_id]
+            self.invalidations += 1
+            return None
+        return answers
+
+    def get(self, project_id: str, index_version: int, variant: str, vector: list):
+        """
+        Returns:
+            Tuple of (cached value, similarity) of the closest earlier query,
+            or None when none reaches the threshold
+        """
+        query = self._unit(vector)
+
+        with self._lock:
+            answers = self._current(project_id, index_version)
+            if not answers or answers.index_version != index_version \
+                    or answers.vectors.shape[1] != len(query) \
+                    or variant not in answers.variant_codes:
+                self.misses += 1
+                return None
+
+            count = len(answers)
+            similarities = answers.vectors[:count] @ query
+            # only answers produced with the same limit/mode/model/prompt qualify
+            similarities[answers.variant_ids[:count] != answers.variant_codes[variant]] = -np.inf
+
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            answers.last_used[best] = self._tick()
+            self._projects.move_to_end(project_id)
+            self.hits += 1
+            return answers.entries[best], similarity
+
+    def set(self, project_id: str, index_version: int, variant: str, vector: list, value: dict):
+        query = self._unit(vector)
+
+        with self._lock:
+            answers = self._current(project_id, index_version)
+            if answers is not None and answers.index_version > index_version:
+                # answered from an index that has since changed
+                return
+
+            if answers is None or answers.vectors.shape[1] != len(query):
+                answers = _ProjectAnswers(index_version=index_version, dim=len(query),
+                                          capacity=min(self.INITIAL_CAPACITY, self.max_entries_per_project))
+                self._projects[project_id] = answers
+
+                while len(self._projects) > self.max_projects:
+                    self._projects.popitem(last=False)
+                    self.evictions += 1
+
+            self._projects.move_to_end(project_id)
+
+            count = len(answers)
+            if count < self.max_entries_per_project:
+                if count == len(answers.vectors):
+                    answers.grow(self.max_entries_per_project)
+                row = count
+                answers.entries.append(value)
+            else:
+                row = int(np.argmin(answers.last_used[:count]))
+                answers.entries[row] = value
+                self.evictions += 1
+
+            answers.vectors[row] = query
+            answers.variant_ids[row] = answers.variant_id(variant)
+            answers.last_used[row] = self._tick()
+
+    def invalidate(self, project_id: str):
+        with self._lock:
+            if self._projects.pop(project_id, None) is not None:
+                self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "threshold": self.threshold,
+            "projects": len(self._projects),
+            "entries": sum(len(answers) for answers in self._projects.values()),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,7 @@
+from .EmbeddingCache import EmbeddingCache
+from .QueryEmbeddingCache import QueryEmbeddingCache
+from .AnswerCache import AnswerCache
+from .AnswerCacheEnums import AnswerCacheBackendEnum, AnswerCacheStatusEnum
+from .LRUAnswerCacheBackend import LRUAnswerCacheBackend
+from .RedisAnswerCacheBackend import RedisAnswerCacheBackend
+from .SemanticAnswerCache import SemanticAnswerCache
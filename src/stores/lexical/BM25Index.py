@@ -0,0 +1,71 @@
+from .tokenizer import tokenize
+from collections import Counter
+import heapq
+import math
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over one project's chunk texts.
+
+    Postings map a term to {document number: term frequency}; documents are
+    only appended (chunks are deleted per project, which drops the index).
+    Not thread-safe: used from the event loop only.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self.postings = {}
+        self.doc_lengths = []
+        self.documents = []
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @property
+    def term_count(self) -> int:
+        return len(self.postings)
+
+    def add(self, text: str, metadata: dict = None, token_count: int = None):
+        doc_number = len(self.documents)
+        terms = Counter(tokenize(text))
+
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[doc_number] = frequency
+
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        self.documents.append((text, metadata, token_count))
+
+    def idf(self, term: str) -> float:
+        document_frequency = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.documents) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def search(self, text: str, limit: int = 10) -> list:
+        """Top (score, text, metadata, token_count) matches of a query, best first"""
+        if not self.documents:
+            return []
+
+        average_length = self.total_length / len(self.documents) or 1.0
+        scores = {}
+
+        for term in set(tokenize(text)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            idf = self.idf(term)
+            for doc_number, frequency in postings.items():
+                length_norm = 1 - self.b + self.b * self.doc_lengths[doc_number] / average_length
+                score = idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                scores[doc_number] = scores.get(doc_number, 0.0) + score
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            (score, *self.documents[doc_number])
+            for doc_number, score in top
+        ]
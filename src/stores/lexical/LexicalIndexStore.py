@@ -0,0 +1,134 @@
+from .BM25Index import BM25Index
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LexicalIndexStore:
+    """
+    Process-local BM25 indexes of the most recently searched projects (LRU).
+
+    A project's index is built from its chunks on first search, then kept
+    up to date by add_chunks as chunks are processed and dropped by
+    invalidate when they are deleted. Other workers' changes are picked up
+    when an index is older than ttl_seconds and gets rebuilt.
+    """
+
+    def __init__(self, max_projects: int = 32, ttl_seconds: int = 600,
+                 k1: float = 1.2, b: float = 0.75, page_size: int = 500):
+        self.max_projects = max_projects
+        self.ttl_seconds = ttl_seconds
+        self.k1 = k1
+        self.b = b
+        self.page_size = page_size
+
+        # project id -> (BM25Index, built_at)
+        self._indexes = OrderedDict()
+        # project id -> change counter, to tell whether chunks changed during a build
+        self._generations = {}
+        # project id -> [build lock, callers holding or waiting on it]
+        self._build_locks = {}
+
+        self.hits = 0
+        self.builds = 0
+        self.build_seconds = 0.0
+        self.evictions = 0
+
+    def _cached(self, project_id: str):
+        entry = self._indexes.get(project_id)
+        if entry is None:
+            return None
+
+        index, built_at = entry
+        if self.ttl_seconds and time.monotonic() - built_at > self.ttl_seconds:
+            del self._indexes[project_id]
+            return None
+
+        self._indexes.move_to_end(project_id)
+        return index
+
+    async def get_index(self, project_id: str, chunk_model) -> BM25Index:
+        """The project's index, built from chunk_model if it isn't cached"""
+        index = self._cached(project_id)
+        if index is not None:
+            self.hits += 1
+            return index
+
+        # one lock per project while anyone waits on it, so builds never overlap
+        entry = self._build_locks.setdefault(project_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                # built by a concurrent search while we waited
+                index = self._cached(project_id)
+                if index is not None:
+                    self.hits += 1
+                    return index
+
+                return await self._build(project_id, chunk_model)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._build_locks[project_id]
+
+    async def _build(self, project_id: str, chunk_model) -> BM25Index:
+        generation = self._generations.get(project_id, 0)
+        started_at = time.perf_counter()
+
+        index = BM25Index(k1=self.k1, b=self.b)
+        async for page_chunks in chunk_model.iter_project_chunks(project_id=project_id,
+                                                                 page_size=self.page_size):
+            for chunk in page_chunks:
+                index.add(chunk.chunk_text, chunk.chunk_metadata, chunk.chunk_token_count)
+
+        build_seconds = time.perf_counter() - started_at
+        self.builds += 1
+        self.build_seconds += build_seconds
+        logger.info(f"Built lexical index of project {project_id}: "
+                    f"{len(index)} chunks, {index.term_count} terms in {build_seconds:.2f}s")
+
+        # chunks added or deleted mid-build may be missing: serve this search, rebuild next time
+        if self._generations.get(project_id, 0) == generation:
+            self._store(project_id, index)
+
+        return index
+
+    def _store(self, project_id: str, index: BM25Index):
+        self._indexes[project_id] = (index, time.monotonic())
+        self._indexes.move_to_end(project_id)
+
+        while len(self._indexes) > self.max_projects:
+            self._indexes.popitem(last=False)
+            self.evictions += 1
+
+    def add_chunks(self, project_id: str, chunks: list):
+        """Index newly inserted chunks (only if the project's index is loaded)"""
+        self._generations[project_id] = self._generations.get(project_id, 0) + 1
+
+        entry = self._indexes.get(project_id)
+        if entry is None:
+            return
+
+        index, _ = entry
+        for chunk in chunks:
+            index.add(chunk.chunk_text, chunk.chunk_metadata, chunk.chunk_token_count)
+
+    def invalidate(self, project_id: str):
+        """Drop a project's index after its chunks were deleted"""
+        self._generations[project_id] = self._generations.get(project_id, 0) + 1
+        self._indexes.pop(project_id, None)
+
+    def get_stats(self) -> dict:
+        return {
+            "projects": len(self._indexes),
+            "max_projects": self.max_projects,
+            "documents": sum(len(index) for index, _ in self._indexes.values()),
+            "terms": sum(index.term_count for index, _ in self._indexes.values()),
+            "hits": self.hits,
+            "builds": self.builds,
+            "build_seconds": round(self.build_seconds, 3),
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,3 @@
+from .BM25Index import BM25Index
+from .LexicalIndexStore import LexicalIndexStore
+from .tokenizer import tokenize, normalize_arabic
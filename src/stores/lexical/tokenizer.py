@@ -0,0 +1,60 @@
+import re
+import unicodedata
+
+# Harakat, tanween, shadda, sukun and superscript alef
+ARABIC_DIACRITICS = re.compile("[\u064B-\u0652\u0670]")
+TATWEEL = "\u0640"
+
+ARABIC_CHAR_MAP = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي",
+    "ة": "ه",
+    "ؤ": "و",
+    "ئ": "ي",
+    # Arabic-Indic and Persian digits
+    **{ chr(0x0660 + d): str(d) for d in range(10) },
+    **{ chr(0x06F0 + d): str(d) for d in range(10) },
+})
+
+# Light stemming: definite article (with attached conjunctions and prepositions)
+# and common plural/dual/possessive suffixes, longest first
+ARABIC_PREFIXES = ("وبال", "وال", "بال", "كال", "فال", "ولل", "لل", "ال")
+ARABIC_SUFFIXES = ("ها", "ان", "ات", "ون", "ين", "يه", "ه")
+MIN_STEM_LENGTH = 2
+
+TOKEN_PATTERN = re.compile(r"\w+")
+ARABIC_LETTERS = re.compile("[\u0621-\u064A]")
+
+
+def normalize_arabic(text: str) -> str:
+    """Unify the letter variants people type interchangeably and drop diacritics and tatweel"""
+    text = ARABIC_DIACRITICS.sub("", text).replace(TATWEEL, "")
+    return text.translate(ARABIC_CHAR_MAP)
+
+
+def stem_arabic(token: str) -> str:
+    for prefix in ARABIC_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= MIN_STEM_LENGTH:
+            token = token[len(prefix):]
+            break
+
+    for suffix in ARABIC_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH + 1:
+            token = token[:-len(suffix)]
+            break
+
+    return token
+
+
+def tokenize(text: str) -> list:
+    """
+    Lexical index terms of a text: NFKC, casefolded, Arabic-normalized and
+    light-stemmed word tokens. Used for both chunks and queries, so
+    "المدرسة" matches "مدرسه" and "Learning" matches "learning".
+    """
+    text = normalize_arabic(unicodedata.normalize("NFKC", text).casefold())
+
+    return [
+        stem_arabic(token) if ARABIC_LETTERS.match(token) else token
+        for token in TOKEN_PATTERN.findall(text)
+    ]
@@ -0,0 +1,56 @@
+from .LLMExceptions import LLMProviderError
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def create_async_http_client(max_connections: int = 100,
+                             max_keepalive_connections: int = 20,
+                             keepalive_expiry: float = 30.0,
+                             timeout: float = 60.0,
+                             http2: bool = True) -> httpx.AsyncClient:
+    """
+    Create the pooled AsyncClient shared by all async LLM providers.
+    Connections are kept alive between calls; HTTP/2 is used when the `h2`
+    package is installed and the server negotiates it.
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("h2 is not installed, falling back to HTTP/1.1 for LLM providers")
+            http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(timeout, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+
+def parse_retry_after(response: httpx.Response):
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+async def raise_for_provider_status(response: httpx.Response, provider: str):
+    """Raise LLMProviderError for non-2xx responses (reads the body of streamed responses)"""
+    if response.status_code < 400:
+        return
+
+    await response.aread()
+    raise LLMProviderError(
+        f"{provider} API error: {response.status_code} - {response.text}",
+        status_code=response.status_code,
+        retry_after=parse_retry_after(response),
+    )
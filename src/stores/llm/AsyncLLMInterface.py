@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+class AsyncLLMInterface(ABC):
+
+    @abstractmethod
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        pass
+
+    @abstractmethod
+    def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        pass
+
+    @abstractmethod
+    async def aembed_text(self, text: str, document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        pass
@@ -0,0 +1,359 @@
+from .LLMExceptions import LLMProviderError
+from .AsyncLLMInterface import AsyncLLMInterface
+from stores.cache import EmbeddingCache
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket holding up to one minute of budget, refilled continuously"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        # A thread lock (never held across an await) keeps the bucket usable from any event loop
+        self._lock = threading.Lock()
+
+    def _try_take(self, amount: float) -> float:
+        """Take `amount` tokens if available, otherwise return the seconds to wait for them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+
+            return (amount - self._tokens) / self.rate
+
+    async def acquire(self, amount: float = 1):
+        # A single request larger than the whole budget would otherwise wait forever
+        amount = min(amount, self.capacity)
+        while True:
+            wait = self._try_take(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class ProviderBudget:
+    """
+    Shared limits for one (provider, API key) pair: a concurrency cap, request
+    and token buckets, and an adaptive batch size (additive increase after a run
+    of successes, halved on rate limits and server errors).
+    """
+
+    GROW_AFTER_SUCCESSES = 5
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int,
+                 tokens_per_minute: int, max_batch_size: int):
+        self.limits = (max_concurrency, requests_per_minute, tokens_per_minute)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = TokenBucket(per_minute=requests_per_minute)
+        self.tokens = TokenBucket(per_minute=tokens_per_minute)
+
+        self.max_batch_size = max_batch_size
+        self.batch_size = max_batch_size
+        self._successes = 0
+
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "failed": 0,
+        }
+
+    def on_success(self):
+        self.stats["requests"] += 1
+        self._successes += 1
+        if self._successes >= self.GROW_AFTER_SUCCESSES and self.batch_size < self.max_batch_size:
+            self.batch_size = min(self.max_batch_size, self.batch_size + max(1, self.max_batch_size // 8))
+            self._successes = 0
+
+    def on_error(self, error: LLMProviderError, batch_size: int):
+        self.stats["requests"] += 1
+        self._successes = 0
+
+        if error.is_rate_limited:
+            self.stats["rate_limited"] += 1
+        elif error.status_code is None or error.status_code >= 500:
+            self.stats["server_errors"] += 1
+
+        # Concurrent failures of batches sent at the same size only halve it once
+        if batch_size >= self.batch_size:
+            self.batch_size = max(1, batch_size // 2)
+
+
+class ProviderBudgets:
+    """
+    Budgets per (provider, API key), shared by the schedulers handed the same
+    registry. The app creates one per lifespan, so budgets (and the semaphores
+    bound to its event loop) don't outlive it.
+    """
+
+    def __init__(self):
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, max_concurrency: int, requests_per_minute: int,
+            tokens_per_minute: int, max_batch_size: int) -> ProviderBudget:
+        limits = (max_concurrency, requests_per_minute, tokens_per_minute)
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is None:
+                budget = ProviderBudget(
+                    max_concurrency=max_concurrency,
+                    requests_per_minute=requests_per_minute,
+                    tokens_per_minute=tokens_per_minute,
+                    max_batch_size=max_batch_size,
+                )
+                self._budgets[key] = budget
+            elif budget.limits != limits:
+                logger.warning(f"Embedding budget for {key[0]} already exists with limits {budget.limits} "
+                               f"(concurrency, RPM, TPM); ignoring {limits}")
+            return budget
+
+    def clear(self):
+        with self._lock:
+            self._budgets.clear()
+
+
+class EmbeddingScheduler:
+    """
+    Runs embedding batches concurrently under per-provider/key rate limits,
+    retrying 429 and 5xx responses with jittered exponential backoff.
+    Texts already in the optional embedding cache never reach the provider.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 100
+
+    def __init__(self, embedding_client,
+                 max_concurrency: int = 4,
+                 requests_per_minute: int = 100,
+                 tokens_per_minute: int = 1000000,
+                 max_retries: int = 5,
+                 backoff_base_seconds: float = 1.0,
+                 backoff_max_seconds: float = 30.0,
+                 cache: EmbeddingCache = None,
+                 budgets: ProviderBudgets = None):
+
+        self.embedding_client = embedding_client
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        max_batch_size = getattr(embedding_client, "EMBEDDING_MAX_BATCH_SIZE", self.DEFAULT_MAX_BATCH_SIZE)
+
+        # without a shared registry the scheduler has budgets of its own
+        self.budgets = budgets or ProviderBudgets()
+        self.budget = self.budgets.get(
+            key=self.get_budget_key(embedding_client),
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_batch_size=max_batch_size,
+        )
+
+    @staticmethod
+    def get_budget_key(embedding_client):
+        """Budget key: provider class name plus a fingerprint of its API key"""
+        api_key = getattr(embedding_client, "api_key", None) or ""
+        fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+        return type(embedding_client).__name__, fingerprint
+
+    def estimate_tokens(self, text: str) -> int:
+        """Rough token estimate (~4 characters per token) used for the TPM budget"""
+        max_characters = getattr(self.embedding_client, "default_input_max_characters", None)
+        if max_characters:
+            text = text[:max_characters]
+        return len(text) // 4 + 1
+
+    def get_backoff_delay(self, attempt: int, retry_after: float = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get_stats(self) -> dict:
+        stats = {
+            **self.budget.stats,
+            "batch_size": self.budget.batch_size,
+            "max_batch_size": self.budget.max_batch_size,
+        }
+        if self.cache:
+            stats["cache"] = self.cache.get_stats()
+        return stats
+
+    async def _call_provider(self, texts: list, document_type: str):
+        async with self.budget.semaphore:
+            await self.budget.requests.acquire(1)
+            await self.budget.tokens.acquire(sum(self.estimate_tokens(text) for text in texts))
+
+            if isinstance(self.embedding_client, AsyncLLMInterface):
+                return await self.embedding_client.aembed_batch(texts=texts, document_type=document_type)
+
+            return await asyncio.to_thread(
+                self.embedding_client.embed_batch, texts, document_type
+            )
+
+    async def _process_batch(self, texts: list, document_type: str, indices: list, attempt: int,
+                             vectors: list, queue: asyncio.Queue, failures: list):
+        if failures:
+            return
+
+        # The batch size may have shrunk since this batch was queued
+        batch_size = self.budget.batch_size
+        if len(indices) > batch_size:
+            for i in range(0, len(indices), batch_size):
+                queue.put_nowait((indices[i:i + batch_size], attempt))
+            return
+
+        batch = [texts[i] for i in indices]
+
+        try:
+            result = await self._call_provider(texts=batch, document_type=document_type)
+        except LLMProviderError as e:
+            self.budget.on_error(e, batch_size=len(batch))
+
+            if not e.is_retryable or attempt >= self.max_retries:
+                self.budget.stats["failed"] += 1
+                failures.append(e)
+                return
+
+            delay = self.get_backoff_delay(attempt=attempt, retry_after=e.retry_after)
+            logger.warning(
+                f"Embedding batch of {len(batch)} failed with status {e.status_code}, "
+                f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+            )
+            self.budget.stats["retries"] += 1
+
+            await asyncio.sleep(delay)
+            queue.put_nowait((indices, attempt + 1))
+            return
+
+        if not result or len(result) != len(batch):
+            self.budget.stats["failed"] += 1
+            failures.append(LLMProviderError("Embedding provider returned no vectors"))
+            return
+
+        self.budget.on_success()
+        for i, vector in zip(indices, result):
+            vectors[i] = vector
+
+    async def embed_batch(self, texts: list, document_type: str = None):
+        """
+        Embed texts through the cache and the scheduler
+
+        Args:
+            texts: Texts to embed
+            document_type: DocumentTypeEnum value
+
+        Returns:
+            List of vectors in input order, or None if any batch failed for good
+        """
+        if not texts:
+            return []
+
+        if not self.cache:
+            return await self._embed_uncached(texts=texts, document_type=document_type)
+
+        keys = [
+            self.cache.make_key(
+                model_id=self.embedding_client.embedding_model_id,
+                task_type=document_type,
+                embedding_size=self.embedding_client.embedding_size,
+                text=text,
+            )
+            for text in texts
+        ]
+
+        try:
+            cached = await asyncio.to_thread(self.cache.get_many, keys)
+        except Exception as e:
+            logger.error(f"Embedding cache lookup failed: {e}")
+            cached = {}
+
+        vectors = [cached.get(key) for key in keys]
+
+        # Only embed each distinct missing text once
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], i)
+
+        if not missing:
+            return vectors
+
+        missing_keys = list(missing.keys())
+        missing_vectors = await self._embed_uncached(
+            texts=[texts[missing[key]] for key in missing_keys],
+            document_type=document_type,
+        )
+        if missing_vectors is None:
+            return None
+
+        embedded = dict(zip(missing_keys, missing_vectors))
+        try:
+            await asyncio.to_thread(self.cache.set_many, list(embedded.items()))
+        except Exception as e:
+            logger.error(f"Embedding cache write failed: {e}")
+
+        return [
+            vector if vector is not None else embedded[keys[i]]
+            for i, vector in enumerate(vectors)
+        ]
+
+    async def _embed_uncached(self, texts: list, document_type: str = None):
+        vectors = [None] * len(texts)
+        failures = []
+
+        queue = asyncio.Queue()
+        queue.put_nowait((list(range(len(texts))), 0))
+
+        async def worker():
+            while True:
+                indices, attempt = await queue.get()
+                try:
+                    await self._process_batch(
+                        texts=texts, document_type=document_type, indices=indices,
+                        attempt=attempt, vectors=vectors, queue=queue, failures=failures,
+                    )
+                except Exception as e:
+                    failures.append(e)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if failures:
+            logger.error(f"Embedding failed for {len(texts)} texts: {failures[0]}")
+            return None
+
+        return vectors
+
+    async def embed_text(self, text: str, document_type: str = None):
+        vectors = await self.embed_batch(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
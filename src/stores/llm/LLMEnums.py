@@ -4,6 +4,7 @@ class LLMEnums(Enum):
     GEMINI = "GEMINI"
     COHERE = "COHERE"
     OPENROUTER = "OPENROUTER"
+    FAKE = "FAKE"
 
 
 class GeminiEnums(Enum):
@@ -27,7 +28,19 @@ class OpenRouterEnums(Enum):
     ASSISTANT = "assistant"
     DOCUMENT = "document"
     QUERY = "query"
+
+class FakeEnums(Enum):
+    SYSTEM = "system"
+    USER = "user"
+    ASSISTANT = "assistant"
+    DOCUMENT = "document"
+    QUERY = "query"
     
 class DocumentTypeEnum(Enum):
     DOCUMENT = "document"
-    QUERY = "query"
\ No newline at end of file
+    QUERY = "query"
+
+class LLMRouterEnums(Enum):
+    SYSTEM = "system"
+    USER = "user"
+    ASSISTANT = "assistant"
@@ -0,0 +1,30 @@
+class LLMProviderError(Exception):
+    """Error raised by a provider call, carrying the upstream HTTP status when known"""
+
+    def __init__(self, message: str, status_code: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_exception(cls, error: Exception, provider: str = None):
+        """Wrap an SDK/transport exception, picking up its status code if it has one"""
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            code = getattr(error, "code", None)
+            status_code = code if isinstance(code, int) else None
+
+        retry_after = getattr(error, "retry_after", None)
+        message = f"{provider} error: {error}" if provider else str(error)
+        return cls(message, status_code=status_code, retry_after=retry_after)
+
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.status_code == 429
+
+    @property
+    def is_retryable(self) -> bool:
+        # Unknown status means a transport error (timeout, reset connection)
+        if self.status_code is None:
+            return True
+        return self.status_code in (408, 429) or self.status_code >= 500
@@ -15,10 +15,19 @@ class LLMInterface(ABC):
                             temperature: float = None):
         pass
 
+    @abstractmethod
+    def stream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        pass
+
     @abstractmethod
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    def embed_batch(self, texts: list, document_type: str = None):
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
@@ -6,36 +6,57 @@ from .providers.OpenRouterProvider import OpenRouterProvider
 class LLMProviderFactory:
     """Factory for creating LLM providers"""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, http_client=None):
         self.config = config
+        # Pooled httpx.AsyncClient shared by every provider's async methods
+        self.http_client = http_client
 
-    def create(self, provider: str):
-        """Create an LLM provider based on the provider name"""
+    def create(self, provider: str, api_key: str = None):
+        """Create an LLM provider based on the provider name (api_key overrides the configured key)"""
         
         if provider == LLMEnums.GEMINI.value:
             return GeminiProvider(
-                api_key=self.config.GEMINI_API_KEY,
+                api_key=api_key or self.config.GEMINI_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                generation_input_max_characters=self.config.GENERATION_INPUT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_client=self.http_client,
             )
         
         if provider == LLMEnums.COHERE.value:
             # Lazy import to avoid requiring cohere package when not used
             from .providers.CoHereProvider import CoHereProvider
             return CoHereProvider(
-                api_key=self.config.COHERE_API_KEY,
+                api_key=api_key or self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                generation_input_max_characters=self.config.GENERATION_INPUT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_client=self.http_client,
             )
         
         if provider == LLMEnums.OPENROUTER.value:
             return OpenRouterProvider(
-                api_key=self.config.OPENROUTER_API_KEY,
+                api_key=api_key or self.config.OPENROUTER_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                generation_input_max_characters=self.config.GENERATION_INPUT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                request_timeout=self.config.LLM_HTTP_TIMEOUT_SECONDS,
+                http_client=self.http_client,
+            )
+
+        if provider == LLMEnums.FAKE.value:
+            from .providers.FakeProvider import FakeProvider
+            return FakeProvider(
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                generation_input_max_characters=self.config.GENERATION_INPUT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                latency_seconds=self.config.FAKE_LLM_LATENCY_SECONDS,
+                rate_limit_error_rate=self.config.FAKE_LLM_RATE_LIMIT_ERROR_RATE,
+                max_requests_per_minute=self.config.FAKE_LLM_MAX_REQUESTS_PER_MINUTE,
             )
 
         return None
\ No newline at end of file
@@ -0,0 +1,395 @@
+from .LLMInterface import LLMInterface
+from .AsyncLLMInterface import AsyncLLMInterface
+from .LLMEnums import LLMRouterEnums
+from bisect import bisect_left
+import asyncio
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Log-spaced latency histogram (50 ms up to ~2 minutes). Counts are halved
+    every `decay_every` samples so percentiles follow recent behaviour.
+    """
+
+    BOUNDS = tuple(0.05 * 1.5 ** i for i in range(20))
+
+    def __init__(self, decay_every: int = 1000):
+        self.decay_every = decay_every
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self._since_decay = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self._since_decay += 1
+        if self._since_decay >= self.decay_every:
+            self.counts = [count // 2 for count in self.counts]
+            self._since_decay = 0
+
+    def percentile(self, q: float):
+        """Upper bound of the bucket holding the q-th sample, None when empty"""
+        count = self.count
+        if not count:
+            return None
+
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= q * count:
+                return self.BOUNDS[min(i, len(self.BOUNDS) - 1)]
+
+        return self.BOUNDS[-1]
+
+    def to_dict(self) -> dict:
+        def rounded(q):
+            value = self.percentile(q)
+            return round(value, 3) if value is not None else None
+
+        return {"count": self.count, "p50": rounded(0.5), "p90": rounded(0.9), "p99": rounded(0.99)}
+
+
+class GenerationTarget:
+    """One (provider, model, key) the router can send a generation to"""
+
+    def __init__(self, name: str, client):
+        self.name = name
+        self.client = client
+        # full answers, and time to first token for streams
+        self.latency = LatencyHistogram()
+        self.first_token_latency = LatencyHistogram()
+        self.stats = {"attempts": 0, "hedges": 0, "successes": 0, "failures": 0, "cancelled": 0}
+
+
+class LLMRouter(LLMInterface, AsyncLLMInterface):
+    """
+    Generation client over an ordered list of targets (provider, model, key).
+
+    Async calls go to the first target. When it hasn't answered within its
+    hedge delay (the `hedge_percentile` of its recent latencies, or
+    `hedge_default_delay_seconds` until `hedge_min_samples` are recorded) the
+    request is also sent to the next target; the first answer wins and the
+    other attempt is cancelled, its running time recorded as a lower bound of
+    its latency. Errors and empty answers fail over to the next target
+    straight away. At most `max_in_flight` attempts run per request.
+    For streams the hedge is on time to first token; once a target has sent
+    text the stream stays on it.
+
+    Sync calls only fail over (no hedging). Embedding calls go to the first
+    target; embeddings have their own client and scheduler.
+    """
+
+    def __init__(self, targets: list,
+                 hedge_enabled: bool = True,
+                 hedge_percentile: float = 0.95,
+                 hedge_min_samples: int = 20,
+                 hedge_default_delay_seconds: float = 10.0,
+                 hedge_min_delay_seconds: float = 0.5,
+                 max_in_flight: int = 2):
+        if not targets:
+            raise ValueError("LLMRouter needs at least one target")
+
+        self.targets = [GenerationTarget(name=name, client=client) for name, client in targets]
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay_seconds = hedge_default_delay_seconds
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.max_in_flight = max(1, max_in_flight)
+
+        self.enums = LLMRouterEnums
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0, "failed": 0}
+
+    @classmethod
+    def from_targets(cls, llm_provider_factory, targets: list, **kwargs):
+        """
+        Build a router from target dicts: {"provider", "model", "api_key"}
+        (api_key defaults to the provider's configured key).
+        """
+        clients = []
+        for target in targets:
+            client = llm_provider_factory.create(provider=target["provider"], api_key=target.get("api_key"))
+            if client is None:
+                raise ValueError(f"Unknown generation provider: {target['provider']}")
+            client.set_generation_model(model_id=target["model"])
+
+            name = f"{target['provider']}:{target['model']}"
+            if target.get("api_key"):
+                name += "#" + hashlib.sha256(target["api_key"].encode("utf-8")).hexdigest()[:6]
+            clients.append((name, client))
+
+        return cls(targets=clients, **kwargs)
+
+    @property
+    def primary(self):
+        return self.targets[0].client
+
+    @property
+    def generation_model_id(self):
+        # answers may come from any target, so all of them key the answer caches
+        return ",".join(str(target.client.generation_model_id) for target in self.targets)
+
+    def set_generation_model(self, model_id: str):
+        self.primary.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.primary.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    def construct_prompt(self, prompt: str, role: str):
+        # kept provider-neutral, each target formats it in _history_for
+        return {
+            "role": role,
+            "content": prompt
+        }
+
+    def _history_for(self, target: GenerationTarget, chat_history: list) -> list:
+        role_names = {role.value: role.name for role in LLMRouterEnums}
+        history = []
+        for msg in chat_history or []:
+            role_name = role_names.get(msg.get("role"), LLMRouterEnums.USER.name)
+            history.append(target.client.construct_prompt(
+                prompt=msg.get("content") or "",
+                role=target.client.enums[role_name].value,
+            ))
+        return history
+
+    def hedge_delay(self, histogram: LatencyHistogram) -> float:
+        if histogram.count < self.hedge_min_samples:
+            return self.hedge_default_delay_seconds
+        return max(self.hedge_min_delay_seconds, histogram.percentile(self.hedge_percentile))
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "targets": [
+                {
+                    "name": target.name,
+                    **target.stats,
+                    "latency": target.latency.to_dict(),
+                    "first_token_latency": target.first_token_latency.to_dict(),
+                    "hedge_delay_seconds": round(self.hedge_delay(target.latency), 3),
+                }
+                for target in self.targets
+            ],
+        }
+
+    # ==================== Hedged attempts ====================
+
+    async def _race(self, start, histogram_of, close=None):
+        """
+        Run attempts until one succeeds, hedging slow ones and failing over on
+        errors. `start(target)` returns a future whose non-empty result is a
+        success; the other attempts are cancelled and passed to `close`.
+
+        Returns:
+            Tuple of (result, winning target), (None, None) when all failed
+        """
+        self.stats["requests"] += 1
+        running = {}
+        next_target = 0
+        newest = None
+        last_error = None
+
+        def launch(hedge: bool):
+            nonlocal next_target, newest
+            target = self.targets[next_target]
+            next_target += 1
+            target.stats["attempts"] += 1
+            if hedge:
+                target.stats["hedges"] += 1
+            started_at = time.monotonic()
+            running[start(target)] = (target, started_at, hedge)
+            newest = (target, started_at)
+
+        launch(hedge=False)
+        try:
+            while running:
+                timeout = None
+                can_launch = next_target < len(self.targets) and len(running) < self.max_in_flight
+                if self.hedge_enabled and can_launch:
+                    target, started_at = newest
+                    delay = self.hedge_delay(histogram_of(target))
+                    timeout = max(0.0, started_at + delay - time.monotonic())
+
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    self.stats["hedged"] += 1
+                    logger.info(f"Hedging generation on {self.targets[next_target].name} "
+                                f"after {newest[0].name} exceeded {delay:.2f}s")
+                    launch(hedge=True)
+                    continue
+
+                for task in done:
+                    target, started_at, hedge = running.pop(task)
+                    error = task.exception()
+                    if error is None and task.result():
+                        histogram_of(target).observe(time.monotonic() - started_at)
+                        target.stats["successes"] += 1
+                        if hedge:
+                            self.stats["hedge_wins"] += 1
+                        return task.result(), target
+
+                    target.stats["failures"] += 1
+                    last_error = error
+                    logger.warning(f"Generation on {target.name} failed: {error or 'empty answer'}")
+
+                if next_target < len(self.targets) and len(running) < self.max_in_flight:
+                    self.stats["failovers"] += 1
+                    launch(hedge=False)
+
+        finally:
+            self._discard(running, histogram_of=histogram_of, close=close)
+
+        self.stats["failed"] += 1
+        if last_error is not None:
+            raise last_error
+        return None, None
+
+    def _discard(self, running: dict, histogram_of, close=None):
+        for task, (target, started_at, _) in running.items():
+            if not task.done():
+                task.cancel()
+                target.stats["cancelled"] += 1
+                # a lower bound of its latency; without it a target that keeps losing
+                # hedges only records its fast answers and its hedge delay keeps shrinking
+                histogram_of(target).observe(time.monotonic() - started_at)
+            elif not task.cancelled():
+                # retrieve it so an abandoned failure doesn't log "never retrieved"
+                task.exception()
+
+            if close is not None:
+                task.add_done_callback(lambda _, target=target: asyncio.ensure_future(close(target)))
+
+    async def agenerate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        def start(target: GenerationTarget):
+            return asyncio.ensure_future(target.client.agenerate_text(
+                prompt=prompt,
+                chat_history=self._history_for(target, chat_history),
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+            ))
+
+        answer, _ = await self._race(start, histogram_of=lambda target: target.latency)
+        return answer
+
+    @staticmethod
+    async def _first_text(stream):
+        # an empty stream counts as a failed attempt
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    async def astream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        streams = {}
+
+        def start(target: GenerationTarget):
+            stream = target.client.astream_text(
+                prompt=prompt,
+                chat_history=self._history_for(target, chat_history),
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+            )
+            streams[target] = stream
+            return asyncio.ensure_future(self._first_text(stream))
+
+        async def close(target: GenerationTarget):
+            try:
+                await streams[target].aclose()
+            except Exception as e:
+                logger.warning(f"Closing the stream of {target.name} failed: {e}")
+
+        first_text, winner = await self._race(
+            start, histogram_of=lambda target: target.first_token_latency, close=close)
+        if winner is None:
+            return
+
+        stream = streams[winner]
+        try:
+            yield first_text
+            async for text in stream:
+                yield text
+        finally:
+            await stream.aclose()
+
+    # ==================== Sync (fail over only) ====================
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        last_error = None
+        for target in self.targets:
+            target.stats["attempts"] += 1
+            started_at = time.monotonic()
+            try:
+                answer = target.client.generate_text(
+                    prompt=prompt,
+                    chat_history=self._history_for(target, chat_history),
+                    max_output_tokens=max_output_tokens,
+                    temperature=temperature,
+                )
+            except Exception as e:
+                answer, last_error = None, e
+
+            if answer:
+                target.latency.observe(time.monotonic() - started_at)
+                target.stats["successes"] += 1
+                return answer
+
+            target.stats["failures"] += 1
+            logger.warning(f"Generation on {target.name} failed: {last_error or 'empty answer'}")
+
+        if last_error is not None:
+            raise last_error
+        return None
+
+    def stream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        last_error = None
+        for target in self.targets:
+            target.stats["attempts"] += 1
+            stream = target.client.stream_text(
+                prompt=prompt,
+                chat_history=self._history_for(target, chat_history),
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+            )
+            try:
+                first_text = next(stream)
+            except StopIteration:
+                first_text = None
+            except Exception as e:
+                first_text, last_error = None, e
+
+            if first_text is None:
+                target.stats["failures"] += 1
+                continue
+
+            target.stats["successes"] += 1
+            yield first_text
+            yield from stream
+            return
+
+        if last_error is not None:
+            raise last_error
+
+    def embed_text(self, text: str, document_type: str = None):
+        return self.primary.embed_text(text=text, document_type=document_type)
+
+    def embed_batch(self, texts: list, document_type: str = None):
+        return self.primary.embed_batch(texts=texts, document_type=document_type)
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        return await self.primary.aembed_text(text=text, document_type=document_type)
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        return await self.primary.aembed_batch(texts=texts, document_type=document_type)
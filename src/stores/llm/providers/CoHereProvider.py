@@ -1,18 +1,34 @@
 from ..LLMInterface import LLMInterface
+from ..AsyncLLMInterface import AsyncLLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
+from ..LLMExceptions import LLMProviderError
+from ..AsyncHTTPClient import create_async_http_client, raise_for_provider_status
 import cohere
+import httpx
 import logging
+import json
 
-class CoHereProvider(LLMInterface):
+class CoHereProvider(LLMInterface, AsyncLLMInterface):
+
+    # Cohere's embed endpoint accepts at most 96 texts per call
+    EMBEDDING_MAX_BATCH_SIZE = 96
+
+    # REST API used by the async methods
+    BASE_URL = "https://api.cohere.com/v1"
 
     def __init__(self, api_key: str,
                     default_input_max_characters: int=1000,
+                    generation_input_max_characters: int = None,
                     default_generation_max_output_tokens: int=1000,
-                    default_generation_temperature: float=0.1):
+                    default_generation_temperature: float=0.1,
+                    http_client: httpx.AsyncClient = None):
         
         self.api_key = api_key
+        self.http_client = http_client
     
         self.default_input_max_characters = default_input_max_characters
+    
+        self.generation_input_max_characters = generation_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
 
@@ -36,6 +52,11 @@ class CoHereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
+    def process_prompt(self, prompt: str):
+        if self.generation_input_max_characters:
+            prompt = prompt[:self.generation_input_max_characters]
+        return prompt.strip()
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
 
@@ -53,7 +74,7 @@ class CoHereProvider(LLMInterface):
         response = self.client.chat(
             model = self.generation_model_id,
             chat_history = chat_history,
-            message = self.process_text(prompt),
+            message = self.process_prompt(prompt),
             temperature = temperature,
             max_tokens = max_output_tokens
         )
@@ -64,7 +85,40 @@ class CoHereProvider(LLMInterface):
         
         return response.text
     
+    def stream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+
+        if not self.client:
+            self.logger.error("CoHere client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        stream = self.client.chat_stream(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = self.process_prompt(prompt),
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        for event in stream:
+            if event.event_type == "text-generation" and event.text:
+                yield event.text
+
     def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_batch(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    def embed_batch(self, texts: list, document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
@@ -72,26 +126,184 @@ class CoHereProvider(LLMInterface):
         if not self.embedding_model_id:
             self.logger.error("Embedding model for CoHere was not set")
             return None
-        
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
-
-        response = self.client.embed(
-            model = self.embedding_model_id,
-            texts = [self.process_text(text)],
-            input_type = input_type,
-            embedding_types=['float'],
-        )
 
-        if not response or not response.embeddings or not response.embeddings.float:
-            self.logger.error("Error while embedding text with CoHere")
-            return None
-        
-        return response.embeddings.float[0]
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        vectors = []
+        for i in range(0, len(texts), self.EMBEDDING_MAX_BATCH_SIZE):
+            batch = texts[i:i + self.EMBEDDING_MAX_BATCH_SIZE]
+
+            try:
+                response = self.client.embed(
+                    model = self.embedding_model_id,
+                    texts = [self.process_text(text) for text in batch],
+                    input_type = input_type,
+                    embedding_types=['float'],
+                )
+            except Exception as e:
+                self.logger.error(f"Error in CoHere embed_batch: {str(e)}")
+                raise LLMProviderError.from_exception(e, provider="CoHere") from e
+
+            if not response or not response.embeddings or not response.embeddings.float:
+                self.logger.error("Error while embedding text with CoHere")
+                return None
+
+            vectors.extend(response.embeddings.float)
+
+        return vectors
     
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
-            "text": self.process_text(prompt)
-        }
\ No newline at end of file
+            "text": self.process_prompt(prompt)
+        }
+
+    # ==================== Async (REST over the pooled HTTP client) ====================
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        if self.http_client is None:
+            self.http_client = create_async_http_client()
+        return self.http_client
+
+    def _build_headers(self):
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _build_chat_payload(self, prompt: str, chat_history: list,
+                            max_output_tokens: int, temperature: float, stream: bool = False):
+        return {
+            "model": self.generation_model_id,
+            "chat_history": [
+                {"role": msg.get("role"), "message": msg.get("text") or msg.get("message") or ""}
+                for msg in chat_history
+            ],
+            "message": self.process_prompt(prompt),
+            "temperature": temperature,
+            "max_tokens": max_output_tokens,
+            "stream": stream,
+        }
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+
+        if not self.api_key:
+            self.logger.error("CoHere API key was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        try:
+            response = await self.get_http_client().post(
+                f"{self.BASE_URL}/chat",
+                headers=self._build_headers(),
+                json=self._build_chat_payload(prompt=prompt, chat_history=chat_history,
+                                              max_output_tokens=max_output_tokens,
+                                              temperature=temperature),
+            )
+        except httpx.TransportError as e:
+            raise LLMProviderError.from_exception(e, provider="CoHere") from e
+
+        await raise_for_provider_status(response, provider="CoHere")
+
+        result = response.json()
+        if not result or not result.get("text"):
+            self.logger.error("Error while generating text with CoHere")
+            return None
+
+        return result["text"]
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+
+        if not self.api_key:
+            self.logger.error("CoHere API key was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        try:
+            async with self.get_http_client().stream(
+                "POST",
+                f"{self.BASE_URL}/chat",
+                headers=self._build_headers(),
+                json=self._build_chat_payload(prompt=prompt, chat_history=chat_history,
+                                              max_output_tokens=max_output_tokens,
+                                              temperature=temperature, stream=True),
+            ) as response:
+                await raise_for_provider_status(response, provider="CoHere")
+
+                # Cohere streams newline-delimited JSON events
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+
+                    event = json.loads(line)
+                    if event.get("event_type") == "text-generation" and event.get("text"):
+                        yield event["text"]
+
+        except httpx.TransportError as e:
+            raise LLMProviderError.from_exception(e, provider="CoHere") from e
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        vectors = await self.aembed_batch(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        if not self.api_key:
+            self.logger.error("CoHere API key was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        vectors = []
+        for i in range(0, len(texts), self.EMBEDDING_MAX_BATCH_SIZE):
+            batch = texts[i:i + self.EMBEDDING_MAX_BATCH_SIZE]
+
+            try:
+                response = await self.get_http_client().post(
+                    f"{self.BASE_URL}/embed",
+                    headers=self._build_headers(),
+                    json={
+                        "model": self.embedding_model_id,
+                        "texts": [self.process_text(text) for text in batch],
+                        "input_type": input_type,
+                        "embedding_types": ["float"],
+                    },
+                )
+            except httpx.TransportError as e:
+                self.logger.error(f"Error in CoHere aembed_batch: {str(e)}")
+                raise LLMProviderError.from_exception(e, provider="CoHere") from e
+
+            await raise_for_provider_status(response, provider="CoHere")
+
+            embeddings = (response.json().get("embeddings") or {}).get("float")
+            if not embeddings:
+                self.logger.error("Error while embedding text with CoHere")
+                return None
+
+            vectors.extend(embeddings)
+
+        return vectors
@@ -0,0 +1,195 @@
+from ..LLMInterface import LLMInterface
+from ..AsyncLLMInterface import AsyncLLMInterface
+from ..LLMEnums import FakeEnums
+from ..LLMExceptions import LLMProviderError
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+
+
+class FakeProvider(LLMInterface, AsyncLLMInterface):
+    """
+    Local provider for offline development and load tests.
+
+    Embeddings are deterministic pseudo-random unit vectors derived from the
+    text hash, so the same text always maps to the same vector. Latency and
+    429 responses can be injected to exercise retry and rate-limit logic.
+    """
+
+    EMBEDDING_MAX_BATCH_SIZE = 100
+
+    def __init__(self, default_input_max_characters: int = 4000,
+            generation_input_max_characters: int = None,
+            default_generation_max_output_tokens: int = 2000,
+            default_generation_temperature: float = 0.7,
+            latency_seconds: float = 0.0,
+            rate_limit_error_rate: float = 0.0,
+            max_requests_per_minute: int = None):
+
+        self.api_key = None
+        self.default_input_max_characters = default_input_max_characters
+        self.generation_input_max_characters = generation_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.latency_seconds = latency_seconds
+        self.rate_limit_error_rate = rate_limit_error_rate
+        self.max_requests_per_minute = max_requests_per_minute
+
+        self.generation_model_id = None
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        # Counters let callers assert how many provider round trips happened
+        self.embed_calls = 0
+        self.embedded_texts = 0
+        self.rate_limited_calls = 0
+
+        self._lock = threading.Lock()
+        self._request_times = []
+
+        self.enums = FakeEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    def process_prompt(self, prompt: str):
+        if self.generation_input_max_characters:
+            prompt = prompt[:self.generation_input_max_characters]
+        return prompt.strip()
+
+    def _simulate_request(self):
+        """Sleep for the configured latency and raise 429 when the fake quota is hit"""
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+        self._check_quota()
+
+    async def _asimulate_request(self):
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        self._check_quota()
+
+    def _check_quota(self):
+        with self._lock:
+            now = time.monotonic()
+            self._request_times = [t for t in self._request_times if now - t < 60]
+
+            over_quota = (
+                self.max_requests_per_minute is not None
+                and len(self._request_times) >= self.max_requests_per_minute
+            )
+            if over_quota or random.random() < self.rate_limit_error_rate:
+                self.rate_limited_calls += 1
+                raise LLMProviderError("Fake provider rate limit exceeded", status_code=429)
+
+            self._request_times.append(now)
+
+    def _vector_for(self, text: str):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        vector = [rng.gauss(0.0, 1.0) for _ in range(self.embedding_size)]
+        norm = sum(x * x for x in vector) ** 0.5 or 1.0
+        return [x / norm for x in vector]
+
+    def _answer_for(self, prompt: str, max_output_tokens: int = None):
+        """Echo the tail of the prompt, one word per output token"""
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        words = self.process_prompt(prompt).split()
+        return " ".join(words[-max_output_tokens:]) or None
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Fake provider was not set")
+            return None
+
+        self._simulate_request()
+        return self._answer_for(prompt=prompt, max_output_tokens=max_output_tokens)
+
+    def stream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        answer = self.generate_text(prompt=prompt, chat_history=chat_history,
+                                    max_output_tokens=max_output_tokens, temperature=temperature)
+        if not answer:
+            return
+
+        for i, word in enumerate(answer.split(" ")):
+            yield word if i == 0 else f" {word}"
+
+    def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_batch(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    def embed_batch(self, texts: list, document_type: str = None):
+        if not self.embedding_model_id or not self.embedding_size:
+            self.logger.error("Embedding model for Fake provider was not set")
+            return None
+
+        self._simulate_request()
+
+        with self._lock:
+            self.embed_calls += 1
+            self.embedded_texts += len(texts)
+
+        return [self._vector_for(self.process_text(text)) for text in texts]
+
+    async def agenerate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Fake provider was not set")
+            return None
+
+        await self._asimulate_request()
+        return self._answer_for(prompt=prompt, max_output_tokens=max_output_tokens)
+
+    async def astream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        answer = await self.agenerate_text(prompt=prompt, chat_history=chat_history,
+                                           max_output_tokens=max_output_tokens, temperature=temperature)
+        if not answer:
+            return
+
+        for i, word in enumerate(answer.split(" ")):
+            yield word if i == 0 else f" {word}"
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        vectors = await self.aembed_batch(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        if not self.embedding_model_id or not self.embedding_size:
+            self.logger.error("Embedding model for Fake provider was not set")
+            return None
+
+        await self._asimulate_request()
+
+        with self._lock:
+            self.embed_calls += 1
+            self.embedded_texts += len(texts)
+
+        return [self._vector_for(self.process_text(text)) for text in texts]
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_prompt(prompt)
+        }
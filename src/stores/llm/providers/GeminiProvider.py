@@ -1,17 +1,39 @@
 from ..LLMInterface import LLMInterface
+from ..AsyncLLMInterface import AsyncLLMInterface
 from ..LLMEnums import GeminiEnums, DocumentTypeEnum
+from ..LLMExceptions import LLMProviderError
+from ..AsyncHTTPClient import create_async_http_client, raise_for_provider_status
 import google.generativeai as genai
+import httpx
 import logging
+import json
+
+class GeminiProvider(LLMInterface, AsyncLLMInterface):
+
+    # الحد الأقصى لعدد النصوص في طلب batchEmbedContents واحد
+    EMBEDDING_MAX_BATCH_SIZE = 100
+
+    # واجهة REST المستخدمة في الاستدعاءات غير المتزامنة
+    BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+    SAFETY_SETTINGS = [
+        {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+        {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+        {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+        {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+    ]
 
-class GeminiProvider(LLMInterface):
-    
     def __init__(self, api_key: str, 
             default_input_max_characters: int = 4000,
+            generation_input_max_characters: int = None,
             default_generation_max_output_tokens: int = 2000,
-            default_generation_temperature: float = 0.7):
+            default_generation_temperature: float = 0.7,
+            http_client: httpx.AsyncClient = None):
         
         self.api_key = api_key
+        self.http_client = http_client
         self.default_input_max_characters = default_input_max_characters
+        self.generation_input_max_characters = generation_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
         
@@ -46,7 +68,24 @@ class GeminiProvider(LLMInterface):
     def process_text(self, text: str):
         """معالجة النص واقتصاصه للحد الأقصى"""
         return text[:self.default_input_max_characters].strip()
+
+    def process_prompt(self, prompt: str):
+        """تجهيز نص التوليد؛ السياق محسوب مسبقاً بميزانية التوكنات فلا يُقص إلا عند ضبط حد"""
+        if self.generation_input_max_characters:
+            prompt = prompt[:self.generation_input_max_characters]
+        return prompt.strip()
     
+    def _build_history(self, chat_history: list):
+        """تحويل تاريخ المحادثة إلى تنسيق Gemini"""
+        history = []
+        if chat_history:
+            for msg in chat_history:
+                role = "user" if msg.get("role") == GeminiEnums.USER.value else "model"
+                content = msg.get("content") or msg.get("text") or ""
+                if content.strip():
+                    history.append({"role": role, "parts": [content]})
+        return history
+
     def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
                         temperature: float = None):
         """توليد النص باستخدام Gemini"""
@@ -71,20 +110,14 @@ class GeminiProvider(LLMInterface):
             }
 
             # تجهيز تاريخ المحادثة
-            history = []
-            if chat_history:
-                for msg in chat_history:
-                    role = "user" if msg.get("role") == GeminiEnums.USER.value else "model"
-                    content = msg.get("content") or msg.get("text") or ""
-                    if content.strip():
-                        history.append({"role": role, "parts": [content]})
+            history = self._build_history(chat_history)
 
             # إرسال الطلب
             if history:
                 chat = model.start_chat(history=history)
-                response = chat.send_message(self.process_text(prompt), generation_config=generation_config)
+                response = chat.send_message(self.process_prompt(prompt), generation_config=generation_config)
             else:
-                response = model.generate_content(self.process_text(prompt), generation_config=generation_config)
+                response = model.generate_content(self.process_prompt(prompt), generation_config=generation_config)
 
             # التأكد من finish_reason
             candidate = response.candidates[0] if response.candidates else None
@@ -116,6 +149,47 @@ class GeminiProvider(LLMInterface):
             self.logger.error(f"Error in Gemini generate_text: {str(e)}")
             return None
 
+    def stream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        """توليد النص على دفعات متتالية باستخدام stream=True"""
+
+        if not self.client:
+            self.logger.error("Gemini client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Gemini was not set")
+            return
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        model = self.client.GenerativeModel(self.generation_model_id)
+
+        generation_config = {
+            "max_output_tokens": max_output_tokens,
+            "temperature": temperature
+        }
+
+        history = self._build_history(chat_history)
+
+        if history:
+            chat = model.start_chat(history=history)
+            response = chat.send_message(self.process_prompt(prompt), generation_config=generation_config,
+                                         stream=True)
+        else:
+            response = model.generate_content(self.process_prompt(prompt), generation_config=generation_config,
+                                              stream=True)
+
+        for chunk in response:
+            if not chunk.candidates:
+                continue
+
+            # تجميع النص من كل Part في الدفعة الحالية
+            parts = chunk.candidates[0].content.parts
+            text = "".join([p.text for p in parts if hasattr(p, "text")])
+            if text:
+                yield text
     
     def embed_text(self, text: str, document_type: str = None):
         """إنشاء تضمين النص باستخدام Gemini"""
@@ -152,7 +226,51 @@ class GeminiProvider(LLMInterface):
         except Exception as e:
             self.logger.error(f"Error in Gemini embed_text: {str(e)}")
             return None
-    
+
+    def embed_batch(self, texts: list, document_type: str = None):
+        """إنشاء تضمينات لمجموعة نصوص بطلبات batchEmbedContents"""
+        if not self.client:
+            self.logger.error("Gemini client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for Gemini was not set")
+            return None
+
+        if not texts:
+            return []
+
+        task_type = GeminiEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            task_type = GeminiEnums.QUERY.value
+
+        try:
+            vectors = []
+            for i in range(0, len(texts), self.EMBEDDING_MAX_BATCH_SIZE):
+                batch = [
+                    self.process_text(text)
+                    for text in texts[i:i + self.EMBEDDING_MAX_BATCH_SIZE]
+                ]
+
+                result = self.client.embed_content(
+                    model=self.embedding_model_id,
+                    content=batch,
+                    task_type=task_type
+                )
+
+                if not result or not result.get('embedding') or len(result['embedding']) != len(batch):
+                    self.logger.error("Error while batch embedding texts with Gemini")
+                    return None
+
+                vectors.extend(result['embedding'])
+
+            return vectors
+
+        except Exception as e:
+            # نرفع الخطأ مع رمز الحالة ليتمكن المُجدوِل من إعادة المحاولة عند 429/5xx
+            self.logger.error(f"Error in Gemini embed_batch: {str(e)}")
+            raise LLMProviderError.from_exception(e, provider="Gemini") from e
+
     def construct_prompt(self, prompt: str, role: str):
         """بناء رسالة بتنسيق Gemini"""
         # تحويل الأدوار من تنسيق النظام إلى تنسيق Gemini
@@ -163,5 +281,200 @@ class GeminiProvider(LLMInterface):
         
         return {
             "role": gemini_role,
-            "content": self.process_text(prompt)
-        }
\ No newline at end of file
+            "content": self.process_prompt(prompt)
+        }
+
+    # ==================== Async (REST over the pooled HTTP client) ====================
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        """العميل المشترك؛ يُنشأ عميل خاص إذا لم يتم تمريره"""
+        if self.http_client is None:
+            self.http_client = create_async_http_client()
+        return self.http_client
+
+    def _model_path(self, model_id: str):
+        return model_id if model_id.startswith("models/") else f"models/{model_id}"
+
+    def _build_headers(self):
+        return {
+            "x-goog-api-key": self.api_key,
+            "Content-Type": "application/json",
+        }
+
+    def _build_generate_payload(self, prompt: str, chat_history: list,
+                                max_output_tokens: int, temperature: float):
+        contents = self._build_history(chat_history)
+        contents = [
+            {"role": msg["role"], "parts": [{"text": part} for part in msg["parts"]]}
+            for msg in contents
+        ]
+        contents.append({"role": "user", "parts": [{"text": self.process_prompt(prompt)}]})
+
+        return {
+            "contents": contents,
+            "generationConfig": {
+                "maxOutputTokens": max_output_tokens,
+                "temperature": temperature,
+            },
+            "safetySettings": self.SAFETY_SETTINGS,
+        }
+
+    def _extract_text(self, result: dict):
+        """استخراج النص من استجابة generateContent"""
+        candidates = result.get("candidates") or []
+        if not candidates:
+            return None
+
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join([p.get("text", "") for p in parts])
+
+    def _task_type(self, document_type: str):
+        task_type = GeminiEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            task_type = GeminiEnums.QUERY.value
+        return task_type.upper()
+
+    async def _post(self, url: str, payload: dict):
+        try:
+            response = await self.get_http_client().post(url, headers=self._build_headers(), json=payload)
+        except httpx.TransportError as e:
+            raise LLMProviderError.from_exception(e, provider="Gemini") from e
+
+        await raise_for_provider_status(response, provider="Gemini")
+        return response.json()
+
+    async def agenerate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        """توليد النص باستخدام Gemini بشكل غير متزامن"""
+
+        if not self.api_key:
+            self.logger.error("Gemini API key was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Gemini was not set")
+            return None
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        try:
+            result = await self._post(
+                f"{self.BASE_URL}/{self._model_path(self.generation_model_id)}:generateContent",
+                self._build_generate_payload(prompt=prompt, chat_history=chat_history,
+                                             max_output_tokens=max_output_tokens,
+                                             temperature=temperature),
+            )
+        except LLMProviderError as e:
+            self.logger.error(f"Error in Gemini agenerate_text: {str(e)}")
+            raise
+
+        # التأكد من finish_reason
+        candidates = result.get("candidates") or []
+        finish_reason = candidates[0].get("finishReason") if candidates else None
+        if finish_reason and finish_reason not in ("STOP", "MAX_TOKENS"):
+            self.logger.error(f"Generation blocked. Finish reason: {finish_reason}")
+            return "The model could not generate a response due to safety filters."
+
+        generated_text = self._extract_text(result)
+        if not generated_text:
+            self.logger.error("No content parts found in Gemini response")
+            return None
+
+        return generated_text.strip() or None
+
+    async def astream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        """توليد النص على دفعات عبر streamGenerateContent (SSE)"""
+
+        if not self.api_key:
+            self.logger.error("Gemini API key was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Gemini was not set")
+            return
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        payload = self._build_generate_payload(prompt=prompt, chat_history=chat_history,
+                                               max_output_tokens=max_output_tokens,
+                                               temperature=temperature)
+
+        try:
+            async with self.get_http_client().stream(
+                "POST",
+                f"{self.BASE_URL}/{self._model_path(self.generation_model_id)}:streamGenerateContent",
+                params={"alt": "sse"},
+                headers=self._build_headers(),
+                json=payload,
+            ) as response:
+                await raise_for_provider_status(response, provider="Gemini")
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+
+                    text = self._extract_text(json.loads(line[len("data:"):]))
+                    if text:
+                        yield text
+
+        except httpx.TransportError as e:
+            raise LLMProviderError.from_exception(e, provider="Gemini") from e
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        """إنشاء تضمين النص بشكل غير متزامن"""
+        vectors = await self.aembed_batch(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        """إنشاء تضمينات لمجموعة نصوص عبر batchEmbedContents بشكل غير متزامن"""
+        if not self.api_key:
+            self.logger.error("Gemini API key was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for Gemini was not set")
+            return None
+
+        if not texts:
+            return []
+
+        model_path = self._model_path(self.embedding_model_id)
+        task_type = self._task_type(document_type)
+
+        vectors = []
+        for i in range(0, len(texts), self.EMBEDDING_MAX_BATCH_SIZE):
+            batch = texts[i:i + self.EMBEDDING_MAX_BATCH_SIZE]
+
+            try:
+                result = await self._post(
+                    f"{self.BASE_URL}/{model_path}:batchEmbedContents",
+                    {
+                        "requests": [
+                            {
+                                "model": model_path,
+                                "content": {"parts": [{"text": self.process_text(text)}]},
+                                "taskType": task_type,
+                            }
+                            for text in batch
+                        ]
+                    },
+                )
+            except LLMProviderError as e:
+                # نرفع الخطأ مع رمز الحالة ليتمكن المُجدوِل من إعادة المحاولة عند 429/5xx
+                self.logger.error(f"Error in Gemini aembed_batch: {str(e)}")
+                raise
+
+            embeddings = result.get("embeddings") or []
+            if len(embeddings) != len(batch):
+                self.logger.error("Error while batch embedding texts with Gemini")
+                return None
+
+            vectors.extend([embedding.get("values") for embedding in embeddings])
+
+        return vectors
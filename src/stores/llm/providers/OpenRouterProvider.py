@@ -1,27 +1,39 @@
 from ..LLMInterface import LLMInterface
+from ..AsyncLLMInterface import AsyncLLMInterface
 from ..LLMEnums import OpenRouterEnums, DocumentTypeEnum
+from ..LLMExceptions import LLMProviderError
+from ..AsyncHTTPClient import create_async_http_client, raise_for_provider_status
+import httpx
 import requests
 import logging
+import json
 
 
-class OpenRouterProvider(LLMInterface):
+class OpenRouterProvider(LLMInterface, AsyncLLMInterface):
     """OpenRouter LLM Provider - supports various free and paid models"""
     
     BASE_URL = "https://openrouter.ai/api/v1"
     
     def __init__(self, api_key: str, 
             default_input_max_characters: int = 4000,
+            generation_input_max_characters: int = None,
             default_generation_max_output_tokens: int = 2000,
             default_generation_temperature: float = 0.7,
             site_url: str = "http://localhost:8000",
-            site_name: str = "RAG Application"):
+            site_name: str = "RAG Application",
+            request_timeout: float = 60.0,
+            http_client: httpx.AsyncClient = None):
         
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
+        self.generation_input_max_characters = generation_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
         self.site_url = site_url
         self.site_name = site_name
+        # sync requests only; the pooled async client has its own timeout
+        self.request_timeout = request_timeout
+        self.http_client = http_client
         
         self.generation_model_id = None
         self.embedding_model_id = None
@@ -44,7 +56,65 @@ class OpenRouterProvider(LLMInterface):
     def process_text(self, text: str):
         """Process and trim text to max characters"""
         return text[:self.default_input_max_characters].strip()
+
+    def process_prompt(self, prompt: str):
+        """Generation prompts are packed to a token budget upstream; cut only if a limit is set"""
+        if self.generation_input_max_characters:
+            prompt = prompt[:self.generation_input_max_characters]
+        return prompt.strip()
     
+    def _build_messages(self, prompt: str, chat_history: list = []):
+        """Build the OpenAI-style messages array from chat history and prompt"""
+        messages = []
+        
+        # Add chat history
+        if chat_history:
+            for msg in chat_history:
+                role = msg.get("role", "user")
+                content = msg.get("content") or msg.get("text") or ""
+                
+                # Map roles to OpenRouter format
+                if role == OpenRouterEnums.SYSTEM.value:
+                    openrouter_role = "system"
+                elif role == OpenRouterEnums.ASSISTANT.value:
+                    openrouter_role = "assistant"
+                else:
+                    openrouter_role = "user"
+                
+                if content.strip():
+                    messages.append({
+                        "role": openrouter_role,
+                        "content": content
+                    })
+        
+        # Add the current prompt
+        messages.append({
+            "role": "user",
+            "content": self.process_prompt(prompt)
+        })
+
+        return messages
+
+    def _build_headers(self):
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": self.site_url,
+            "X-Title": self.site_name
+        }
+
+    def _build_payload(self, prompt: str, chat_history: list, max_output_tokens: int,
+                        temperature: float, stream: bool = False):
+        payload = {
+            "model": self.generation_model_id,
+            "messages": self._build_messages(prompt=prompt, chat_history=chat_history),
+            "max_tokens": max_output_tokens,
+            "temperature": temperature
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
     def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
                         temperature: float = None):
         """Generate text using OpenRouter API"""
@@ -61,55 +131,16 @@ class OpenRouterProvider(LLMInterface):
         temperature = temperature or self.default_generation_temperature
 
         try:
-            # Build messages array
-            messages = []
-            
-            # Add chat history
-            if chat_history:
-                for msg in chat_history:
-                    role = msg.get("role", "user")
-                    content = msg.get("content") or msg.get("text") or ""
-                    
-                    # Map roles to OpenRouter format
-                    if role == OpenRouterEnums.SYSTEM.value:
-                        openrouter_role = "system"
-                    elif role == OpenRouterEnums.ASSISTANT.value:
-                        openrouter_role = "assistant"
-                    else:
-                        openrouter_role = "user"
-                    
-                    if content.strip():
-                        messages.append({
-                            "role": openrouter_role,
-                            "content": content
-                        })
-            
-            # Add the current prompt
-            messages.append({
-                "role": "user",
-                "content": self.process_text(prompt)
-            })
-
-            # Make API request
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": self.site_url,
-                "X-Title": self.site_name
-            }
-            
-            payload = {
-                "model": self.generation_model_id,
-                "messages": messages,
-                "max_tokens": max_output_tokens,
-                "temperature": temperature
-            }
+            headers = self._build_headers()
+            payload = self._build_payload(prompt=prompt, chat_history=chat_history,
+                                          max_output_tokens=max_output_tokens,
+                                          temperature=temperature)
             
             response = requests.post(
                 f"{self.BASE_URL}/chat/completions",
                 headers=headers,
                 json=payload,
-                timeout=60
+                timeout=self.request_timeout
             )
             
             if response.status_code != 200:
@@ -128,13 +159,179 @@ class OpenRouterProvider(LLMInterface):
             raise Exception("OpenRouter returned no choices in response")
 
         except requests.exceptions.Timeout:
-            error_msg = "OpenRouter API request timed out after 60 seconds"
+            error_msg = f"OpenRouter API request timed out after {self.request_timeout} seconds"
             self.logger.error(error_msg)
             raise Exception(error_msg)
         except Exception as e:
             self.logger.error(f"Error in OpenRouter generate_text: {str(e)}")
             raise
 
+    def stream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        """Stream generated text from OpenRouter's streaming chat completions (SSE)"""
+        
+        if not self.api_key:
+            self.logger.error("OpenRouter API key was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenRouter was not set")
+            return
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        payload = self._build_payload(prompt=prompt, chat_history=chat_history,
+                                      max_output_tokens=max_output_tokens,
+                                      temperature=temperature, stream=True)
+
+        try:
+            with requests.post(
+                f"{self.BASE_URL}/chat/completions",
+                headers=self._build_headers(),
+                json=payload,
+                stream=True,
+                timeout=self.request_timeout
+            ) as response:
+                
+                if response.status_code != 200:
+                    error_msg = f"OpenRouter API error: {response.status_code} - {response.text}"
+                    self.logger.error(error_msg)
+                    raise Exception(error_msg)
+
+                for line in response.iter_lines(decode_unicode=True):
+                    text = self._parse_stream_line(line)
+                    if text is None:
+                        break
+                    if text:
+                        yield text
+
+        except requests.exceptions.Timeout:
+            error_msg = f"OpenRouter API request timed out after {self.request_timeout} seconds"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Shared pooled client; a private one is created if none was injected"""
+        if self.http_client is None:
+            self.http_client = create_async_http_client()
+        return self.http_client
+
+    async def agenerate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        """Generate text using OpenRouter API over the pooled async client"""
+        
+        if not self.api_key:
+            self.logger.error("OpenRouter API key was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenRouter was not set")
+            return None
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        payload = self._build_payload(prompt=prompt, chat_history=chat_history,
+                                      max_output_tokens=max_output_tokens,
+                                      temperature=temperature)
+
+        try:
+            response = await self.get_http_client().post(
+                f"{self.BASE_URL}/chat/completions",
+                headers=self._build_headers(),
+                json=payload,
+            )
+            await raise_for_provider_status(response, provider="OpenRouter")
+
+            result = response.json()
+
+        except httpx.TimeoutException as e:
+            error_msg = "OpenRouter API request timed out"
+            self.logger.error(error_msg)
+            raise LLMProviderError(error_msg) from e
+        except httpx.TransportError as e:
+            self.logger.error(f"Error in OpenRouter agenerate_text: {str(e)}")
+            raise LLMProviderError.from_exception(e, provider="OpenRouter") from e
+        except LLMProviderError as e:
+            self.logger.error(str(e))
+            raise
+
+        # Extract generated text
+        if "choices" in result and len(result["choices"]) > 0:
+            generated_text = result["choices"][0].get("message", {}).get("content", "")
+            return generated_text.strip() if generated_text else None
+        
+        self.logger.error("No choices in OpenRouter response")
+        raise LLMProviderError("OpenRouter returned no choices in response")
+
+    async def astream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                        temperature: float = None):
+        """Stream generated text from OpenRouter over the pooled async client"""
+        
+        if not self.api_key:
+            self.logger.error("OpenRouter API key was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenRouter was not set")
+            return
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        payload = self._build_payload(prompt=prompt, chat_history=chat_history,
+                                      max_output_tokens=max_output_tokens,
+                                      temperature=temperature, stream=True)
+
+        try:
+            async with self.get_http_client().stream(
+                "POST",
+                f"{self.BASE_URL}/chat/completions",
+                headers=self._build_headers(),
+                json=payload,
+            ) as response:
+                await raise_for_provider_status(response, provider="OpenRouter")
+
+                async for line in response.aiter_lines():
+                    text = self._parse_stream_line(line)
+                    if text is None:
+                        break
+                    if text:
+                        yield text
+
+        except httpx.TransportError as e:
+            self.logger.error(f"Error in OpenRouter astream_text: {str(e)}")
+            raise LLMProviderError.from_exception(e, provider="OpenRouter") from e
+
+    def _parse_stream_line(self, line: str):
+        """Parse one SSE line: returns the content delta, '' to skip, or None at [DONE]"""
+        # Blank lines separate events; ':' lines are keep-alive comments
+        if not line or not line.startswith("data:"):
+            return ""
+
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return None
+
+        event = json.loads(data)
+        if "error" in event:
+            error_msg = f"OpenRouter stream error: {event['error']}"
+            self.logger.error(error_msg)
+            raise LLMProviderError(error_msg)
+
+        choices = event.get("choices") or []
+        if not choices:
+            return ""
+
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        return self.embed_text(text=text, document_type=document_type)
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        return self.embed_batch(texts=texts, document_type=document_type)
+
     def embed_text(self, text: str, document_type: str = None):
         """
         OpenRouter doesn't support embeddings directly.
@@ -142,6 +339,14 @@ class OpenRouterProvider(LLMInterface):
         """
         self.logger.error("OpenRouter does not support embeddings. Use Gemini or another embedding provider.")
         return None
+
+    def embed_batch(self, texts: list, document_type: str = None):
+        """
+        OpenRouter doesn't support embeddings directly.
+        This method should not be called - use a separate embedding provider.
+        """
+        self.logger.error("OpenRouter does not support embeddings. Use Gemini or another embedding provider.")
+        return None
     
     def construct_prompt(self, prompt: str, role: str):
         """Build a message in OpenRouter/OpenAI format"""
@@ -155,5 +360,5 @@ class OpenRouterProvider(LLMInterface):
         
         return {
             "role": openrouter_role,
-            "content": self.process_text(prompt)
+            "content": self.process_prompt(prompt)
         }
@@ -0,0 +1,107 @@
+from helpers.config import Settings
+import asyncpg
+import json
+import logging
+import struct
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def encode_vector(values) -> bytes:
+    """pgvector binary format: dimensions (int16), unused (int16), float32 values, big-endian"""
+    values = list(values)
+    return struct.pack(f">HH{len(values)}f", len(values), 0, *values)
+
+
+def decode_vector(data: bytes) -> list:
+    dim, _ = struct.unpack_from(">HH", data)
+    return list(struct.unpack_from(f">{dim}f", data, 4))
+
+
+class PostgresProvider:
+    """
+    asyncpg connection pool to the same Postgres schema Supabase exposes
+    (migrations/001_create_tables.sql), used when DATA_BACKEND = "POSTGRES".
+
+    asyncpg prepares each distinct query once per connection and reuses it
+    from the statement cache, so the models' fixed SQL strings run as
+    prepared statements. Set POSTGRES_STATEMENT_CACHE_SIZE = 0 when
+    connecting through a transaction-mode pooler (e.g. Supavisor :6543).
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.pool: asyncpg.Pool = None
+
+    async def connect(self) -> asyncpg.Pool:
+        """Create the connection pool"""
+        try:
+            self.pool = await asyncpg.create_pool(
+                dsn=self.settings.POSTGRES_DSN,
+                min_size=self.settings.POSTGRES_POOL_MIN_SIZE,
+                max_size=self.settings.POSTGRES_POOL_MAX_SIZE,
+                command_timeout=self.settings.POSTGRES_COMMAND_TIMEOUT_SECONDS,
+                statement_cache_size=self.settings.POSTGRES_STATEMENT_CACHE_SIZE,
+                init=self._init_connection,
+            )
+            logger.info("Successfully connected to Postgres")
+            return self.pool
+        except Exception as e:
+            logger.error(f"Failed to connect to Postgres: {e}")
+            raise
+
+    @staticmethod
+    async def _init_connection(connection: asyncpg.Connection):
+        """
+        Decode UUIDs as str and JSONB as dict, matching what PostgREST returns.
+        Binary codecs, because COPY only supports the binary format.
+        """
+        await connection.set_type_codec(
+            "uuid", schema="pg_catalog", format="binary",
+            encoder=lambda value: uuid.UUID(str(value)).bytes,
+            decoder=lambda data: str(uuid.UUID(bytes=data)),
+        )
+        await connection.set_type_codec(
+            "jsonb", schema="pg_catalog", format="binary",
+            # jsonb binary format is a version byte (1) followed by the JSON text
+            encoder=lambda value: b"\x01" + json.dumps(value).encode("utf-8"),
+            decoder=lambda data: json.loads(data[1:].decode("utf-8")),
+        )
+
+        # pgvector (migrations/004_pgvector.sql), in whichever schema the extension was created
+        vector_schema = await connection.fetchval(
+            "SELECT typnamespace::regnamespace::text FROM pg_type WHERE typname = 'vector'"
+        )
+        if vector_schema is not None:
+            await connection.set_type_codec(
+                "vector", schema=vector_schema, format="binary",
+                encoder=encode_vector, decoder=decode_vector,
+            )
+
+    async def disconnect(self):
+        """Close the connection pool"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+        logger.info("Disconnected from Postgres")
+
+    def acquire(self):
+        """Acquire a pooled connection (async context manager)"""
+        return self.pool.acquire()
+
+    async def fetch(self, query: str, *args) -> list:
+        """Run a query and return the rows as dicts"""
+        rows = await self.pool.fetch(query, *args)
+        return [dict(row) for row in rows]
+
+    async def fetchrow(self, query: str, *args):
+        """Run a query and return the first row as a dict, or None"""
+        row = await self.pool.fetchrow(query, *args)
+        return dict(row) if row is not None else None
+
+    async def fetchval(self, query: str, *args):
+        return await self.pool.fetchval(query, *args)
+
+    async def execute(self, query: str, *args) -> str:
+        return await self.pool.execute(query, *args)
@@ -0,0 +1 @@
+from .PostgresProvider import PostgresProvider
@@ -1,5 +1,7 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, acreate_client, AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
 from helpers.config import Settings
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +13,7 @@ class SupabaseProvider:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.client: Client = None
+        self.async_client: AsyncClient = None
         self.storage_bucket = settings.SUPABASE_BUCKET
         
     def connect(self) -> Client:
@@ -26,16 +29,66 @@ class SupabaseProvider:
             logger.error(f"Failed to connect to Supabase: {e}")
             raise
     
+    async def aconnect(self) -> AsyncClient:
+        """Initialize and return the async Supabase client used by the model layer"""
+        try:
+            self.async_client = await acreate_client(
+                self.settings.SUPABASE_URL,
+                self.settings.SUPABASE_KEY,
+                options=AsyncClientOptions(
+                    postgrest_client_timeout=self.settings.SUPABASE_DB_TIMEOUT_SECONDS
+                )
+            )
+            await self._configure_postgrest_pool()
+            logger.info("Successfully connected to Supabase (async)")
+            return self.async_client
+        except Exception as e:
+            logger.error(f"Failed to connect to Supabase (async): {e}")
+            raise
+
+    async def _configure_postgrest_pool(self):
+        """
+        Replace the PostgREST session with one sized from settings (closing
+        the default one). Every query builder takes this session, so all
+        model queries share its keep-alive connection pool.
+        """
+        postgrest = self.async_client.postgrest
+        session = postgrest.session
+
+        postgrest.session = httpx.AsyncClient(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=session.timeout,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=self.settings.SUPABASE_DB_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.SUPABASE_DB_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        await session.aclose()
+
     def disconnect(self):
         """Cleanup Supabase connection"""
         self.client = None
         logger.info("Disconnected from Supabase")
+
+    async def adisconnect(self):
+        """Close the async client's connection pool"""
+        if self.async_client:
+            await self.async_client.postgrest.aclose()
+            self.async_client = None
+        logger.info("Disconnected from Supabase (async)")
     
     def get_client(self) -> Client:
         """Get the Supabase client instance"""
         if not self.client:
             self.connect()
         return self.client
+
+    def get_async_client(self) -> AsyncClient:
+        """Get the async Supabase client instance (call aconnect first)"""
+        return self.async_client
     
     # ==================== Database Operations ====================
     
@@ -0,0 +1,85 @@
+from abc import ABC, abstractmethod
+from typing import List
+from models.db_schemes import RetrievedDocument
+
+class AsyncVectorDBInterface(ABC):
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def list_all_collections(self) -> List:
+        pass
+
+    @abstractmethod
+    async def get_collection_info(self, collection_name: str) -> dict:
+        pass
+
+    @abstractmethod
+    async def delete_collection(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    async def create_collection(self, collection_name: str, 
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                multi_tenant: bool = False,
+                                tenant_payload_m: int = 16):
+        pass
+
+    @abstractmethod
+    async def delete_tenant(self, collection_name: str, tenant_id: str):
+        pass
+
+    @abstractmethod
+    async def count(self, collection_name: str, tenant_id: str = None) -> int:
+        pass
+
+    @abstractmethod
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                    metadata: dict = None, 
+                    record_id: str = None, chunk_id: str = None,
+                    tenant_id: str = None):
+        pass
+
+    @abstractmethod
+    async def insert_many(self, collection_name: str, texts: list, 
+                    vectors: list, metadata: list = None, 
+                    record_ids: list = None, batch_size: int = 50,
+                    chunk_ids: list = None, tenant_id: str = None,
+                    bulk: bool = False, parallel: int = 1,
+                    token_counts: list = None):
+        pass
+
+    @abstractmethod
+    async def begin_bulk_load(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    async def end_bulk_load(self, collection_name: str, timeout_seconds: float = 600,
+                      poll_interval_seconds: float = 1.0):
+        pass
+
+    @abstractmethod
+    async def delete_many(self, collection_name: str, record_ids: list):
+        pass
+
+    @abstractmethod
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                         tenant_id: str = None) -> List[RetrievedDocument] :
+        pass
+
+    @abstractmethod
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                tenant_id: str = None) -> List[List[RetrievedDocument]]:
+        """One result list (or None) per query vector, in order"""
+        pass
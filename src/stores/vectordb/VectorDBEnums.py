@@ -2,7 +2,14 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    LOCAL = "LOCAL"
+    PGVECTOR = "PGVECTOR"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
-    DOT = "dot"
\ No newline at end of file
+    DOT = "dot"
+
+class QuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar"
+    BINARY = "binary"
@@ -31,21 +31,55 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                multi_tenant: bool = False,
+                                tenant_payload_m: int = 16):
+        pass
+
+    @abstractmethod
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        pass
+
+    @abstractmethod
+    def count(self, collection_name: str, tenant_id: str = None) -> int:
         pass
 
     @abstractmethod
     def insert_one(self, collection_name: str, text: str, vector: list,
                     metadata: dict = None, 
-                    record_id: str = None):
+                    record_id: str = None, chunk_id: str = None,
+                    tenant_id: str = None):
         pass
 
     @abstractmethod
     def insert_many(self, collection_name: str, texts: list, 
                     vectors: list, metadata: list = None, 
-                    record_ids: list = None, batch_size: int = 50):
+                    record_ids: list = None, batch_size: int = 50,
+                    chunk_ids: list = None, tenant_id: str = None,
+                    bulk: bool = False, parallel: int = 1,
+                    token_counts: list = None):
+        pass
+
+    @abstractmethod
+    def begin_bulk_load(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    def end_bulk_load(self, collection_name: str, timeout_seconds: float = 600,
+                      poll_interval_seconds: float = 1.0):
+        pass
+
+    @abstractmethod
+    def delete_many(self, collection_name: str, record_ids: list):
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                         tenant_id: str = None) -> List[RetrievedDocument] :
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument] :
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                          tenant_id: str = None) -> List[List[RetrievedDocument]]:
+        """One result list (or None) per query vector, in order"""
         pass
\ No newline at end of file
@@ -1,5 +1,6 @@
-from .providers import QdrantDBProvider
+from .providers import QdrantDBProvider, AsyncQdrantDBProvider, LocalVectorDBProvider, PgVectorDBProvider
 from .VectorDBEnums import VectorDBEnums
+from stores.postgres import PostgresProvider
 
 
 class VectorDBProviderFactory:
@@ -19,16 +20,13 @@ class VectorDBProviderFactory:
             Vector database provider instance
         """
         if provider == VectorDBEnums.QDRANT.value:
-            # Check if cloud credentials are provided
-            qdrant_url = getattr(self.config, 'QDRANT_URL', None)
-            qdrant_api_key = getattr(self.config, 'QDRANT_API_KEY', None)
-            
-            if qdrant_url and qdrant_api_key:
+            if self.use_qdrant_server():
                 # Use Qdrant Cloud
                 return QdrantDBProvider(
-                    url=qdrant_url,
-                    api_key=qdrant_api_key,
+                    url=self.config.QDRANT_URL,
+                    api_key=self.config.QDRANT_API_KEY,
                     distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                    **self.qdrant_storage_options(),
                 )
             else:
                 # Fall back to local Qdrant (not recommended)
@@ -36,6 +34,76 @@ class VectorDBProviderFactory:
                 return QdrantDBProvider(
                     db_path=db_path,
                     distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                    **self.qdrant_storage_options(),
                 )
+
+        if provider == VectorDBEnums.LOCAL.value:
+            # In-process memory-mapped collections (offline development, small projects)
+            return LocalVectorDBProvider(
+                db_path=self.config.LOCAL_VECTOR_DB_PATH,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                dtype=self.config.LOCAL_VECTOR_DB_DTYPE,
+                hnsw_threshold=self.config.LOCAL_VECTOR_DB_HNSW_THRESHOLD,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+                search_hnsw_ef=self.config.VECTOR_DB_SEARCH_HNSW_EF,
+            )
         
-        return None
\ No newline at end of file
+        return None
+
+    def create_async(self, provider: str, postgres_provider=None):
+        """
+        Create an async vector database provider (awaitable methods, no
+        thread pool needed in async routes), or None if the backend has no
+        async provider. PGVECTOR runs on postgres_provider's pool, or on a
+        pool of its own when the app has none.
+        """
+        if provider == VectorDBEnums.QDRANT.value:
+            if self.use_qdrant_server():
+                return AsyncQdrantDBProvider(
+                    url=self.config.QDRANT_URL,
+                    api_key=self.config.QDRANT_API_KEY,
+                    distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                    prefer_grpc=self.config.QDRANT_PREFER_GRPC,
+                    grpc_port=self.config.QDRANT_GRPC_PORT,
+                    timeout=self.config.QDRANT_TIMEOUT_SECONDS,
+                    **self.qdrant_storage_options(),
+                )
+            else:
+                db_path = getattr(self.config, 'VECTOR_DB_PATH', 'qdrant_db')
+                return AsyncQdrantDBProvider(
+                    db_path=db_path,
+                    distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                    **self.qdrant_storage_options(),
+                )
+
+        if provider == VectorDBEnums.PGVECTOR.value:
+            if postgres_provider is None:
+                postgres_provider = PostgresProvider(self.config)
+
+            return PgVectorDBProvider(
+                postgres_provider=postgres_provider,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                ef_search=self.config.PGVECTOR_EF_SEARCH,
+                iterative_scan=self.config.PGVECTOR_ITERATIVE_SCAN,
+            )
+
+        return None
+
+    def use_qdrant_server(self) -> bool:
+        """Qdrant server/cloud needs both QDRANT_URL and QDRANT_API_KEY, otherwise VECTOR_DB_PATH is used"""
+        return bool(getattr(self.config, 'QDRANT_URL', None) and getattr(self.config, 'QDRANT_API_KEY', None))
+
+    def qdrant_storage_options(self) -> dict:
+        """Vector storage, HNSW and search settings for new Qdrant collections"""
+        return {
+            "quantization": self.config.VECTOR_DB_QUANTIZATION,
+            "quantization_always_ram": self.config.VECTOR_DB_QUANTIZATION_ALWAYS_RAM,
+            "vectors_on_disk": self.config.VECTOR_DB_VECTORS_ON_DISK,
+            "hnsw_m": self.config.VECTOR_DB_HNSW_M,
+            "hnsw_ef_construct": self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+            "hnsw_on_disk": self.config.VECTOR_DB_HNSW_ON_DISK,
+            "search_hnsw_ef": self.config.VECTOR_DB_SEARCH_HNSW_EF,
+            "search_rescore": self.config.VECTOR_DB_SEARCH_RESCORE,
+            "search_oversampling": self.config.VECTOR_DB_SEARCH_OVERSAMPLING,
+        }
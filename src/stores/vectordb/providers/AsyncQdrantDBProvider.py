@@ -0,0 +1,350 @@
+from qdrant_client import models, AsyncQdrantClient
+from ..AsyncVectorDBInterface import AsyncVectorDBInterface
+from .QdrantProviderBase import QdrantProviderBase, TENANT_PAYLOAD_KEY, DEFAULT_INDEXING_THRESHOLD
+import asyncio
+import time
+from typing import List
+
+
+class AsyncQdrantDBProvider(QdrantProviderBase, AsyncVectorDBInterface):
+    """
+    Qdrant provider on AsyncQdrantClient, so vector DB calls don't block the
+    event loop, optionally over gRPC.
+
+    Collections known to exist are cached with their metadata (vector size,
+    multi-tenancy), so inserts and creates skip the collection_exists round
+    trip. Only this app creates and drops collections; a stale entry (dropped
+    by another worker) is evicted when a call on it fails.
+    """
+
+    def __init__(self, *args, prefer_grpc: bool = False, grpc_port: int = 6334,
+                 timeout: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.timeout = timeout
+
+        # collection name -> {"vector_size": int, "multi_tenant": bool}
+        self._collections = {}
+
+    async def connect(self):
+        """Connect to Qdrant (cloud or local)"""
+        try:
+            if self.url:
+                self.client = AsyncQdrantClient(
+                    url=self.url,
+                    api_key=self.api_key,
+                    prefer_grpc=self.prefer_grpc,
+                    grpc_port=self.grpc_port,
+                    timeout=self.timeout,
+                )
+                transport = "gRPC" if self.prefer_grpc else "HTTP"
+                self.logger.info(f"Connected to Qdrant ({transport}, async): {self.url}")
+            elif self.db_path:
+                self.client = AsyncQdrantClient(path=self.db_path)
+                self.logger.info(f"Connected to local Qdrant (async): {self.db_path}")
+            else:
+                self.client = AsyncQdrantClient(":memory:")
+                self.logger.info("Connected to in-memory Qdrant (async)")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to Qdrant: {e}")
+            raise
+
+    async def disconnect(self):
+        """Close the client's connections"""
+        if self.client:
+            await self.client.close()
+        self.client = None
+        self._collections.clear()
+        self.logger.info("Disconnected from Qdrant")
+
+    async def get_collection_metadata(self, collection_name: str):
+        """Cached vector size and multi-tenancy of a collection, or None if it doesn't exist"""
+        metadata = self._collections.get(collection_name)
+        if metadata is not None:
+            return metadata
+
+        if not await self.client.collection_exists(collection_name=collection_name):
+            return None
+
+        info = await self.client.get_collection(collection_name=collection_name)
+        metadata = {
+            "vector_size": info.config.params.vectors.size,
+            "multi_tenant": TENANT_PAYLOAD_KEY in (info.payload_schema or {}),
+        }
+        self._collections[collection_name] = metadata
+        return metadata
+
+    def _forget(self, collection_name: str):
+        self._collections.pop(collection_name, None)
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        """Check if collection exists (served from the cache once seen)"""
+        try:
+            return await self.get_collection_metadata(collection_name) is not None
+        except Exception as e:
+            self.logger.error(f"Error checking collection existence: {e}")
+            return False
+
+    async def list_all_collections(self) -> List:
+        """List all collections"""
+        return await self.client.get_collections()
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        """Get collection information (always fresh: counts and status change)"""
+        try:
+            return await self.client.get_collection(collection_name=collection_name)
+        except Exception as e:
+            self.logger.error(f"Error getting collection info: {e}")
+            self._forget(collection_name)
+            return None
+
+    async def delete_collection(self, collection_name: str):
+        """Delete a collection"""
+        self._forget(collection_name)
+        if await self.client.collection_exists(collection_name=collection_name):
+            return await self.client.delete_collection(collection_name=collection_name)
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                multi_tenant: bool = False,
+                                tenant_payload_m: int = 16):
+        """
+        Create a collection. A multi-tenant collection gets a keyword index on
+        the tenant payload key and per-tenant HNSW graphs (see hnsw_config).
+        """
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_existed(collection_name):
+            return False
+
+        _ = await self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config=self.vectors_config(embedding_size),
+            hnsw_config=self.hnsw_config(multi_tenant, tenant_payload_m),
+            quantization_config=self.quantization_config(),
+        )
+
+        if multi_tenant:
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=TENANT_PAYLOAD_KEY,
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+
+        self._collections[collection_name] = {
+            "vector_size": embedding_size,
+            "multi_tenant": multi_tenant,
+        }
+        self.logger.info(f"Created collection: {collection_name}")
+        return True
+
+    async def delete_tenant(self, collection_name: str, tenant_id: str):
+        """Delete every point of one tenant from a shared collection"""
+        if not await self.is_collection_existed(collection_name):
+            return True
+
+        try:
+            _ = await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=self.tenant_filter(tenant_id)),
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting tenant {tenant_id}: {e}")
+            self._forget(collection_name)
+            return False
+
+    async def count(self, collection_name: str, tenant_id: str = None) -> int:
+        """Exact number of points, optionally of one tenant only"""
+        if not await self.is_collection_existed(collection_name):
+            return 0
+
+        try:
+            result = await self.client.count(
+                collection_name=collection_name,
+                count_filter=self.tenant_filter(tenant_id),
+                exact=True,
+            )
+        except Exception:
+            self._forget(collection_name)
+            raise
+
+        return result.count
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None, chunk_id: str = None,
+                         tenant_id: str = None):
+        """Insert a single record"""
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot insert to non-existent collection: {collection_name}")
+            return False
+
+        try:
+            _ = await self.client.upsert(
+                collection_name=collection_name,
+                points=[
+                    models.PointStruct(
+                        id=self.to_point_id(record_id),
+                        vector=vector,
+                        payload=self._build_payload(text, metadata, chunk_id, tenant_id)
+                    )
+                ]
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error inserting record: {e}")
+            self._forget(collection_name)
+            return False
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50,
+                          chunk_ids: list = None, tenant_id: str = None,
+                          bulk: bool = False, parallel: int = 1,
+                          token_counts: list = None):
+        """
+        Insert multiple records in batches. With bulk=True (inside a bulk load),
+        points go through the client's batch uploader without waiting for each
+        batch to be applied; end_bulk_load waits for them.
+        """
+        points = self._build_points(texts, vectors, metadata, record_ids, chunk_ids, tenant_id,
+                                   token_counts)
+
+        try:
+            if bulk:
+                await self.client.upload_points(
+                    collection_name=collection_name,
+                    points=points,
+                    batch_size=batch_size,
+                    parallel=parallel,
+                    wait=False,
+                )
+                return True
+
+            for i in range(0, len(points), batch_size):
+                _ = await self.client.upsert(
+                    collection_name=collection_name,
+                    points=points[i:i + batch_size],
+                )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error inserting batch: {e}")
+            self._forget(collection_name)
+            return False
+
+    async def begin_bulk_load(self, collection_name: str):
+        """Stop HNSW indexing (indexing_threshold=0) while a large upload runs"""
+        if collection_name in self._bulk_loads:
+            return True
+
+        try:
+            info = await self.client.get_collection(collection_name=collection_name)
+            indexing_threshold = info.config.optimizer_config.indexing_threshold
+
+            await self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+            )
+            self._bulk_loads[collection_name] = indexing_threshold or DEFAULT_INDEXING_THRESHOLD
+            self.logger.info(f"Bulk load started: {collection_name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error starting bulk load: {e}")
+            return False
+
+    async def end_bulk_load(self, collection_name: str, timeout_seconds: float = 600,
+                            poll_interval_seconds: float = 1.0):
+        """
+        Restore indexing and wait until the collection is green again, i.e.
+        uploaded points are applied and the HNSW index is built.
+        """
+        indexing_threshold = self._bulk_loads.pop(collection_name, DEFAULT_INDEXING_THRESHOLD)
+
+        try:
+            await self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+            )
+
+            deadline = time.monotonic() + timeout_seconds
+            while True:
+                status = (await self.client.get_collection(collection_name=collection_name)).status
+
+                if status == models.CollectionStatus.GREEN:
+                    self.logger.info(f"Bulk load finished: {collection_name}")
+                    return True
+
+                if status == models.CollectionStatus.RED:
+                    self.logger.error(f"Collection {collection_name} failed to optimize after bulk load")
+                    return False
+
+                if status == models.CollectionStatus.GREY:
+                    # optimizations are pending until an update nudges them
+                    await self.client.update_collection(
+                        collection_name=collection_name,
+                        optimizers_config=models.OptimizersConfigDiff(),
+                    )
+
+                if time.monotonic() > deadline:
+                    self.logger.error(f"Timed out waiting for {collection_name} to index after bulk load")
+                    return False
+
+                await asyncio.sleep(poll_interval_seconds)
+        except Exception as e:
+            self.logger.error(f"Error ending bulk load: {e}")
+            return False
+
+    async def delete_many(self, collection_name: str, record_ids: list):
+        """Delete records by ID (missing IDs are ignored)"""
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return True
+
+        try:
+            _ = await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(
+                    points=[self.to_point_id(record_id) for record_id in record_ids]
+                ),
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting records: {e}")
+            self._forget(collection_name)
+            return False
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               tenant_id: str = None):
+        """Search by vector similarity (within one tenant of a shared collection if given)"""
+        try:
+            results = await self.client.search(
+                collection_name=collection_name,
+                query_vector=vector,
+                query_filter=self.tenant_filter(tenant_id),
+                search_params=self.search_params(),
+                limit=limit
+            )
+
+            return self._to_documents(results)
+        except Exception as e:
+            self.logger.error(f"Error searching: {e}")
+            self._forget(collection_name)
+            return None
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                tenant_id: str = None):
+        """Search for several query vectors in one search_batch round trip"""
+        try:
+            batch_results = await self.client.search_batch(
+                collection_name=collection_name,
+                requests=self.search_requests(vectors=vectors, limit=limit, tenant_id=tenant_id),
+            )
+
+            return [self._to_documents(results) for results in batch_results]
+        except Exception as e:
+            self.logger.error(f"Error batch searching: {e}")
+            self._forget(collection_name)
+            return None
@@ -0,0 +1,671 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from .QdrantProviderBase import TENANT_PAYLOAD_KEY
+from models.db_schemes import RetrievedDocument
+from types import SimpleNamespace
+from typing import List
+import numpy as np
+import threading
+import logging
+import shutil
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.bin"
+PAYLOADS_FILE = "payloads.jsonl"
+HNSW_FILE = "hnsw.bin"
+
+# rows scored per matrix-vector product, bounding the float32 copy of float16 storage
+SEARCH_BLOCK_ROWS = 65536
+
+
+class LocalCollection:
+    """
+    One collection on disk:
+
+    - vectors.bin: memory-mapped (capacity, dim) float32/float16 matrix, one row per point
+    - payloads.jsonl: append-only log of row upserts/deletes, replayed on open
+    - meta.json: dimension, dtype, distance and row counts
+
+    Rows are only appended; an upsert of a known ID overwrites its row and a
+    delete leaves a hole that compaction removes once holes pile up. Cosine
+    collections store normalized vectors so every search is a dot product.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.RLock()
+        self._open()
+
+    def _open(self):
+        with open(os.path.join(self.path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.dim = self.meta["dim"]
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.cosine = self.meta["distance"] == DistanceMethodEnums.COSINE.value
+        self.capacity = self.meta["capacity"]
+
+        self.ids = []                 # row -> point ID (None once deleted)
+        self.payloads = []            # row -> payload
+        self.id_to_row = {}
+        self.tenant_codes = {}        # tenant ID -> int code (codes: -1 deleted, 0 no tenant)
+        self.row_codes = np.full(self.capacity, -1, dtype=np.int32)
+        self.log_lines = 0
+
+        self.vectors = np.memmap(os.path.join(self.path, VECTORS_FILE), dtype=self.dtype,
+                                 mode="r+", shape=(self.capacity, self.dim))
+        self._replay()
+        self.payload_log = open(os.path.join(self.path, PAYLOADS_FILE), "a", encoding="utf-8")
+
+        self.hnsw = None
+
+    @staticmethod
+    def create(path: str, dim: int, dtype: str, distance: str,
+               multi_tenant: bool, capacity: int = 1024):
+        os.makedirs(path, exist_ok=True)
+
+        vectors = np.memmap(os.path.join(path, VECTORS_FILE), dtype=np.dtype(dtype),
+                            mode="w+", shape=(capacity, dim))
+        vectors.flush()
+        del vectors
+        open(os.path.join(path, PAYLOADS_FILE), "w").close()
+
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "dim": dim,
+                "dtype": dtype,
+                "distance": distance,
+                "multi_tenant": multi_tenant,
+                "capacity": capacity,
+            }, f)
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def live_count(self) -> int:
+        return len(self.id_to_row)
+
+    def _tenant_code(self, tenant_id: str) -> int:
+        if tenant_id is None:
+            return 0
+        if tenant_id not in self.tenant_codes:
+            self.tenant_codes[tenant_id] = len(self.tenant_codes) + 1
+        return self.tenant_codes[tenant_id]
+
+    def _replay(self):
+        with open(os.path.join(self.path, PAYLOADS_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self.log_lines += 1
+                self._apply(json.loads(line))
+
+    def _apply(self, record: dict):
+        row = record["r"]
+        while self.size <= row:
+            self.ids.append(None)
+            self.payloads.append(None)
+
+        old_id = self.ids[row]
+        if old_id is not None and self.id_to_row.get(old_id) == row:
+            del self.id_to_row[old_id]
+
+        if record.get("d"):
+            self.ids[row] = None
+            self.payloads[row] = None
+            self.row_codes[row] = -1
+            return
+
+        payload = record["p"]
+        self.ids[row] = record["id"]
+        self.payloads[row] = payload
+        self.id_to_row[record["id"]] = row
+        self.row_codes[row] = self._tenant_code(payload.get(TENANT_PAYLOAD_KEY))
+
+    def _log(self, records: list):
+        for record in records:
+            self._apply(record)
+        self.payload_log.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+        self.payload_log.flush()
+        self.log_lines += len(records)
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity:
+            return
+
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+
+        self.vectors.flush()
+        del self.vectors
+        with open(os.path.join(self.path, VECTORS_FILE), "r+b") as f:
+            f.truncate(capacity * self.dim * self.dtype.itemsize)
+
+        self.vectors = np.memmap(os.path.join(self.path, VECTORS_FILE), dtype=self.dtype,
+                                 mode="r+", shape=(capacity, self.dim))
+        self.row_codes = np.concatenate([
+            self.row_codes, np.full(capacity - self.capacity, -1, dtype=np.int32)
+        ])
+        self.capacity = capacity
+        self.meta["capacity"] = capacity
+        self._write_meta()
+
+        if self.hnsw is not None:
+            self.hnsw.resize_index(capacity)
+
+    def _write_meta(self):
+        tmp_path = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+
+    def _prepare(self, vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of size {self.dim}, got {matrix.shape[1]}")
+
+        if self.cosine:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        return matrix
+
+    def upsert(self, ids: list, vectors: list, payloads: list, flush: bool = True):
+        matrix = self._prepare(vectors)
+
+        # an ID repeated within the batch keeps its last vector and payload
+        last = {point_id: i for i, point_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            payloads = [payloads[i] for i in keep]
+            matrix = matrix[keep]
+
+        with self.lock:
+            rows, next_row = [], self.size
+            for point_id in ids:
+                row = self.id_to_row.get(point_id)
+                if row is None:
+                    row = next_row
+                    next_row += 1
+                rows.append(row)
+
+            self._grow(next_row)
+            self.vectors[rows] = matrix.astype(self.dtype)
+            if flush:
+                self.vectors.flush()
+
+            self._log([
+                {"r": row, "id": point_id, "p": payload}
+                for row, point_id, payload in zip(rows, ids, payloads)
+            ])
+
+            if self.hnsw is not None:
+                self.hnsw.add_items(matrix, rows)
+
+    def delete(self, ids: list = None, tenant_id: str = None):
+        with self.lock:
+            if tenant_id is not None:
+                code = self.tenant_codes.get(tenant_id)
+                rows = [] if code is None else np.flatnonzero(self.row_codes[:self.size] == code).tolist()
+            else:
+                rows = [ self.id_to_row[i] for i in ids if i in self.id_to_row ]
+
+            if not rows:
+                return 0
+
+            self._log([ {"r": row, "d": 1} for row in rows ])
+
+            if self.hnsw is not None:
+                for row in rows:
+                    self.hnsw.mark_deleted(row)
+
+            holes = self.size - self.live_count
+            if holes >= 64 and holes > self.size * 0.25:
+                self.compact()
+
+            return len(rows)
+
+    def compact(self):
+        """Rewrite vectors and payloads without deleted rows"""
+        with self.lock:
+            live_rows = [ row for row in range(self.size) if self.ids[row] is not None ]
+            capacity = max(1024, 1 << max(len(live_rows) - 1, 0).bit_length())
+
+            tmp_vectors = os.path.join(self.path, VECTORS_FILE + ".tmp")
+            vectors = np.memmap(tmp_vectors, dtype=self.dtype, mode="w+", shape=(capacity, self.dim))
+            if live_rows:
+                vectors[:len(live_rows)] = self.vectors[live_rows]
+            vectors.flush()
+            del vectors
+
+            tmp_payloads = os.path.join(self.path, PAYLOADS_FILE + ".tmp")
+            with open(tmp_payloads, "w", encoding="utf-8") as f:
+                for new_row, row in enumerate(live_rows):
+                    f.write(json.dumps({"r": new_row, "id": self.ids[row], "p": self.payloads[row]},
+                                       ensure_ascii=False) + "\n")
+
+            self.close()
+            os.replace(tmp_vectors, os.path.join(self.path, VECTORS_FILE))
+            os.replace(tmp_payloads, os.path.join(self.path, PAYLOADS_FILE))
+            self.meta["capacity"] = capacity
+            self._write_meta()
+            hnsw_path = os.path.join(self.path, HNSW_FILE)
+            if os.path.exists(hnsw_path):
+                os.remove(hnsw_path)
+
+            self._open()
+
+    def count(self, tenant_id: str = None) -> int:
+        with self.lock:
+            if tenant_id is None:
+                return self.live_count
+            code = self.tenant_codes.get(tenant_id)
+            if code is None:
+                return 0
+            return int(np.count_nonzero(self.row_codes[:self.size] == code))
+
+    def search(self, vector: list, limit: int, tenant_id: str = None,
+               hnsw_index=None, hnsw_ef: int = None):
+        query = self._prepare(vector)[0]
+
+        with self.lock:
+            size = self.size
+            if tenant_id is not None:
+                code = self.tenant_codes.get(tenant_id)
+                if code is None:
+                    return []
+                mask = self.row_codes[:size] == code
+            else:
+                mask = self.row_codes[:size] >= 0
+
+            candidates = int(np.count_nonzero(mask))
+            if candidates == 0:
+                return []
+            limit = min(limit, candidates)
+
+            rows = None
+            if hnsw_index is not None:
+                try:
+                    rows, scores = self._search_hnsw(hnsw_index, query, limit, mask, tenant_id, hnsw_ef)
+                except RuntimeError:
+                    # the filtered graph walk found fewer than limit points
+                    rows = None
+
+            if rows is None:
+                rows, scores = self._search_exact(query, limit, mask, size)
+
+            return [
+                (float(score), self.payloads[row])
+                for row, score in zip(rows, scores)
+            ]
+
+    def _search_exact(self, query: np.ndarray, limit: int, mask: np.ndarray, size: int):
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, SEARCH_BLOCK_ROWS):
+            block = self.vectors[start:start + SEARCH_BLOCK_ROWS]
+            block = block[:size - start]
+            if block.dtype != np.float32:
+                block = block.astype(np.float32)
+            scores[start:start + len(block)] = block @ query
+
+        scores[~mask] = -np.inf
+
+        # partial selection of the top rows, then sort only those
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return top.tolist(), scores[top].tolist()
+
+    def _search_hnsw(self, index, query: np.ndarray, limit: int, mask: np.ndarray,
+                     tenant_id: str, hnsw_ef: int):
+        index.set_ef(max(hnsw_ef or 64, limit))
+
+        row_filter = None
+        if tenant_id is not None:
+            row_filter = lambda row: bool(mask[row]) if row < len(mask) else False
+
+        labels, distances = index.knn_query(query, k=limit, filter=row_filter)
+        # hnswlib's "ip" distance is 1 - dot
+        return labels[0].tolist(), (1 - distances[0]).tolist()
+
+    def build_hnsw(self, hnswlib, m: int, ef_construct: int):
+        with self.lock:
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            index.init_index(max_elements=self.capacity, M=m, ef_construction=ef_construct)
+
+            live_rows = np.flatnonzero(self.row_codes[:self.size] >= 0)
+            for start in range(0, len(live_rows), SEARCH_BLOCK_ROWS):
+                rows = live_rows[start:start + SEARCH_BLOCK_ROWS]
+                index.add_items(np.asarray(self.vectors[rows], dtype=np.float32), rows)
+
+            self.hnsw = index
+            return index
+
+    def save_hnsw(self):
+        if self.hnsw is not None:
+            self.hnsw.save_index(os.path.join(self.path, HNSW_FILE))
+            self.meta["hnsw_rows"] = self.size
+            self.meta["hnsw_log_lines"] = self.log_lines
+            self._write_meta()
+
+    def load_hnsw(self, hnswlib):
+        """Reuse the saved graph if nothing changed since it was written"""
+        hnsw_path = os.path.join(self.path, HNSW_FILE)
+        if (not os.path.exists(hnsw_path)
+                or self.meta.get("hnsw_rows") != self.size
+                or self.meta.get("hnsw_log_lines") != self.log_lines):
+            return None
+
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        index.load_index(hnsw_path, max_elements=self.capacity)
+        self.hnsw = index
+        return index
+
+    def flush(self):
+        with self.lock:
+            self.vectors.flush()
+            self.payload_log.flush()
+
+    def close(self):
+        self.flush()
+        self.payload_log.close()
+        del self.vectors
+        self.hnsw = None
+
+
+class LocalVectorDBProvider(VectorDBInterface):
+    """
+    In-process vector store: each collection is a memory-mapped matrix
+    searched by brute force (one matrix-vector product plus a partial top-k).
+    For the few thousand chunks of a typical project this beats a network
+    round trip. Collections of at least hnsw_threshold points are searched
+    through an hnswlib graph instead, when hnswlib is installed.
+    """
+
+    def __init__(self, db_path: str, distance_method: str = None, dtype: str = "float32",
+                 hnsw_threshold: int = None, hnsw_m: int = 16, hnsw_ef_construct: int = 100,
+                 search_hnsw_ef: int = None):
+        self.db_path = db_path
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+        if self.distance_method not in [ d.value for d in DistanceMethodEnums ]:
+            raise ValueError(f"Unsupported distance method: {distance_method}")
+
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        self.dtype = dtype
+
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.search_hnsw_ef = search_hnsw_ef
+        self.hnswlib = None
+
+        self._collections = {}
+        self._lock = threading.Lock()
+        self._bulk_loads = set()
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+        if self.hnsw_threshold is not None:
+            try:
+                import hnswlib
+                self.hnswlib = hnswlib
+            except ImportError:
+                logger.warning("hnswlib is not installed, local collections are searched by brute force only")
+
+        logger.info(f"Connected to local vector DB: {self.db_path}")
+
+    def disconnect(self):
+        with self._lock:
+            for collection in self._collections.values():
+                collection.save_hnsw()
+                collection.close()
+            self._collections.clear()
+        logger.info("Disconnected from local vector DB")
+
+    def _collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+
+    def _get(self, collection_name: str):
+        """Open collection, or None if it doesn't exist"""
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                if not os.path.exists(os.path.join(self._collection_path(collection_name), META_FILE)):
+                    return None
+                collection = LocalCollection(self._collection_path(collection_name))
+                self._collections[collection_name] = collection
+            return collection
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return self._get(collection_name) is not None
+
+    def list_all_collections(self) -> List:
+        names = sorted(
+            name for name in os.listdir(self.db_path)
+            if os.path.exists(os.path.join(self.db_path, name, META_FILE))
+        )
+        return SimpleNamespace(collections=[ SimpleNamespace(name=name) for name in names ])
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        collection = self._get(collection_name)
+        if collection is None:
+            return None
+
+        return {
+            "status": "green",
+            "points_count": collection.live_count,
+            "rows": collection.size,
+            "capacity": collection.capacity,
+            "config": {
+                "size": collection.dim,
+                "dtype": collection.meta["dtype"],
+                "distance": collection.meta["distance"],
+                "multi_tenant": collection.meta["multi_tenant"],
+            },
+            "hnsw": collection.hnsw is not None,
+        }
+
+    def delete_collection(self, collection_name: str):
+        with self._lock:
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+
+        path = self._collection_path(collection_name)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+            return True
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                multi_tenant: bool = False,
+                                tenant_payload_m: int = 16):
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+
+        if self.is_collection_existed(collection_name):
+            return False
+
+        LocalCollection.create(
+            path=self._collection_path(collection_name),
+            dim=embedding_size,
+            dtype=self.dtype,
+            distance=self.distance_method,
+            multi_tenant=multi_tenant,
+        )
+        logger.info(f"Created local collection: {collection_name}")
+        return True
+
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        collection = self._get(collection_name)
+        if collection is not None:
+            collection.delete(tenant_id=tenant_id)
+        return True
+
+    def count(self, collection_name: str, tenant_id: str = None) -> int:
+        collection = self._get(collection_name)
+        if collection is None:
+            return 0
+        return collection.count(tenant_id=tenant_id)
+
+    @staticmethod
+    def _build_payload(text: str, metadata: dict, chunk_id: str = None, tenant_id: str = None,
+                       token_count: int = None) -> dict:
+        payload = {
+            "text": text,
+            "metadata": metadata,
+            "chunk_id": chunk_id,
+            "token_count": token_count,
+        }
+        if tenant_id is not None:
+            payload[TENANT_PAYLOAD_KEY] = tenant_id
+        return payload
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                        metadata: dict = None,
+                        record_id: str = None, chunk_id: str = None,
+                        tenant_id: str = None):
+        return self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                                metadata=[metadata], record_ids=[record_id],
+                                chunk_ids=[chunk_id], tenant_id=tenant_id)
+
+    def insert_many(self, collection_name: str, texts: list,
+                        vectors: list, metadata: list = None,
+                        record_ids: list = None, batch_size: int = 50,
+                        chunk_ids: list = None, tenant_id: str = None,
+                        bulk: bool = False, parallel: int = 1,
+                        token_counts: list = None):
+        """Upsert records; batch_size and parallel don't apply to local writes"""
+        collection = self._get(collection_name)
+        if collection is None:
+            logger.error(f"Cannot insert to non-existent collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+        if chunk_ids is None:
+            chunk_ids = [None] * len(texts)
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+        if token_counts is None:
+            token_counts = [None] * len(texts)
+
+        try:
+            collection.upsert(
+                ids=[ str(record_id) for record_id in record_ids ],
+                vectors=vectors,
+                payloads=[
+                    self._build_payload(texts[x], metadata[x], chunk_ids[x], tenant_id, token_counts[x])
+                    for x in range(len(texts))
+                ],
+                # a bulk load flushes once at the end
+                flush=collection_name not in self._bulk_loads,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error inserting batch: {e}")
+            return False
+
+    def begin_bulk_load(self, collection_name: str):
+        """Stop maintaining the HNSW graph during the upload; it is rebuilt once at the end"""
+        collection = self._get(collection_name)
+        if collection is None:
+            return False
+
+        self._bulk_loads.add(collection_name)
+        collection.hnsw = None
+        return True
+
+    def end_bulk_load(self, collection_name: str, timeout_seconds: float = 600,
+                      poll_interval_seconds: float = 1.0):
+        self._bulk_loads.discard(collection_name)
+
+        collection = self._get(collection_name)
+        if collection is None:
+            return False
+
+        collection.flush()
+        if self._hnsw_index(collection) is not None:
+            collection.save_hnsw()
+        return True
+
+    def delete_many(self, collection_name: str, record_ids: list):
+        collection = self._get(collection_name)
+        if not record_ids or collection is None:
+            return True
+
+        try:
+            collection.delete(ids=[ str(record_id) for record_id in record_ids ])
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting records: {e}")
+            return False
+
+    def _hnsw_index(self, collection: LocalCollection):
+        """The collection's HNSW graph if it is large enough for one, loading or building it once"""
+        if self.hnswlib is None or collection.live_count < self.hnsw_threshold:
+            return None
+
+        with collection.lock:
+            if collection.hnsw is None:
+                if collection.load_hnsw(self.hnswlib) is None:
+                    collection.build_hnsw(self.hnswlib, self.hnsw_m, self.hnsw_ef_construct)
+            return collection.hnsw
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                         tenant_id: str = None):
+        collection = self._get(collection_name)
+        if collection is None:
+            return None
+
+        try:
+            hnsw_index = None
+            if collection_name not in self._bulk_loads:
+                hnsw_index = self._hnsw_index(collection)
+
+            # a small tenant of a large shared collection is cheaper to scan
+            if hnsw_index is not None and tenant_id is not None \
+                    and collection.count(tenant_id=tenant_id) < self.hnsw_threshold:
+                hnsw_index = None
+
+            results = collection.search(vector=vector, limit=limit, tenant_id=tenant_id,
+                                        hnsw_index=hnsw_index, hnsw_ef=self.search_hnsw_ef)
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            return None
+
+        if not results:
+            return None
+
+        return [
+            RetrievedDocument(**{
+                "score": score,
+                "text": payload["text"],
+                "metadata": payload.get("metadata"),
+                "token_count": payload.get("token_count"),
+            })
+            for score, payload in results
+        ]
+
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                          tenant_id: str = None):
+        """In-process, so there is no round trip to save: one search per vector"""
+        if self._get(collection_name) is None:
+            return None
+
+        return [
+            self.search_by_vector(collection_name=collection_name, vector=vector,
+                                  limit=limit, tenant_id=tenant_id)
+            for vector in vectors
+        ]
@@ -0,0 +1,392 @@
+from ..AsyncVectorDBInterface import AsyncVectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from models.db_schemes import RetrievedDocument
+from types import SimpleNamespace
+from typing import List
+import logging
+
+# similarity operator and score (higher is better) per distance method
+DISTANCE_OPERATORS = {
+    DistanceMethodEnums.COSINE.value: ("<=>", "1 - ({distance})"),
+    DistanceMethodEnums.DOT.value: ("<#>", "-({distance})"),
+}
+
+
+# Upsert from a (chunk_id, embedding) source; chunks deleted since they were
+# embedded are skipped by the join instead of failing the foreign key
+UPSERT_EMBEDDINGS = """
+    INSERT INTO chunk_embeddings (collection_name, chunk_id, tenant_id, embedding)
+    SELECT $1, s.chunk_id, $2, s.embedding
+    FROM {source}
+    JOIN chunks c ON c.id = s.chunk_id
+    ON CONFLICT (collection_name, chunk_id) DO UPDATE
+    SET embedding = EXCLUDED.embedding,
+        tenant_id = EXCLUDED.tenant_id,
+        indexed_at = NOW()
+"""
+
+
+class PgVectorDBProvider(AsyncVectorDBInterface):
+    """
+    Vector DB in Postgres with pgvector (migrations/004_pgvector.sql).
+
+    Embeddings are stored in chunk_embeddings keyed by chunk id, and a search
+    joins them back to chunks, so chunk text and metadata come from the same
+    query instead of a duplicated payload. texts and metadata passed to the
+    insert methods are therefore ignored. Deleting a chunk cascades to its
+    embeddings.
+
+    Collections are rows of vector_collections sharing one HNSW index
+    (pgvector 0.8+ for iterative index scans).
+    """
+
+    def __init__(self, postgres_provider, distance_method: str = None,
+                 ef_search: int = None, iterative_scan: str = "relaxed_order"):
+        """
+        Args:
+            postgres_provider: PostgresProvider to run queries on (connected
+                here if it isn't yet, and then also disconnected here)
+            distance_method: 'cosine' or 'dot', matching the index operator class
+            ef_search: hnsw.ef_search per query (None = server default, 40)
+            iterative_scan: hnsw.iterative_scan ('relaxed_order', 'strict_order' or
+                'off'), so filtered searches keep scanning until limit rows match.
+                Searches still short of limit rows (hnsw.max_scan_tuples reached)
+                are re-run exactly on the collection's rows
+        """
+        self.postgres_provider = postgres_provider
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+
+        if self.distance_method not in DISTANCE_OPERATORS:
+            raise ValueError(f"Unsupported distance method: {self.distance_method}")
+
+        self.ef_search = ef_search
+        self.iterative_scan = iterative_scan
+        self._owns_connection = False
+
+        self.logger = logging.getLogger(__name__)
+
+    async def connect(self):
+        """Use the app's Postgres pool, or open one (DATA_BACKEND = "SUPABASE")"""
+        if self.postgres_provider.pool is None:
+            await self.postgres_provider.connect()
+            self._owns_connection = True
+
+        if await self.postgres_provider.fetchval("SELECT to_regclass('chunk_embeddings')") is None:
+            self.logger.error("chunk_embeddings does not exist, run migrations/004_pgvector.sql")
+        else:
+            self.logger.info("Connected to pgvector")
+
+    async def disconnect(self):
+        if self._owns_connection:
+            await self.postgres_provider.disconnect()
+            self._owns_connection = False
+        self.logger.info("Disconnected from pgvector")
+
+    async def embedding_size(self) -> int:
+        """Dimension of the chunk_embeddings.embedding column (vector typmod)"""
+        return await self.postgres_provider.fetchval(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = 'chunk_embeddings'::regclass AND attname = 'embedding'"
+        )
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        try:
+            return await self.postgres_provider.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM vector_collections WHERE name = $1)",
+                collection_name,
+            )
+        except Exception as e:
+            self.logger.error(f"Error checking collection existence: {e}")
+            return False
+
+    async def list_all_collections(self) -> List:
+        rows = await self.postgres_provider.fetch("SELECT name FROM vector_collections ORDER BY name")
+        return SimpleNamespace(collections=[ SimpleNamespace(name=row["name"]) for row in rows ])
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        try:
+            row = await self.postgres_provider.fetchrow(
+                """
+                SELECT v.embedding_size, v.multi_tenant,
+                       (SELECT COUNT(*) FROM chunk_embeddings e
+                        WHERE e.collection_name = v.name) AS points_count
+                FROM vector_collections v
+                WHERE v.name = $1
+                """,
+                collection_name,
+            )
+        except Exception as e:
+            self.logger.error(f"Error getting collection info: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        return {
+            "status": "green",
+            "points_count": row["points_count"],
+            "config": {
+                "size": row["embedding_size"],
+                "distance": self.distance_method,
+                "multi_tenant": row["multi_tenant"],
+            },
+        }
+
+    async def delete_collection(self, collection_name: str):
+        """Delete a collection (its embeddings cascade)"""
+        return await self.postgres_provider.execute(
+            "DELETE FROM vector_collections WHERE name = $1", collection_name
+        )
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                multi_tenant: bool = False,
+                                tenant_payload_m: int = 16):
+        """
+        Register a collection. The dimension is fixed by the embedding column,
+        so embedding_size must match it. tenant_payload_m is unused: tenants
+        are filtered through the (collection_name, tenant_id) index.
+        """
+        column_size = await self.embedding_size()
+        if column_size != embedding_size:
+            raise ValueError(
+                f"chunk_embeddings.embedding is vector({column_size}), the embedding model "
+                f"returns {embedding_size} dimensions; alter the column to match"
+            )
+
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        status = await self.postgres_provider.execute(
+            """
+            INSERT INTO vector_collections (name, embedding_size, multi_tenant)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (name) DO NOTHING
+            """,
+            collection_name, embedding_size, multi_tenant,
+        )
+
+        created = status == "INSERT 0 1"
+        if created:
+            self.logger.info(f"Created collection: {collection_name}")
+        return created
+
+    async def delete_tenant(self, collection_name: str, tenant_id: str):
+        try:
+            _ = await self.postgres_provider.execute(
+                "DELETE FROM chunk_embeddings WHERE collection_name = $1 AND tenant_id = $2",
+                collection_name, tenant_id,
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting tenant {tenant_id}: {e}")
+            return False
+
+    async def count(self, collection_name: str, tenant_id: str = None) -> int:
+        if tenant_id is None:
+            return await self.postgres_provider.fetchval(
+                "SELECT COUNT(*) FROM chunk_embeddings WHERE collection_name = $1",
+                collection_name,
+            )
+
+        return await self.postgres_provider.fetchval(
+            "SELECT COUNT(*) FROM chunk_embeddings WHERE collection_name = $1 AND tenant_id = $2",
+            collection_name, tenant_id,
+        )
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None, chunk_id: str = None,
+                         tenant_id: str = None):
+        return await self.insert_many(collection_name=collection_name, texts=[text],
+                                      vectors=[vector], record_ids=[record_id],
+                                      chunk_ids=[chunk_id], tenant_id=tenant_id)
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50,
+                          chunk_ids: list = None, tenant_id: str = None,
+                          bulk: bool = False, parallel: int = 1,
+                          token_counts: list = None):
+        """
+        Upsert embeddings of existing chunks, batch_size rows per transaction.
+        Texts, metadata and token counts stay in the chunks table (joined on search).
+        With bulk=True, rows are COPYed into a temporary staging table and
+        upserted in one statement.
+        """
+        chunk_ids = chunk_ids if chunk_ids is not None else record_ids
+        if chunk_ids is None or any(chunk_id is None for chunk_id in chunk_ids):
+            self.logger.error("pgvector embeddings are keyed by chunk id, chunk_ids are required")
+            return False
+
+        try:
+            async with self.postgres_provider.acquire() as connection:
+                if bulk:
+                    async with connection.transaction():
+                        await connection.execute(
+                            "CREATE TEMP TABLE chunk_embeddings_staging "
+                            "(chunk_id UUID, embedding vector) ON COMMIT DROP"
+                        )
+                        await connection.copy_records_to_table(
+                            "chunk_embeddings_staging",
+                            records=list(zip(chunk_ids, vectors)),
+                            columns=["chunk_id", "embedding"],
+                        )
+                        await connection.execute(
+                            UPSERT_EMBEDDINGS.format(source="chunk_embeddings_staging AS s"),
+                            collection_name, tenant_id,
+                        )
+                    return True
+
+                # executemany pipelines the rows of a batch in one round trip
+                query = UPSERT_EMBEDDINGS.format(
+                    source="(SELECT $3::uuid AS chunk_id, $4::vector AS embedding) AS s"
+                )
+                rows = [
+                    (collection_name, tenant_id, chunk_id, vector)
+                    for chunk_id, vector in zip(chunk_ids, vectors)
+                ]
+                for i in range(0, len(rows), batch_size):
+                    async with connection.transaction():
+                        await connection.executemany(query, rows[i:i + batch_size])
+            return True
+        except Exception as e:
+            self.logger.error(f"Error inserting batch: {e}")
+            return False
+
+    async def begin_bulk_load(self, collection_name: str):
+        """
+        Nothing to defer: the HNSW index is shared by every collection, so it
+        can't be dropped for one bulk load. insert_many(bulk=True) uses COPY.
+        """
+        return True
+
+    async def end_bulk_load(self, collection_name: str, timeout_seconds: float = 600,
+                            poll_interval_seconds: float = 1.0):
+        """Refresh planner statistics after a large load"""
+        try:
+            _ = await self.postgres_provider.execute("ANALYZE chunk_embeddings")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error ending bulk load: {e}")
+            return False
+
+    async def delete_many(self, collection_name: str, record_ids: list):
+        """Delete embeddings by chunk id (deleted chunks have already cascaded)"""
+        if not record_ids:
+            return True
+
+        try:
+            _ = await self.postgres_provider.execute(
+                "DELETE FROM chunk_embeddings WHERE collection_name = $1 AND chunk_id = ANY($2::uuid[])",
+                collection_name, record_ids,
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting records: {e}")
+            return False
+
+    def _search_query(self, tenant_id: str = None, exact: bool = False) -> str:
+        """
+        Nearest chunks to $2 in collection $1, $3 rows, tenant $4 if given.
+
+        The HNSW index covers every collection, so the collection filter is
+        applied to the rows it returns; iterative scans keep going until $3
+        rows match (in relaxed order, re-sorted here). exact=True filters the
+        collection first into a materialized CTE, which the index can't serve.
+        """
+        operator, score = DISTANCE_OPERATORS[self.distance_method]
+        distance = f"e.embedding {operator} $2"
+        where = "e.collection_name = $1" + (" AND e.tenant_id = $4" if tenant_id is not None else "")
+
+        candidates, source = "", "chunk_embeddings"
+        if exact:
+            candidates = f"candidates AS MATERIALIZED (SELECT * FROM chunk_embeddings e WHERE {where}),"
+            source = "candidates"
+
+        return f"""
+            WITH {candidates}
+            nearest AS MATERIALIZED (
+                SELECT e.chunk_id, {distance} AS distance
+                FROM {source} e
+                WHERE {where}
+                ORDER BY {distance}
+                LIMIT $3
+            )
+            SELECT c.chunk_text, c.chunk_metadata, c.chunk_token_count,
+                   {score.format(distance="n.distance")} AS score
+            FROM nearest n
+            JOIN chunks c ON c.id = n.chunk_id
+            ORDER BY n.distance
+        """
+
+    async def _set_search_config(self, connection):
+        # transaction-local, so pooled connections keep their defaults
+        if self.ef_search is not None:
+            await connection.execute("SELECT set_config('hnsw.ef_search', $1, true)",
+                                     str(self.ef_search))
+        if self.iterative_scan is not None:
+            await connection.execute("SELECT set_config('hnsw.iterative_scan', $1, true)",
+                                     self.iterative_scan)
+
+    @staticmethod
+    def _to_documents(rows):
+        if not rows:
+            return None
+
+        return [
+            RetrievedDocument(
+                score=row["score"],
+                text=row["chunk_text"],
+                metadata=row["chunk_metadata"],
+                token_count=row["chunk_token_count"],
+            )
+            for row in rows
+        ]
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               tenant_id: str = None):
+        """Nearest chunks with their text and metadata, scored like Qdrant (higher is better)"""
+        args = [collection_name, vector, limit]
+        if tenant_id is not None:
+            args.append(tenant_id)
+
+        try:
+            async with self.postgres_provider.acquire() as connection:
+                async with connection.transaction():
+                    await self._set_search_config(connection)
+                    rows = await connection.fetch(self._search_query(tenant_id), *args)
+                    if len(rows) < limit:
+                        rows = await connection.fetch(self._search_query(tenant_id, exact=True), *args)
+        except Exception as e:
+            self.logger.error(f"Error searching: {e}")
+            return None
+
+        return self._to_documents(rows)
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                tenant_id: str = None):
+        """Several searches on one connection and transaction, with the query prepared once"""
+        tenant_args = [tenant_id] if tenant_id is not None else []
+
+        try:
+            async with self.postgres_provider.acquire() as connection:
+                async with connection.transaction():
+                    await self._set_search_config(connection)
+                    statement = await connection.prepare(self._search_query(tenant_id))
+                    batch_rows = [
+                        await statement.fetch(collection_name, vector, limit, *tenant_args)
+                        for vector in vectors
+                    ]
+
+                    short = [i for i, rows in enumerate(batch_rows) if len(rows) < limit]
+                    if short:
+                        exact = await connection.prepare(self._search_query(tenant_id, exact=True))
+                        for i in short:
+                            batch_rows[i] = await exact.fetch(collection_name, vectors[i], limit, *tenant_args)
+        except Exception as e:
+            self.logger.error(f"Error batch searching: {e}")
+            return None
+
+        return [self._to_documents(rows) for rows in batch_rows]
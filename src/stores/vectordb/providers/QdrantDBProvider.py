@@ -1,50 +1,23 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
-import logging
+from .QdrantProviderBase import QdrantProviderBase, TENANT_PAYLOAD_KEY, DEFAULT_INDEXING_THRESHOLD
+import time
 from typing import List
-from models.db_schemes import RetrievedDocument
 
 
-class QdrantDBProvider(VectorDBInterface):
+class QdrantDBProvider(QdrantProviderBase, VectorDBInterface):
     """Qdrant provider supporting both local and cloud connections"""
 
-    def __init__(self, db_path: str = None, distance_method: str = None,
-                 url: str = None, api_key: str = None):
-        """
-        Initialize Qdrant provider
-        
-        Args:
-            db_path: Local path for Qdrant (deprecated, use url/api_key for cloud)
-            distance_method: Distance method ('cosine' or 'dot')
-            url: Qdrant Cloud URL
-            api_key: Qdrant Cloud API key
-        """
-        self.client = None
-        self.db_path = db_path
-        self.url = url
-        self.api_key = api_key
-        self.distance_method = None
-
-        if distance_method == DistanceMethodEnums.COSINE.value:
-            self.distance_method = models.Distance.COSINE
-        elif distance_method == DistanceMethodEnums.DOT.value:
-            self.distance_method = models.Distance.DOT
-        else:
-            self.distance_method = models.Distance.COSINE  # Default
-
-        self.logger = logging.getLogger(__name__)
-
     def connect(self):
         """Connect to Qdrant (cloud or local)"""
         try:
-            if self.url and self.api_key:
-                # Connect to Qdrant Cloud
+            if self.url:
+                # Connect to Qdrant Cloud (or a local server, which needs no API key)
                 self.client = QdrantClient(
                     url=self.url,
                     api_key=self.api_key
                 )
-                self.logger.info(f"Connected to Qdrant Cloud: {self.url}")
+                self.logger.info(f"Connected to Qdrant: {self.url}")
             elif self.db_path:
                 # Connect to local Qdrant
                 self.client = QdrantClient(path=self.db_path)
@@ -89,27 +62,66 @@ class QdrantDBProvider(VectorDBInterface):
         
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
-        """Create a collection"""
+                                do_reset: bool = False,
+                                multi_tenant: bool = False,
+                                tenant_payload_m: int = 16):
+        """
+        Create a collection. A multi-tenant collection gets a keyword index on
+        the tenant payload key and per-tenant HNSW graphs (see hnsw_config).
+        """
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
         
         if not self.is_collection_existed(collection_name):
             _ = self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=embedding_size,
-                    distance=self.distance_method
-                )
+                vectors_config=self.vectors_config(embedding_size),
+                hnsw_config=self.hnsw_config(multi_tenant, tenant_payload_m),
+                quantization_config=self.quantization_config(),
             )
+
+            if multi_tenant:
+                _ = self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=TENANT_PAYLOAD_KEY,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+
             self.logger.info(f"Created collection: {collection_name}")
             return True
         
         return False
+
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        """Delete every point of one tenant from a shared collection"""
+        if not self.is_collection_existed(collection_name):
+            return True
+
+        try:
+            _ = self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=self.tenant_filter(tenant_id)),
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting tenant {tenant_id}: {e}")
+            return False
+
+    def count(self, collection_name: str, tenant_id: str = None) -> int:
+        """Exact number of points, optionally of one tenant only"""
+        if not self.is_collection_existed(collection_name):
+            return 0
+
+        return self.client.count(
+            collection_name=collection_name,
+            count_filter=self.tenant_filter(tenant_id),
+            exact=True,
+        ).count
     
     def insert_one(self, collection_name: str, text: str, vector: list,
                         metadata: dict = None, 
-                        record_id: str = None):
+                        record_id: str = None, chunk_id: str = None,
+                        tenant_id: str = None):
         """Insert a single record"""
         if not self.is_collection_existed(collection_name):
             self.logger.error(f"Cannot insert to non-existent collection: {collection_name}")
@@ -120,12 +132,9 @@ class QdrantDBProvider(VectorDBInterface):
                 collection_name=collection_name,
                 points=[
                     models.PointStruct(
-                        id=record_id if isinstance(record_id, int) else hash(record_id) % (2**63),
+                        id=self.to_point_id(record_id),
                         vector=vector,
-                        payload={
-                            "text": text, 
-                            "metadata": metadata
-                        }
+                        payload=self._build_payload(text, metadata, chunk_id, tenant_id)
                     )
                 ]
             )
@@ -136,64 +145,154 @@ class QdrantDBProvider(VectorDBInterface):
     
     def insert_many(self, collection_name: str, texts: list, 
                         vectors: list, metadata: list = None, 
-                        record_ids: list = None, batch_size: int = 50):
-        """Insert multiple records in batches"""
-        if metadata is None:
-            metadata = [None] * len(texts)
-
-        if record_ids is None:
-            record_ids = list(range(0, len(texts)))
-
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_points = [
-                models.PointStruct(
-                    id=batch_record_ids[x] if isinstance(batch_record_ids[x], int) else hash(str(batch_record_ids[x])) % (2**63),
-                    vector=batch_vectors[x],
-                    payload={
-                        "text": batch_texts[x], 
-                        "metadata": batch_metadata[x]
-                    }
-                )
-                for x in range(len(batch_texts))
-            ]
+                        record_ids: list = None, batch_size: int = 50,
+                        chunk_ids: list = None, tenant_id: str = None,
+                        bulk: bool = False, parallel: int = 1,
+                        token_counts: list = None):
+        """
+        Insert multiple records in batches. With bulk=True (inside a bulk load),
+        points go through the client's batch uploader without waiting for each
+        batch to be applied; end_bulk_load waits for them.
+        """
+        points = self._build_points(texts, vectors, metadata, record_ids, chunk_ids, tenant_id,
+                                   token_counts)
+
+        if bulk:
+            return self._upload_many(collection_name, points,
+                                     batch_size=batch_size, parallel=parallel)
 
+        for i in range(0, len(points), batch_size):
             try:
                 _ = self.client.upsert(
                     collection_name=collection_name,
-                    points=batch_points,
+                    points=points[i:i + batch_size],
                 )
             except Exception as e:
                 self.logger.error(f"Error inserting batch: {e}")
                 return False
 
         return True
+
+    def _upload_many(self, collection_name: str, points: list, batch_size: int, parallel: int):
+        try:
+            self.client.upload_points(
+                collection_name=collection_name,
+                points=points,
+                batch_size=batch_size,
+                parallel=parallel,
+                wait=False,
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error uploading points: {e}")
+            return False
+
+    def begin_bulk_load(self, collection_name: str):
+        """Stop HNSW indexing (indexing_threshold=0) while a large upload runs"""
+        if collection_name in self._bulk_loads:
+            return True
+
+        try:
+            info = self.client.get_collection(collection_name=collection_name)
+            indexing_threshold = info.config.optimizer_config.indexing_threshold
+
+            self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+            )
+            self._bulk_loads[collection_name] = indexing_threshold or DEFAULT_INDEXING_THRESHOLD
+            self.logger.info(f"Bulk load started: {collection_name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error starting bulk load: {e}")
+            return False
+
+    def end_bulk_load(self, collection_name: str, timeout_seconds: float = 600,
+                      poll_interval_seconds: float = 1.0):
+        """
+        Restore indexing and block until the collection is green again, i.e.
+        uploaded points are applied and the HNSW index is built.
+        """
+        indexing_threshold = self._bulk_loads.pop(collection_name, DEFAULT_INDEXING_THRESHOLD)
+
+        try:
+            self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+            )
+
+            deadline = time.monotonic() + timeout_seconds
+            while True:
+                status = self.client.get_collection(collection_name=collection_name).status
+
+                if status == models.CollectionStatus.GREEN:
+                    self.logger.info(f"Bulk load finished: {collection_name}")
+                    return True
+
+                if status == models.CollectionStatus.RED:
+                    self.logger.error(f"Collection {collection_name} failed to optimize after bulk load")
+                    return False
+
+                if status == models.CollectionStatus.GREY:
+                    # optimizations are pending until an update nudges them
+                    self.client.update_collection(
+                        collection_name=collection_name,
+                        optimizers_config=models.OptimizersConfigDiff(),
+                    )
+
+                if time.monotonic() > deadline:
+                    self.logger.error(f"Timed out waiting for {collection_name} to index after bulk load")
+                    return False
+
+                time.sleep(poll_interval_seconds)
+        except Exception as e:
+            self.logger.error(f"Error ending bulk load: {e}")
+            return False
+
+    def delete_many(self, collection_name: str, record_ids: list):
+        """Delete records by ID (missing IDs are ignored)"""
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return True
+
+        try:
+            _ = self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(
+                    points=[self.to_point_id(record_id) for record_id in record_ids]
+                ),
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting records: {e}")
+            return False
         
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
-        """Search by vector similarity"""
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                         tenant_id: str = None):
+        """Search by vector similarity (within one tenant of a shared collection if given)"""
         try:
             results = self.client.search(
                 collection_name=collection_name,
                 query_vector=vector,
+                query_filter=self.tenant_filter(tenant_id),
+                search_params=self.search_params(),
                 limit=limit
             )
 
-            if not results or len(results) == 0:
-                return None
-            
-            return [
-                RetrievedDocument(**{
-                    "score": result.score,
-                    "text": result.payload["text"],
-                })
-                for result in results
-            ]
+            return self._to_documents(results)
         except Exception as e:
             self.logger.error(f"Error searching: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                          tenant_id: str = None):
+        """Search for several query vectors in one search_batch round trip"""
+        try:
+            batch_results = self.client.search_batch(
+                collection_name=collection_name,
+                requests=self.search_requests(vectors=vectors, limit=limit, tenant_id=tenant_id),
+            )
+
+            return [self._to_documents(results) for results in batch_results]
+        except Exception as e:
+            self.logger.error(f"Error batch searching: {e}")
+            return None
@@ -0,0 +1,219 @@
+from qdrant_client import models
+from ..VectorDBEnums import DistanceMethodEnums, QuantizationEnums
+from models.db_schemes import RetrievedDocument
+import logging
+import uuid
+
+# Namespace for turning non-UUID string record IDs into stable point IDs
+POINT_ID_NAMESPACE = uuid.UUID("6f1d3c52-8a4e-5b0f-9c7d-2e4a1b3c5d6e")
+
+# Payload key holding the project in multi-tenant (shared) collections
+TENANT_PAYLOAD_KEY = "project_id"
+
+# Qdrant's default indexing_threshold (KB), restored after a bulk load if none was set
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+
+class QdrantProviderBase:
+    """Connection settings, collection layout and point building shared by the sync and async Qdrant providers"""
+
+    def __init__(self, db_path: str = None, distance_method: str = None,
+                 url: str = None, api_key: str = None,
+                 quantization: str = QuantizationEnums.NONE.value,
+                 quantization_always_ram: bool = True,
+                 vectors_on_disk: bool = False,
+                 hnsw_m: int = 16, hnsw_ef_construct: int = 100, hnsw_on_disk: bool = False,
+                 search_hnsw_ef: int = None, search_rescore: bool = True,
+                 search_oversampling: float = 2.0):
+        """
+        Initialize Qdrant provider
+
+        Args:
+            db_path: Local path for Qdrant (deprecated, use url/api_key for cloud)
+            distance_method: Distance method ('cosine' or 'dot')
+            url: Qdrant Cloud URL
+            api_key: Qdrant Cloud API key
+            quantization: 'none', 'scalar' (int8) or 'binary', for new collections
+            quantization_always_ram: Keep quantized vectors in RAM
+            vectors_on_disk: Store original vectors on disk (used for rescoring)
+            hnsw_m / hnsw_ef_construct / hnsw_on_disk: HNSW graph of new collections
+            search_hnsw_ef: HNSW ef at query time (None = Qdrant default)
+            search_rescore / search_oversampling: Over-fetch quantized candidates and
+                rescore them with the original vectors
+        """
+        self.client = None
+        self.db_path = db_path
+        self.url = url
+        self.api_key = api_key
+        self.distance_method = None
+
+        if quantization not in [ q.value for q in QuantizationEnums ]:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.vectors_on_disk = vectors_on_disk
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.hnsw_on_disk = hnsw_on_disk
+        self.search_hnsw_ef = search_hnsw_ef
+        self.search_rescore = search_rescore
+        self.search_oversampling = search_oversampling
+
+        if distance_method == DistanceMethodEnums.COSINE.value:
+            self.distance_method = models.Distance.COSINE
+        elif distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = models.Distance.DOT
+        else:
+            self.distance_method = models.Distance.COSINE  # Default
+
+        # collection name -> indexing_threshold to restore after a bulk load
+        self._bulk_loads = {}
+
+        self.logger = logging.getLogger(self.__class__.__module__)
+
+    @staticmethod
+    def to_point_id(record_id):
+        """
+        Qdrant accepts unsigned ints and UUIDs as point IDs. Other strings are
+        mapped through uuid5, which (unlike hash()) is stable across processes.
+        """
+        if isinstance(record_id, int):
+            return record_id
+        try:
+            return str(uuid.UUID(str(record_id)))
+        except ValueError:
+            return str(uuid.uuid5(POINT_ID_NAMESPACE, str(record_id)))
+
+    def vectors_config(self, embedding_size: int):
+        return models.VectorParams(
+            size=embedding_size,
+            distance=self.distance_method,
+            on_disk=self.vectors_on_disk,
+        )
+
+    def hnsw_config(self, multi_tenant: bool = False, tenant_payload_m: int = 16):
+        """
+        A multi-tenant collection gets per-tenant HNSW graphs (payload_m) instead
+        of one global graph (m=0), since every search is filtered by tenant.
+        """
+        hnsw_config = models.HnswConfigDiff(
+            m=self.hnsw_m,
+            ef_construct=self.hnsw_ef_construct,
+            on_disk=self.hnsw_on_disk,
+        )
+        if multi_tenant:
+            hnsw_config.payload_m = tenant_payload_m
+            hnsw_config.m = 0
+        return hnsw_config
+
+    def quantization_config(self):
+        if self.quantization == QuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        if self.quantization == QuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        return None
+
+    def search_params(self):
+        """Query-time HNSW ef and quantization rescoring, or None for the defaults"""
+        if self.search_hnsw_ef is None and self.quantization == QuantizationEnums.NONE.value:
+            return None
+
+        quantization = None
+        if self.quantization != QuantizationEnums.NONE.value:
+            quantization = models.QuantizationSearchParams(
+                rescore=self.search_rescore,
+                oversampling=self.search_oversampling,
+            )
+
+        return models.SearchParams(hnsw_ef=self.search_hnsw_ef, quantization=quantization)
+
+    def search_requests(self, vectors: list, limit: int, tenant_id: str = None):
+        """search_batch requests matching search_by_vector, one per vector"""
+        return [
+            models.SearchRequest(
+                vector=vector,
+                filter=self.tenant_filter(tenant_id),
+                params=self.search_params(),
+                limit=limit,
+                with_payload=True,
+            )
+            for vector in vectors
+        ]
+
+    @staticmethod
+    def tenant_filter(tenant_id: str = None):
+        if tenant_id is None:
+            return None
+
+        return models.Filter(must=[
+            models.FieldCondition(
+                key=TENANT_PAYLOAD_KEY,
+                match=models.MatchValue(value=tenant_id),
+            )
+        ])
+
+    @staticmethod
+    def _build_payload(text: str, metadata: dict, chunk_id: str = None, tenant_id: str = None,
+                       token_count: int = None) -> dict:
+        payload = {
+            "text": text,
+            "metadata": metadata,
+            "chunk_id": chunk_id,
+            # computed when the chunk was processed, saves counting at answer time
+            "token_count": token_count,
+        }
+        if tenant_id is not None:
+            payload[TENANT_PAYLOAD_KEY] = tenant_id
+        return payload
+
+    def _build_points(self, texts: list, vectors: list, metadata: list,
+                      record_ids: list, chunk_ids: list, tenant_id: str = None,
+                      token_counts: list = None):
+        """PointStructs for insert_many, filling in missing metadata, chunk and record IDs"""
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if token_counts is None:
+            token_counts = [None] * len(texts)
+
+        if chunk_ids is None:
+            chunk_ids = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        return [
+            models.PointStruct(
+                id=self.to_point_id(record_ids[x]),
+                vector=vectors[x],
+                payload=self._build_payload(texts[x], metadata[x], chunk_ids[x], tenant_id, token_counts[x])
+            )
+            for x in range(len(texts))
+        ]
+
+    @staticmethod
+    def _to_documents(results):
+        if not results or len(results) == 0:
+            return None
+
+        return [
+            RetrievedDocument(**{
+                "score": result.score,
+                "text": result.payload["text"],
+                "metadata": result.payload.get("metadata"),
+                "token_count": result.payload.get("token_count"),
+            })
+            for result in results
+        ]
@@ -1 +1,4 @@
-from .QdrantDBProvider import QdrantDBProvider
\ No newline at end of file
+from .QdrantDBProvider import QdrantDBProvider
+from .AsyncQdrantDBProvider import AsyncQdrantDBProvider
+from .LocalVectorDBProvider import LocalVectorDBProvider
+from .PgVectorDBProvider import PgVectorDBProvider
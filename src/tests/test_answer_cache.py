@@ -0,0 +1,99 @@
+import asyncio
+
+from stores.cache import AnswerCache, LRUAnswerCacheBackend
+from stores.cache.AnswerCacheBackendInterface import AnswerCacheBackendInterface
+
+
+class FailingBackend(AnswerCacheBackendInterface):
+    """Backend whose every call fails, like an unreachable Redis"""
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def get(self, key: str):
+        raise ConnectionError("backend unreachable")
+
+    async def set(self, key: str, value: dict, ttl_seconds: int = None):
+        raise ConnectionError("backend unreachable")
+
+    def get_stats(self) -> dict:
+        return {"backend": "failing"}
+
+
+def key(query: str = "What is RAG?", index_version: int = 1, **overrides) -> str:
+    parts = {
+        "project_id": "p1", "query": query, "limit": 5, "mode": "dense",
+        "generation_model_id": "model", "prompt_version": "v1", "index_version": index_version,
+    }
+    return AnswerCache.make_key(**{**parts, **overrides})
+
+
+def test_hit_on_the_same_normalized_question():
+    cache = AnswerCache(backend=LRUAnswerCacheBackend())
+
+    async def run():
+        await cache.set(key("What is RAG?"), {"answer": "a"})
+        return await cache.get(key("  what is   RAG? ")), await cache.get(key("What is BM25?"))
+
+    hit, miss = asyncio.run(run())
+
+    assert hit == {"answer": "a"} and miss is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_an_index_version_bump_makes_old_answers_unreachable():
+    backend = LRUAnswerCacheBackend()
+    cache = AnswerCache(backend=backend)
+
+    async def run():
+        await cache.set(key(index_version=1), {"answer": "before the push"})
+        assert await cache.get(key(index_version=1)) == {"answer": "before the push"}
+
+        # a push bumps the project's index version, which every key includes
+        assert await cache.get(key(index_version=2)) is None
+        await cache.set(key(index_version=2), {"answer": "after the push"})
+        return await cache.get(key(index_version=2))
+
+    assert asyncio.run(run()) == {"answer": "after the push"}
+    # the old entry is left for LRU/TTL to age out
+    assert backend.get_stats()["entries"] == 2
+
+
+def test_every_other_key_part_separates_answers():
+    base = key()
+    for override in ({"project_id": "p2"}, {"limit": 10}, {"mode": "hybrid"},
+                     {"generation_model_id": "other"}, {"prompt_version": "v2"}):
+        assert key(**override) != base
+
+
+def test_backend_errors_count_as_misses():
+    cache = AnswerCache(backend=FailingBackend())
+
+    async def run():
+        await cache.set(key(), {"answer": "a"})
+        return await cache.get(key())
+
+    assert asyncio.run(run()) is None
+    assert (cache.hits, cache.misses, cache.errors) == (0, 1, 2)
+    assert cache.get_stats()["backend"] == "failing"
+
+
+def test_lru_backend_evicts_and_expires():
+    backend = LRUAnswerCacheBackend(max_entries=2)
+
+    async def run():
+        await backend.set("a", {"answer": "a"})
+        await backend.set("b", {"answer": "b"})
+        await backend.get("a")
+        await backend.set("c", {"answer": "c"})
+        await backend.set("short", {"answer": "short"}, ttl_seconds=0.01)
+        await asyncio.sleep(0.02)
+        return [await backend.get(k) is not None for k in ("a", "b", "c", "short")]
+
+    # "b" was least recently used when "c" arrived, then "a" made room for "short"
+    assert asyncio.run(run()) == [False, False, True, False]
+    assert backend.get_stats()["evictions"] == 2
+    assert backend.get_stats()["expirations"] == 1
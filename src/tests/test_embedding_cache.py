@@ -0,0 +1,108 @@
+import importlib
+import itertools
+
+import pytest
+
+from stores.cache import EmbeddingCache
+
+# the package re-exports the class under the module's name
+embedding_cache_module = importlib.import_module("stores.cache.EmbeddingCache")
+
+DIMENSIONS = 4
+# 16 byte vector + 32 byte key + EmbeddingCache.ROW_OVERHEAD_BYTES
+ROW_BYTES = 4 * DIMENSIONS + 32 + EmbeddingCache.ROW_OVERHEAD_BYTES
+
+
+class FakeClock:
+    """One second later on every call, so LRU order never ties"""
+
+    def __init__(self):
+        self._ticks = itertools.count(1)
+
+    def time(self):
+        return float(next(self._ticks))
+
+
+def key(i: int) -> bytes:
+    return EmbeddingCache.make_key(model_id="model", task_type="document", embedding_size=DIMENSIONS,
+                                   text=f"text {i}")
+
+
+def vector(i: int) -> list:
+    return [float(i)] * DIMENSIONS
+
+
+def stored_bytes(cache: EmbeddingCache) -> int:
+    return cache.connection.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM embeddings").fetchone()[0]
+
+
+def stored_keys(cache: EmbeddingCache) -> set:
+    return {row[0] for row in cache.connection.execute("SELECT cache_key FROM embeddings")}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache_module, "time", FakeClock())
+    # room for 10 rows, evicting down to 9
+    cache = EmbeddingCache(db_path=str(tmp_path / "embeddings.db"), max_size_bytes=10 * ROW_BYTES)
+    cache.connect()
+    yield cache
+    cache.disconnect()
+
+
+def test_round_trip_and_hit_stats(cache):
+    cache.set_many([(key(1), vector(1)), (key(2), vector(2))])
+
+    found = cache.get_many([key(1), key(2), key(3), key(1)])
+
+    assert found == {key(1): vector(1), key(2): vector(2)}
+    assert cache.get_stats()["hits"] == 2 and cache.get_stats()["misses"] == 1
+
+
+def test_reinserting_a_key_does_not_count_it_twice(cache):
+    cache.set_many([(key(1), vector(1)), (key(2), vector(2))])
+    cache.set_many([(key(1), vector(10))])
+    cache.set_many([(key(3), vector(3)), (key(3), vector(30)), (key(2), vector(20))])
+
+    assert cache.get_stats()["size_bytes"] == 3 * ROW_BYTES == stored_bytes(cache)
+    assert cache.get_many([key(1), key(3)]) == {key(1): vector(10), key(3): vector(30)}
+
+
+def test_filling_past_the_budget_evicts_the_least_recently_used(cache):
+    for i in range(10):
+        cache.set_many([(key(i), vector(i))])
+    assert cache.get_stats()["evictions"] == 0
+    assert cache.get_stats()["size_bytes"] == 10 * ROW_BYTES == stored_bytes(cache)
+
+    cache.set_many([(key(10), vector(10))])
+
+    # over the budget: the two oldest go, leaving 9 rows (EVICTION_TARGET_RATIO)
+    assert stored_keys(cache) == {key(i) for i in range(2, 11)}
+    assert cache.get_stats()["evictions"] == 2
+    assert cache.get_stats()["size_bytes"] == 9 * ROW_BYTES == stored_bytes(cache)
+
+    # a lookup makes key 2 the most recently used, so key 3 is next out
+    cache.get_many([key(2)])
+    cache.set_many([(key(11), vector(11)), (key(12), vector(12))])
+
+    assert key(2) in stored_keys(cache)
+    assert key(3) not in stored_keys(cache) and key(4) not in stored_keys(cache)
+    assert cache.get_stats()["size_bytes"] == stored_bytes(cache) <= cache.max_size_bytes
+
+
+def test_a_batch_larger_than_the_budget_keeps_the_accounting_right(cache):
+    cache.set_many([(key(i), vector(i)) for i in range(25)])
+
+    assert cache.get_stats()["size_bytes"] == stored_bytes(cache) == 9 * ROW_BYTES
+
+
+def test_size_is_read_back_on_reopen(cache, tmp_path):
+    cache.set_many([(key(i), vector(i)) for i in range(4)])
+    cache.disconnect()
+
+    reopened = EmbeddingCache(db_path=str(tmp_path / "embeddings.db"), max_size_bytes=10 * ROW_BYTES)
+    reopened.connect()
+    try:
+        assert reopened.get_stats()["size_bytes"] == 4 * ROW_BYTES
+    finally:
+        reopened.disconnect()
@@ -0,0 +1,178 @@
+import asyncio
+import random
+import time
+
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler, ProviderBudgets
+from stores.llm.providers.FakeProvider import FakeProvider
+
+
+class RecordingProvider(FakeProvider):
+    """Fake provider that records the size of every batch and how many ran at once"""
+
+    EMBEDDING_MAX_BATCH_SIZE = 8
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.set_embedding_model("fake-embedding", embedding_size=8)
+        self.batch_sizes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        self.batch_sizes.append(len(texts))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().aembed_batch(texts=texts, document_type=document_type)
+        finally:
+            self.in_flight -= 1
+
+
+class RecordingScheduler(EmbeddingScheduler):
+    """Scheduler that records the attempt of every backoff"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.backoff_attempts = []
+
+    def get_backoff_delay(self, attempt: int, retry_after: float = None) -> float:
+        self.backoff_attempts.append(attempt)
+        return super().get_backoff_delay(attempt=attempt, retry_after=retry_after)
+
+
+def texts(count: int, length: int = 20):
+    return [f"text {i} ".ljust(length, "x") for i in range(count)]
+
+
+def test_embeds_in_input_order_with_provider_batches():
+    provider = RecordingProvider()
+    scheduler = EmbeddingScheduler(provider)
+
+    inputs = texts(20)
+    vectors = asyncio.run(scheduler.embed_batch(inputs))
+
+    assert vectors == [provider._vector_for(text) for text in inputs]
+    assert provider.batch_sizes == [8, 8, 4]
+
+
+def test_concurrency_limit_holds():
+    provider = RecordingProvider(latency_seconds=0.05)
+    scheduler = EmbeddingScheduler(provider, max_concurrency=3)
+    # smaller batches than the provider allows, so there is work for more than 3 calls
+    scheduler.budget.batch_size = 2
+
+    vectors = asyncio.run(scheduler.embed_batch(texts(40)))
+
+    assert len(vectors) == 40
+    assert provider.max_in_flight == 3
+
+
+def test_concurrency_limit_is_shared_through_the_registry():
+    provider = RecordingProvider(latency_seconds=0.05)
+    budgets = ProviderBudgets()
+    first = EmbeddingScheduler(provider, max_concurrency=2, budgets=budgets)
+    second = EmbeddingScheduler(provider, max_concurrency=2, budgets=budgets)
+    assert first.budget is second.budget
+    first.budget.batch_size = 2
+
+    async def run():
+        return await asyncio.gather(first.embed_batch(texts(16)), second.embed_batch(texts(16)))
+
+    results = asyncio.run(run())
+
+    assert [len(vectors) for vectors in results] == [16, 16]
+    assert provider.max_in_flight == 2
+
+
+def test_requests_per_minute_budget_is_enforced():
+    provider = RecordingProvider()
+    # 600 RPM refills one request every 0.1 s
+    scheduler = EmbeddingScheduler(provider, max_concurrency=4, requests_per_minute=600)
+    scheduler.budget.batch_size = 1
+
+    async def run():
+        # another caller on the same key has used this minute's requests
+        await scheduler.budget.requests.acquire(scheduler.budget.requests.capacity)
+        started_at = time.monotonic()
+        vectors = await scheduler.embed_batch(texts(5))
+        return vectors, time.monotonic() - started_at
+
+    vectors, elapsed = asyncio.run(run())
+
+    assert len(vectors) == 5
+    assert elapsed >= 0.45
+
+
+def test_tokens_per_minute_budget_is_enforced():
+    provider = RecordingProvider()
+    # 60000 TPM refills 1000 tokens a second; each text is ~100 estimated tokens
+    scheduler = EmbeddingScheduler(provider, max_concurrency=4, tokens_per_minute=60000)
+    scheduler.budget.batch_size = 1
+    inputs = texts(5, length=400)
+    assert scheduler.estimate_tokens(inputs[0]) == 101
+
+    async def run():
+        await scheduler.budget.tokens.acquire(scheduler.budget.tokens.capacity)
+        started_at = time.monotonic()
+        vectors = await scheduler.embed_batch(inputs)
+        return vectors, time.monotonic() - started_at
+
+    vectors, elapsed = asyncio.run(run())
+
+    assert len(vectors) == 5
+    assert elapsed >= 0.45
+
+
+def test_rate_limited_batches_are_retried_with_backoff():
+    random.seed(3)
+    provider = RecordingProvider(rate_limit_error_rate=0.4)
+    scheduler = RecordingScheduler(provider, max_retries=10, backoff_base_seconds=0.001)
+
+    inputs = texts(40)
+    vectors = asyncio.run(scheduler.embed_batch(inputs))
+
+    assert vectors == [provider._vector_for(text) for text in inputs]
+    assert provider.rate_limited_calls > 0
+    assert scheduler.budget.stats["rate_limited"] == provider.rate_limited_calls
+    assert scheduler.budget.stats["retries"] == provider.rate_limited_calls
+    assert len(scheduler.backoff_attempts) == provider.rate_limited_calls
+
+
+def test_gives_up_after_max_retries():
+    provider = RecordingProvider(rate_limit_error_rate=1.0)
+    scheduler = RecordingScheduler(provider, max_retries=3, backoff_base_seconds=0.001)
+
+    assert asyncio.run(scheduler.embed_batch(texts(1))) is None
+    # each retry backs off from a ceiling twice the previous one
+    assert scheduler.backoff_attempts == [0, 1, 2]
+    assert provider.rate_limited_calls == 4
+    assert scheduler.budget.stats["failed"] == 1
+
+
+def test_backoff_delay_is_jittered_under_a_growing_ceiling_and_honours_retry_after():
+    scheduler = EmbeddingScheduler(RecordingProvider(), backoff_base_seconds=1.0, backoff_max_seconds=5.0)
+
+    for attempt, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 5.0), (8, 5.0)]:
+        delays = [scheduler.get_backoff_delay(attempt=attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+    assert scheduler.get_backoff_delay(attempt=0, retry_after=7.0) >= 7.0
+
+
+def test_batch_size_shrinks_after_errors_and_grows_back():
+    provider = RecordingProvider(rate_limit_error_rate=1.0)
+    scheduler = EmbeddingScheduler(provider, max_concurrency=1, max_retries=3, backoff_base_seconds=0.001)
+
+    assert asyncio.run(scheduler.embed_batch(texts(8))) is None
+    # each rate limited batch halves the size its retry is split to
+    assert provider.batch_sizes[:4] == [8, 4, 2, 1]
+    assert set(provider.batch_sizes[4:]) == {1}
+    assert scheduler.budget.batch_size == 1
+
+    provider.rate_limit_error_rate = 0.0
+    vectors = asyncio.run(scheduler.embed_batch(texts(12)))
+
+    assert len(vectors) == 12
+    # one more text per batch after every ProviderBudget.GROW_AFTER_SUCCESSES successes
+    assert scheduler.budget.batch_size == 3
@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+
+import pytest
+
+from controllers.IndexPipeline import IndexPipeline, IndexPipelineError
+from models.db_schemes import DataChunk
+from stores.llm.providers.FakeProvider import FakeProvider
+
+
+class FakeVectorDB:
+    """Collection name -> point ID -> (vector, tenant), counting upserts per point"""
+
+    def __init__(self, latency_seconds: float = 0.0, fail_on_call: int = None):
+        self.latency_seconds = latency_seconds
+        self.fail_on_call = fail_on_call
+        self.collections = {}
+        self.upserts = {}
+        self.calls = 0
+
+    async def insert_many(self, collection_name: str, chunks: list, vectors: list, tenant_id: str = None):
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        if self.calls == self.fail_on_call:
+            return False
+
+        points = self.collections.setdefault(collection_name, {})
+        for chunk, vector in zip(chunks, vectors):
+            points[chunk.id] = (vector, tenant_id)
+            self.upserts[chunk.id] = self.upserts.get(chunk.id, 0) + 1
+        return True
+
+
+class FakeNLPController:
+    """The two NLPController methods the pipeline calls, on a fake embedder and vector DB"""
+
+    def __init__(self, embedder: FakeProvider, vectordb: FakeVectorDB, fail_embed_on_call: int = None):
+        self.embedder = embedder
+        self.vectordb = vectordb
+        self.fail_embed_on_call = fail_embed_on_call
+        self.embed_calls = 0
+
+    async def embed_chunks(self, chunks: list):
+        self.embed_calls += 1
+        if self.embed_calls == self.fail_embed_on_call:
+            return None
+        return await self.embedder.aembed_batch(texts=[c.chunk_text for c in chunks])
+
+    async def upsert_chunks(self, collection_name: str, chunks: list, vectors: list,
+                            tenant_id: str = None, bulk: bool = False):
+        return await self.vectordb.insert_many(collection_name=collection_name, chunks=chunks,
+                                               vectors=vectors, tenant_id=tenant_id)
+
+
+def make_embedder(latency_seconds: float = 0.0) -> FakeProvider:
+    embedder = FakeProvider(latency_seconds=latency_seconds)
+    embedder.set_embedding_model("fake-embedding", embedding_size=4)
+    return embedder
+
+
+def make_chunk(i: int) -> DataChunk:
+    return DataChunk(id=f"chunk-{i}", chunk_text=f"chunk text {i}", chunk_metadata={},
+                     chunk_order=i + 1, chunk_project_id="project", chunk_asset_id="asset")
+
+
+class ChunkPages:
+    """Async iterator over pages of chunks (endless when count is None), counting pages fetched"""
+
+    def __init__(self, count: int = None, page_size: int = 5, fail_on_page: int = None):
+        self.count = count
+        self.page_size = page_size
+        self.fail_on_page = fail_on_page
+        self.fetched = 0
+
+    async def __aiter__(self):
+        numbers = itertools.count() if self.count is None else iter(range(self.count))
+        while True:
+            page = [make_chunk(i) for i in itertools.islice(numbers, self.page_size)]
+            if not page:
+                return
+            if self.fetched == self.fail_on_page:
+                raise RuntimeError("chunk page query failed")
+            await asyncio.sleep(0)
+            self.fetched += 1
+            yield page
+
+
+def run_pipeline(pipeline: IndexPipeline, pages: ChunkPages, timeout: float = 5.0):
+    async def run():
+        inserted = await asyncio.wait_for(pipeline.run(chunk_pages=pages.__aiter__()), timeout)
+        # nothing left running once the pipeline returns
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        return inserted
+
+    return asyncio.run(run())
+
+
+def run_failing_pipeline(pipeline: IndexPipeline, pages: ChunkPages, error, timeout: float = 5.0):
+    async def run():
+        with pytest.raises(error):
+            await asyncio.wait_for(pipeline.run(chunk_pages=pages.__aiter__()), timeout)
+        # the failing stage cancelled the others
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(run())
+
+
+def test_every_chunk_is_embedded_and_upserted_once():
+    embedder, vectordb = make_embedder(latency_seconds=0.01), FakeVectorDB(latency_seconds=0.01)
+    upserted = []
+
+    async def on_upserted(chunks):
+        upserted.extend(c.id for c in chunks)
+
+    pipeline = IndexPipeline(FakeNLPController(embedder, vectordb), collection_name="collection",
+                             tenant_id="tenant", queue_size=1, embed_workers=3, upsert_workers=2,
+                             on_upserted=on_upserted)
+    pages = ChunkPages(count=103, page_size=10)
+
+    assert run_pipeline(pipeline, pages) == 103
+
+    points = vectordb.collections["collection"]
+    assert set(points) == {f"chunk-{i}" for i in range(103)}
+    assert set(vectordb.upserts.values()) == {1}
+    assert points["chunk-42"] == (embedder._vector_for("chunk text 42"), "tenant")
+    assert sorted(upserted) == sorted(points)
+
+    stats = pipeline.get_stats()["stages"]
+    assert [stats[stage]["items"] for stage in ("fetch", "embed", "upsert")] == [103, 103, 103]
+    assert stats["fetch"]["batches"] == 11
+
+
+def test_an_empty_project_finishes():
+    vectordb = FakeVectorDB()
+    pipeline = IndexPipeline(FakeNLPController(make_embedder(), vectordb), collection_name="collection")
+
+    assert run_pipeline(pipeline, ChunkPages(count=0)) == 0
+    assert vectordb.calls == 0
+
+
+def test_bounded_queues_hold_back_the_fetch_stage():
+    vectordb = FakeVectorDB(latency_seconds=0.05)
+    pipeline = IndexPipeline(FakeNLPController(make_embedder(), vectordb), collection_name="collection",
+                             queue_size=1, embed_workers=1, upsert_workers=1)
+    pages = ChunkPages(page_size=1)
+    behind = []
+
+    async def run():
+        task = asyncio.ensure_future(pipeline.run(chunk_pages=pages.__aiter__()))
+        for _ in range(10):
+            await asyncio.sleep(0.05)
+            behind.append(pages.fetched - vectordb.calls)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    # one page in each queue and one in each stage, however slow the upserts are
+    assert max(behind) <= 5
+
+
+def test_a_failing_embed_stage_cancels_the_others():
+    vectordb = FakeVectorDB()
+    controller = FakeNLPController(make_embedder(latency_seconds=0.01), vectordb, fail_embed_on_call=3)
+    pipeline = IndexPipeline(controller, collection_name="collection", queue_size=2, embed_workers=2)
+    # endless, so the pipeline only ends if the fetch stage is cancelled
+    pages = ChunkPages()
+
+    run_failing_pipeline(pipeline, pages, IndexPipelineError)
+
+    assert pages.fetched < 20
+    assert set(vectordb.upserts.values()) <= {1}
+
+
+def test_a_failing_upsert_stage_cancels_the_others():
+    vectordb = FakeVectorDB(latency_seconds=0.01, fail_on_call=2)
+    pipeline = IndexPipeline(FakeNLPController(make_embedder(), vectordb), collection_name="collection",
+                             upsert_workers=2)
+    pages = ChunkPages()
+
+    run_failing_pipeline(pipeline, pages, IndexPipelineError)
+
+    assert pages.fetched < 20
+
+
+def test_a_failing_fetch_stage_cancels_the_others():
+    # embedding a page takes longer than the timeout, so the error can't wait for in-flight pages
+    controller = FakeNLPController(make_embedder(latency_seconds=0.5), FakeVectorDB())
+    pipeline = IndexPipeline(controller, collection_name="collection")
+
+    run_failing_pipeline(pipeline, ChunkPages(fail_on_page=2), RuntimeError, timeout=0.4)
@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+
+from controllers.NLPController import NLPController
+from models.db_schemes import RetrievedDocument
+from stores.lexical import BM25Index, LexicalIndexStore, tokenize
+
+
+def make_chunk(text: str):
+    return SimpleNamespace(chunk_text=text, chunk_metadata={"text": text}, chunk_token_count=None)
+
+
+class FakeChunkModel:
+    """Yields the project's chunks in one page, optionally running a hook mid-build"""
+
+    def __init__(self, texts: list, during_build=None):
+        self.texts = texts
+        self.during_build = during_build
+        self.active_builds = 0
+        self.max_active_builds = 0
+
+    async def iter_project_chunks(self, project_id: str, page_size: int = 500):
+        self.active_builds += 1
+        self.max_active_builds = max(self.max_active_builds, self.active_builds)
+        try:
+            await asyncio.sleep(0.01)
+            if self.during_build:
+                self.during_build()
+            yield [make_chunk(text) for text in self.texts]
+        finally:
+            self.active_builds -= 1
+
+
+def test_tokenize_normalizes_arabic_variants_and_strips_article():
+    assert tokenize("المدرسة") == tokenize("مدرسه")
+    assert tokenize("إسلام") == tokenize("اسلام")
+    assert tokenize("مُعَلِّم") == tokenize("معلم")
+    assert tokenize("مـــدرسة") == tokenize("مدرسة")
+
+
+def test_tokenize_casefolds_and_maps_arabic_digits():
+    assert tokenize("Learning ١٢٣") == ["learning", "123"]
+
+
+def test_bm25_ranks_matching_documents_best_first():
+    index = BM25Index()
+    index.add("cooking pasta at home")
+    index.add("machine learning and deep learning")
+    index.add("learning to cook")
+
+    results = index.search("deep learning", limit=3)
+
+    assert [text for _, text, _, _ in results] == ["machine learning and deep learning", "learning to cook"]
+    assert results[0][0] > results[1][0] > 0
+
+
+def test_bm25_rare_terms_weigh_more():
+    index = BM25Index()
+    for i in range(5):
+        index.add(f"common words {i}")
+    index.add("common rare")
+
+    assert index.idf("rare") > index.idf("common")
+    assert index.search("rare", limit=1)[0][1] == "common rare"
+
+
+def test_bm25_empty_index_and_unknown_terms():
+    index = BM25Index()
+    assert index.search("anything") == []
+
+    index.add("something else")
+    assert index.search("anything") == []
+
+
+def test_reciprocal_rank_fusion_rewards_documents_in_both_lists():
+    def docs(*texts):
+        return [RetrievedDocument(text=text, score=1.0) for text in texts]
+
+    fused = NLPController.reciprocal_rank_fusion([docs("a", "b", "c"), docs("c", "d", "a")], k=60, limit=3)
+
+    assert [doc.text for doc in fused] == ["a", "c", "b"]
+    assert fused[0].score == 1 / 61 + 1 / 63
+
+
+def test_reciprocal_rank_fusion_counts_duplicates_once_per_list():
+    documents = [RetrievedDocument(text=text, score=1.0) for text in ("a", "a", "b")]
+
+    fused = NLPController.reciprocal_rank_fusion([documents], k=60, limit=2)
+
+    assert [(doc.text, doc.score) for doc in fused] == [("a", 1 / 61), ("b", 1 / 63)]
+
+
+def test_store_caches_built_index():
+    store = LexicalIndexStore()
+    chunk_model = FakeChunkModel(["alpha", "beta"])
+
+    async def run():
+        first = await store.get_index("p1", chunk_model)
+        second = await store.get_index("p1", chunk_model)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert store.builds == 1 and store.hits == 1
+
+
+def test_store_skips_caching_index_changed_mid_build():
+    store = LexicalIndexStore()
+    chunk_model = FakeChunkModel(["alpha"])
+    chunk_model.during_build = lambda: store.add_chunks("p1", [make_chunk("beta")])
+
+    async def run():
+        await store.get_index("p1", chunk_model)
+        chunk_model.during_build = None
+        await store.get_index("p1", chunk_model)
+
+    asyncio.run(run())
+
+    assert store.builds == 2
+
+
+def test_store_never_builds_a_project_twice_at_once():
+    store = LexicalIndexStore()
+    chunk_model = FakeChunkModel(["alpha"])
+    # every build is invalidated mid-way, so no build gets stored
+    chunk_model.during_build = lambda: store.invalidate("p1")
+
+    async def run():
+        first = [asyncio.ensure_future(store.get_index("p1", chunk_model)) for _ in range(3)]
+        await asyncio.sleep(0.015)
+        later = [asyncio.ensure_future(store.get_index("p1", chunk_model)) for _ in range(3)]
+        await asyncio.gather(*first, *later)
+
+    asyncio.run(run())
+
+    assert chunk_model.max_active_builds == 1
+    assert store.builds == 6
+    assert store._build_locks == {}
@@ -0,0 +1,213 @@
+import asyncio
+import time
+
+import pytest
+
+from stores.llm.LLMExceptions import LLMProviderError
+from stores.llm.LLMRouter import LatencyHistogram, LLMRouter
+from stores.llm.providers.FakeProvider import FakeProvider
+
+
+class TaggedProvider(FakeProvider):
+    """Fake provider whose answers start with its model id, optionally pausing between streamed words"""
+
+    def __init__(self, model_id: str, latency_seconds: float = 0.0, word_delay_seconds: float = 0.0, **kwargs):
+        super().__init__(latency_seconds=latency_seconds, **kwargs)
+        self.set_generation_model(model_id)
+        self.word_delay_seconds = word_delay_seconds
+        self.streams = []
+
+    def _answer_for(self, prompt: str, max_output_tokens: int = None):
+        return f"{self.generation_model_id} {prompt}"
+
+    def astream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                     temperature: float = None):
+        stream = self._stream(prompt=prompt, chat_history=chat_history)
+        self.streams.append(stream)
+        return stream
+
+    async def _stream(self, prompt: str, chat_history: list):
+        answer = await self.agenerate_text(prompt=prompt, chat_history=chat_history)
+        if not answer:
+            return
+
+        for i, word in enumerate(answer.split(" ")):
+            if i:
+                await asyncio.sleep(self.word_delay_seconds)
+            yield word if i == 0 else f" {word}"
+
+
+def make_router(*clients, **kwargs):
+    return LLMRouter(targets=[(client.generation_model_id, client) for client in clients], **kwargs)
+
+
+def collect(stream):
+    async def run():
+        return [text async for text in stream]
+    return run()
+
+
+def test_no_hedge_when_the_first_target_answers_in_time():
+    fast, backup = TaggedProvider("fast", latency_seconds=0.02), TaggedProvider("backup")
+    router = make_router(fast, backup, hedge_default_delay_seconds=0.5)
+
+    answer = asyncio.run(router.agenerate_text("hello"))
+
+    assert answer == "fast hello"
+    assert router.stats["hedged"] == 0
+    assert router.targets[1].stats["attempts"] == 0
+
+
+def test_hedge_fires_after_default_delay_and_cancels_the_slow_attempt():
+    slow, fast = TaggedProvider("slow", latency_seconds=2.0), TaggedProvider("fast", latency_seconds=0.05)
+    router = make_router(slow, fast, hedge_default_delay_seconds=0.2)
+
+    started_at = time.monotonic()
+    answer = asyncio.run(router.agenerate_text("hello"))
+    elapsed = time.monotonic() - started_at
+
+    assert answer == "fast hello"
+    assert 0.2 <= elapsed < 1.0
+    assert router.stats["hedged"] == 1 and router.stats["hedge_wins"] == 1
+    assert router.targets[0].stats["cancelled"] == 1
+    assert router.targets[1].stats["hedges"] == 1 and router.targets[1].stats["successes"] == 1
+
+
+def test_hedge_delay_follows_latency_percentile():
+    router = make_router(TaggedProvider("a"), hedge_min_samples=5, hedge_percentile=0.9,
+                         hedge_default_delay_seconds=10.0, hedge_min_delay_seconds=0.1)
+    histogram = router.targets[0].latency
+
+    assert router.hedge_delay(histogram) == 10.0
+
+    for seconds in (0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 3.0):
+        histogram.observe(seconds)
+    assert 0.2 <= router.hedge_delay(histogram) < 0.35
+
+    histogram.observe(3.0)
+    assert router.hedge_delay(histogram) >= 3.0
+
+
+def test_lost_hedges_keep_the_hedge_delay_above_the_primarys_latency():
+    slow, fast = TaggedProvider("slow", latency_seconds=0.3), TaggedProvider("fast", latency_seconds=0.01)
+    router = make_router(slow, fast, hedge_min_samples=1, hedge_default_delay_seconds=0.05,
+                         hedge_min_delay_seconds=0.05)
+
+    async def run():
+        for _ in range(8):
+            await router.agenerate_text("hello")
+
+    asyncio.run(run())
+
+    # each lost race records how long the primary had run, so the delay climbs to its real latency
+    assert router.targets[0].stats["cancelled"] >= 1
+    assert router.hedge_delay(router.targets[0].latency) >= 0.3
+    assert router.targets[0].stats["successes"] >= 1
+
+
+def test_latency_histogram_percentiles_and_decay():
+    histogram = LatencyHistogram(decay_every=5)
+    assert histogram.percentile(0.5) is None
+
+    for seconds in (0.1, 0.1, 0.1, 5.0):
+        histogram.observe(seconds)
+
+    assert histogram.percentile(0.5) < 0.2
+    assert histogram.percentile(0.99) >= 5.0
+
+    # counts are halved every 5 samples: 4 // 2 + 1 // 2
+    histogram.observe(0.1)
+    assert histogram.count == 2
+
+
+def test_fails_over_when_a_target_raises():
+    failing = TaggedProvider("failing", rate_limit_error_rate=1.0)
+    router = make_router(failing, TaggedProvider("good"))
+
+    assert asyncio.run(router.agenerate_text("hello")) == "good hello"
+    assert router.stats["failovers"] == 1
+    assert router.targets[0].stats["failures"] == 1
+
+
+def test_fails_over_on_an_empty_answer():
+    empty = FakeProvider()  # no generation model: answers None
+    router = LLMRouter(targets=[("empty", empty), ("good", TaggedProvider("good"))])
+
+    assert asyncio.run(router.agenerate_text("hello")) == "good hello"
+    assert router.targets[0].stats["failures"] == 1
+
+
+def test_reraises_the_last_error_when_every_target_fails():
+    router = make_router(TaggedProvider("a", rate_limit_error_rate=1.0),
+                         TaggedProvider("b", rate_limit_error_rate=1.0))
+
+    with pytest.raises(LLMProviderError) as error:
+        asyncio.run(router.agenerate_text("hello"))
+
+    assert error.value.status_code == 429
+    assert router.stats["failed"] == 1
+
+
+def test_caller_cancellation_cancels_every_attempt():
+    router = make_router(TaggedProvider("a", latency_seconds=5.0), TaggedProvider("b", latency_seconds=5.0),
+                         hedge_default_delay_seconds=0.05)
+
+    async def run():
+        task = asyncio.ensure_future(router.agenerate_text("hello"))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert [target.stats["cancelled"] for target in router.targets] == [1, 1]
+
+
+def test_stream_hedges_on_first_token_and_closes_the_loser():
+    slow, fast = TaggedProvider("slow", latency_seconds=2.0), TaggedProvider("fast", latency_seconds=0.05)
+    router = make_router(slow, fast, hedge_default_delay_seconds=0.2)
+
+    async def run():
+        texts = await collect(router.astream_text("one two"))
+        await asyncio.sleep(0.05)
+        return texts
+
+    assert "".join(asyncio.run(run())) == "fast one two"
+    assert router.targets[0].stats["cancelled"] == 1
+    assert slow.streams[0].ag_frame is None  # closed
+    assert router.targets[1].first_token_latency.count == 1
+
+
+def test_stream_stays_on_the_target_that_sent_the_first_token():
+    # first token quickly, then slow words: no hedge once text has arrived
+    primary = TaggedProvider("primary", latency_seconds=0.02, word_delay_seconds=0.2)
+    backup = TaggedProvider("backup")
+    router = make_router(primary, backup, hedge_default_delay_seconds=0.1)
+
+    texts = asyncio.run(collect(router.astream_text("one two")))
+
+    assert "".join(texts) == "primary one two"
+    assert backup.streams == []
+    assert router.stats["hedged"] == 0
+
+
+def test_stream_fails_over_before_the_first_token():
+    router = make_router(TaggedProvider("failing", rate_limit_error_rate=1.0), TaggedProvider("good"))
+
+    assert "".join(asyncio.run(collect(router.astream_text("hi")))) == "good hi"
+    assert router.stats["failovers"] == 1
+
+
+def test_sync_generate_fails_over():
+    router = make_router(TaggedProvider("failing", rate_limit_error_rate=1.0), TaggedProvider("good"))
+
+    assert router.generate_text("hi") == "good hi"
+    assert "".join(router.stream_text("hi")) == "good hi"
+
+
+def test_chat_history_is_formatted_per_target():
+    router = make_router(TaggedProvider("a"))
+    history = [router.construct_prompt("be brief", router.enums.SYSTEM.value)]
+
+    assert router._history_for(router.targets[0], history) == [{"role": "system", "content": "be brief"}]
@@ -0,0 +1,174 @@
+import numpy as np
+import pytest
+
+from stores.vectordb.providers.LocalVectorDBProvider import LocalVectorDBProvider
+
+DIMENSIONS = 8
+
+
+def unit(index: int) -> list:
+    vector = [0.0] * DIMENSIONS
+    vector[index % DIMENSIONS] = 1.0
+    return vector
+
+
+def random_vectors(count: int, seed: int = 0) -> list:
+    return np.random.default_rng(seed).normal(size=(count, DIMENSIONS)).tolist()
+
+
+def open_provider(path, **kwargs):
+    provider = LocalVectorDBProvider(db_path=str(path), **kwargs)
+    provider.connect()
+    return provider
+
+
+def insert(provider, collection_name: str, ids: list, vectors: list, tenant_id: str = None):
+    assert provider.insert_many(
+        collection_name=collection_name,
+        texts=[f"text {record_id}" for record_id in ids],
+        vectors=vectors,
+        metadata=[{"id": record_id} for record_id in ids],
+        record_ids=ids,
+        chunk_ids=[f"chunk-{record_id}" for record_id in ids],
+        token_counts=[len(str(record_id)) for record_id in ids],
+        tenant_id=tenant_id,
+    )
+
+
+@pytest.fixture
+def provider(tmp_path):
+    provider = open_provider(tmp_path)
+    provider.create_collection("docs", embedding_size=DIMENSIONS)
+    yield provider
+    provider.disconnect()
+
+
+def test_upsert_and_search(provider):
+    insert(provider, "docs", ids=[0, 1, 2], vectors=[unit(0), unit(1), unit(2)])
+
+    results = provider.search_by_vector("docs", vector=[0.1, 1.0] + [0.0] * (DIMENSIONS - 2), limit=2)
+
+    assert [doc.text for doc in results] == ["text 1", "text 0"]
+    assert results[0].score == pytest.approx(1.0 / np.sqrt(1.01))
+    assert results[0].metadata == {"id": 1} and results[0].token_count == 1
+    assert provider.count("docs") == 3
+
+
+def test_upsert_of_a_known_id_overwrites_its_row(provider):
+    insert(provider, "docs", ids=[0, 1], vectors=[unit(0), unit(1)])
+    insert(provider, "docs", ids=[0], vectors=[unit(3)])
+
+    assert provider.count("docs") == 2
+    assert provider.get_collection_info("docs")["rows"] == 2
+    assert provider.search_by_vector("docs", vector=unit(3), limit=1)[0].text == "text 0"
+    assert provider.search_by_vector("docs", vector=unit(0), limit=1)[0].score == pytest.approx(0.0)
+
+
+def test_an_id_repeated_in_one_batch_keeps_the_last_copy(provider, tmp_path):
+    assert provider.insert_many(collection_name="docs", texts=["first", "other", "last"],
+                                vectors=[unit(0), unit(1), unit(2)], record_ids=[7, 8, 7])
+
+    results = provider.search_by_vector("docs", vector=unit(0), limit=5)
+
+    assert provider.count("docs") == 2
+    assert provider.get_collection_info("docs")["rows"] == 2
+    assert sorted(doc.text for doc in results) == ["last", "other"]
+
+    provider.disconnect()
+    reopened = open_provider(tmp_path)
+    assert reopened.count("docs") == 2
+    assert reopened.search_by_vector("docs", vector=unit(2), limit=1)[0].text == "last"
+    reopened.disconnect()
+
+
+def test_delete(provider):
+    insert(provider, "docs", ids=[0, 1, 2], vectors=[unit(0), unit(1), unit(2)])
+
+    assert provider.delete_many("docs", record_ids=[1, 99])
+
+    assert provider.count("docs") == 2
+    assert "text 1" not in {doc.text for doc in provider.search_by_vector("docs", vector=unit(1), limit=5)}
+
+
+def test_deleting_many_rows_compacts_the_collection(provider):
+    ids = list(range(200))
+    vectors = random_vectors(200)
+    insert(provider, "docs", ids=ids, vectors=vectors)
+
+    provider.delete_many("docs", record_ids=ids[:100])
+
+    info = provider.get_collection_info("docs")
+    assert info["points_count"] == 100 and info["rows"] == 100
+    # every remaining point still finds itself first
+    for record_id in (100, 150, 199):
+        assert provider.search_by_vector("docs", vector=vectors[record_id], limit=1)[0].text == f"text {record_id}"
+
+    insert(provider, "docs", ids=[0], vectors=[vectors[0]])
+    assert provider.count("docs") == 101
+
+
+def test_reopen_replays_upserts_and_deletes(tmp_path):
+    provider = open_provider(tmp_path, dtype="float16")
+    provider.create_collection("docs", embedding_size=DIMENSIONS)
+    vectors = random_vectors(50)
+    insert(provider, "docs", ids=list(range(50)), vectors=vectors)
+    insert(provider, "docs", ids=[3], vectors=[vectors[40]])
+    provider.delete_many("docs", record_ids=[4])
+    provider.disconnect()
+
+    reopened = open_provider(tmp_path, dtype="float16")
+    try:
+        assert reopened.count("docs") == 49
+        assert reopened.get_collection_info("docs")["config"]["dtype"] == "float16"
+        assert [c.name for c in reopened.list_all_collections().collections] == ["docs"]
+
+        results = reopened.search_by_vector("docs", vector=vectors[40], limit=2)
+        assert sorted(doc.text for doc in results) == ["text 3", "text 40"]
+        assert "text 4" not in {doc.text for doc in reopened.search_by_vector("docs", vector=vectors[4], limit=5)}
+    finally:
+        reopened.disconnect()
+
+
+def test_tenant_filtering(provider):
+    insert(provider, "docs", ids=["a0", "a1"], vectors=[unit(0), unit(1)], tenant_id="a")
+    insert(provider, "docs", ids=["b0", "b1", "b2"], vectors=[unit(0), unit(1), unit(2)], tenant_id="b")
+
+    results = provider.search_by_vector("docs", vector=unit(0), limit=5, tenant_id="a")
+
+    assert [doc.text for doc in results] == ["text a0", "text a1"]
+    assert provider.count("docs", tenant_id="a") == 2
+    assert provider.count("docs", tenant_id="b") == 3
+    assert provider.search_by_vector("docs", vector=unit(0), limit=5, tenant_id="missing") is None
+
+    provider.delete_tenant("docs", tenant_id="a")
+
+    assert provider.count("docs", tenant_id="a") == 0
+    assert provider.count("docs") == 3
+    assert provider.search_by_vector("docs", vector=unit(0), limit=5, tenant_id="a") is None
+
+
+def test_batch_search_and_growth_past_the_initial_capacity(provider):
+    vectors = random_vectors(1500, seed=1)
+    insert(provider, "docs", ids=list(range(1500)), vectors=vectors)
+
+    results = provider.search_by_vectors("docs", vectors=[vectors[0], vectors[1499]], limit=1)
+
+    assert provider.get_collection_info("docs")["capacity"] == 2048
+    assert [docs[0].text for docs in results] == ["text 0", "text 1499"]
+
+
+def test_hnsw_search_for_large_collections(tmp_path):
+    pytest.importorskip("hnswlib")
+    provider = open_provider(tmp_path, hnsw_threshold=100)
+    provider.create_collection("docs", embedding_size=DIMENSIONS)
+    vectors = random_vectors(300, seed=2)
+    insert(provider, "docs", ids=list(range(300)), vectors=vectors)
+
+    try:
+        assert provider.search_by_vector("docs", vector=vectors[123], limit=1)[0].text == "text 123"
+        assert provider.get_collection_info("docs")["hnsw"]
+
+        provider.delete_many("docs", record_ids=[123])
+        assert "text 123" not in {doc.text for doc in provider.search_by_vector("docs", vector=vectors[123], limit=5)}
+    finally:
+        provider.disconnect()
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import random
+import uuid
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+import asyncpg
+import pytest
+
+from stores.postgres import PostgresProvider
+from stores.vectordb.providers.PgVectorDBProvider import PgVectorDBProvider
+
+# A Postgres with the vector extension available, e.g. postgresql://postgres@localhost/postgres
+DSN = os.environ.get("PGVECTOR_TEST_DSN")
+
+pytestmark = pytest.mark.skipif(not DSN, reason="set PGVECTOR_TEST_DSN to run the pgvector tests")
+
+DIMENSIONS = 8
+
+
+def near(direction: list, noise: float = 0.05) -> list:
+    return [value + random.uniform(-noise, noise) for value in direction]
+
+
+async def create_schema(schema: str):
+    """Chunk and embedding tables like migrations/004_pgvector.sql, in their own schema"""
+    connection = await asyncpg.connect(DSN)
+    await connection.execute(f"""
+        CREATE SCHEMA {schema};
+        CREATE TABLE {schema}.chunks (
+            id UUID PRIMARY KEY,
+            chunk_text TEXT NOT NULL,
+            chunk_metadata JSONB,
+            chunk_token_count INTEGER
+        );
+        CREATE TABLE {schema}.vector_collections (
+            name VARCHAR(255) PRIMARY KEY,
+            embedding_size INTEGER NOT NULL,
+            multi_tenant BOOLEAN NOT NULL DEFAULT FALSE
+        );
+        CREATE TABLE {schema}.chunk_embeddings (
+            collection_name VARCHAR(255) NOT NULL REFERENCES {schema}.vector_collections(name) ON DELETE CASCADE,
+            chunk_id UUID NOT NULL REFERENCES {schema}.chunks(id) ON DELETE CASCADE,
+            tenant_id VARCHAR(255),
+            embedding vector({DIMENSIONS}) NOT NULL,
+            indexed_at TIMESTAMPTZ DEFAULT NOW(),
+            PRIMARY KEY (collection_name, chunk_id)
+        );
+        CREATE INDEX ON {schema}.chunk_embeddings USING hnsw (embedding vector_cosine_ops);
+    """)
+    return connection
+
+
+def schema_provider(schema: str, **kwargs):
+    separator = "&" if "?" in DSN else "?"
+    settings = SimpleNamespace(
+        POSTGRES_DSN=DSN + separator + urlencode({"search_path": f"{schema},public"}),
+        POSTGRES_POOL_MIN_SIZE=1, POSTGRES_POOL_MAX_SIZE=2,
+        POSTGRES_COMMAND_TIMEOUT_SECONDS=60, POSTGRES_STATEMENT_CACHE_SIZE=100,
+    )
+    return PgVectorDBProvider(postgres_provider=PostgresProvider(settings), **kwargs)
+
+
+async def seed(vectordb: PgVectorDBProvider, collection_name: str, vectors: list, tenant_id: str = None):
+    chunk_ids = [str(uuid.uuid4()) for _ in vectors]
+    await vectordb.postgres_provider.pool.executemany(
+        "INSERT INTO chunks (id, chunk_text, chunk_token_count) VALUES ($1, $2, 1)",
+        [(chunk_id, f"{collection_name} {i}") for i, chunk_id in enumerate(chunk_ids)],
+    )
+    await vectordb.create_collection(collection_name=collection_name, embedding_size=DIMENSIONS)
+    assert await vectordb.insert_many(collection_name=collection_name, texts=[], vectors=vectors,
+                                      chunk_ids=chunk_ids, tenant_id=tenant_id, bulk=True)
+
+
+def pgvector_version() -> tuple:
+    async def run():
+        connection = await asyncpg.connect(DSN)
+        try:
+            await connection.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            return await connection.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        finally:
+            await connection.close()
+    return tuple(int(part) for part in asyncio.run(run()).split("."))
+
+
+# None leaves the iterative scan off, so only the exact re-run can fill short results
+@pytest.mark.parametrize("iterative_scan", ["relaxed_order", None])
+def test_small_collection_gets_limit_rows_next_to_a_large_one(iterative_scan):
+    if iterative_scan is not None and pgvector_version() < (0, 8):
+        pytest.skip("hnsw.iterative_scan needs pgvector 0.8+")
+
+    random.seed(7)
+    schema = f"pgvector_test_{uuid.uuid4().hex[:8]}"
+    big_direction = [1.0] + [0.0] * (DIMENSIONS - 1)
+    small_direction = [-1.0] + [0.0] * (DIMENSIONS - 1)
+
+    async def run():
+        admin = await create_schema(schema)
+        vectordb = schema_provider(schema, ef_search=10, iterative_scan=iterative_scan)
+        await vectordb.connect()
+        try:
+            await seed(vectordb, "big", [near(big_direction) for _ in range(3000)])
+            await seed(vectordb, "small", [near(small_direction) for _ in range(300)], tenant_id="t1")
+            await seed(vectordb, "tiny", [near(small_direction) for _ in range(3)])
+            # with statistics, the planner serves "small" searches from the HNSW index
+            await vectordb.end_bulk_load("big")
+
+            # the query is next to the big collection, so the index's nearest rows are all "big"
+            query = near(big_direction)
+            single = await vectordb.search_by_vector("small", vector=query, limit=5)
+            tenant = await vectordb.search_by_vector("small", vector=query, limit=5, tenant_id="t1")
+            batch = await vectordb.search_by_vectors("small", vectors=[query, small_direction], limit=5)
+            tiny = await vectordb.search_by_vector("tiny", vector=query, limit=5)
+            big = await vectordb.search_by_vector("big", vector=query, limit=5)
+            return single, tenant, batch, tiny, big
+        finally:
+            await vectordb.disconnect()
+            await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+            await admin.close()
+
+    single, tenant, batch, tiny, big = asyncio.run(run())
+
+    assert [doc.text.split()[0] for doc in single] == ["small"] * 5
+    assert len(tenant) == 5
+    assert [len(docs) for docs in batch] == [5, 5]
+    # fewer chunks than the limit returns all of them, best first
+    assert len(tiny) == 3
+    assert [doc.score for doc in tiny] == sorted((doc.score for doc in tiny), reverse=True)
+    assert len(big) == 5 and all(doc.text.startswith("big") for doc in big)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from stores.cache import SemanticAnswerCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def test_hit_above_threshold_and_miss_below():
+    cache = SemanticAnswerCache(threshold=0.95)
+    cache.set("p1", 1, "v", unit(1, 0, 0), {"answer": "a"})
+
+    value, similarity = cache.get("p1", 1, "v", unit(1, 0.1, 0))
+    assert value == {"answer": "a"}
+    assert similarity >= 0.95
+
+    assert cache.get("p1", 1, "v", unit(1, 1, 0)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_returns_the_most_similar_answer():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.set("p1", 1, "v", unit(1, 0, 0), {"answer": "x"})
+    cache.set("p1", 1, "v", unit(0, 1, 0), {"answer": "y"})
+
+    value, _ = cache.get("p1", 1, "v", unit(0.05, 1, 0))
+    assert value == {"answer": "y"}
+
+
+def test_variants_and_projects_are_isolated():
+    cache = SemanticAnswerCache(threshold=0.95)
+    cache.set("p1", 1, "limit=5", unit(1, 0, 0), {"answer": "a"})
+
+    assert cache.get("p1", 1, "limit=10", unit(1, 0, 0)) is None
+    assert cache.get("p2", 1, "limit=5", unit(1, 0, 0)) is None
+
+    cache.set("p1", 1, "limit=10", unit(1, 0, 0), {"answer": "b"})
+    assert cache.get("p1", 1, "limit=5", unit(1, 0, 0))[0] == {"answer": "a"}
+    assert cache.get("p1", 1, "limit=10", unit(1, 0, 0))[0] == {"answer": "b"}
+
+
+def test_replaces_least_recently_used_entry_when_full():
+    cache = SemanticAnswerCache(threshold=0.99, max_entries_per_project=2)
+    cache.set("p1", 1, "v", unit(1, 0, 0), {"answer": "x"})
+    cache.set("p1", 1, "v", unit(0, 1, 0), {"answer": "y"})
+    # x is used more recently than y
+    assert cache.get("p1", 1, "v", unit(1, 0, 0)) is not None
+
+    cache.set("p1", 1, "v", unit(0, 0, 1), {"answer": "z"})
+
+    assert cache.get("p1", 1, "v", unit(0, 1, 0)) is None
+    assert cache.get("p1", 1, "v", unit(1, 0, 0))[0] == {"answer": "x"}
+    assert cache.get("p1", 1, "v", unit(0, 0, 1))[0] == {"answer": "z"}
+    assert cache.get_stats()["entries"] == 2
+    assert cache.evictions == 1
+
+
+def test_grows_past_initial_capacity():
+    cache = SemanticAnswerCache(threshold=0.999, max_entries_per_project=64)
+    vectors = np.eye(40, dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        cache.set("p1", 1, "v", vector.tolist(), {"answer": i})
+
+    assert all(cache.get("p1", 1, "v", vector.tolist())[0] == {"answer": i} for i, vector in enumerate(vectors))
+
+
+def test_newer_index_version_drops_the_project():
+    cache = SemanticAnswerCache(threshold=0.95)
+    cache.set("p1", 1, "v", unit(1, 0, 0), {"answer": "old"})
+
+    assert cache.get("p1", 2, "v", unit(1, 0, 0)) is None
+    assert cache.invalidations == 1
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_stale_index_version_misses_without_dropping_newer_answers():
+    cache = SemanticAnswerCache(threshold=0.95)
+    cache.set("p1", 2, "v", unit(1, 0, 0), {"answer": "new"})
+
+    # a request that loaded the project just before the bump
+    assert cache.get("p1", 1, "v", unit(1, 0, 0)) is None
+    cache.set("p1", 1, "v", unit(0, 1, 0), {"answer": "stale"})
+
+    assert cache.invalidations == 0
+    assert cache.get("p1", 2, "v", unit(1, 0, 0))[0] == {"answer": "new"}
+    assert cache.get("p1", 2, "v", unit(0, 1, 0)) is None
+
+
+def test_least_recently_used_project_is_evicted():
+    cache = SemanticAnswerCache(threshold=0.95, max_projects=2)
+    for project_id in ("p1", "p2", "p3"):
+        cache.set(project_id, 1, "v", unit(1, 0, 0), {"answer": project_id})
+
+    assert cache.get("p1", 1, "v", unit(1, 0, 0)) is None
+    assert cache.get("p3", 1, "v", unit(1, 0, 0))[0] == {"answer": "p3"}
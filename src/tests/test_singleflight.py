@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from helpers.singleflight import SingleFlight
+
+
+class Counted:
+    """Async function that counts its runs and waits until released"""
+
+    def __init__(self, result="result", error: Exception = None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self, *args, **kwargs):
+        self.runs += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return (self.result, args, kwargs)
+
+
+def test_concurrent_identical_calls_run_once():
+    flight, fn = SingleFlight(), Counted()
+
+    async def run():
+        callers = [asyncio.ensure_future(flight.do("answer", "key", fn, 1, limit=5)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.get_stats()["answer"]["in_flight"] == 1
+        fn.release.set()
+        return await asyncio.gather(*callers)
+
+    results = asyncio.run(run())
+
+    assert fn.runs == 1
+    assert results == [("result", (1,), {"limit": 5})] * 5
+    stats = flight.get_stats()["answer"]
+    assert (stats["calls"], stats["executions"], stats["coalesced"], stats["in_flight"]) == (5, 1, 4, 0)
+    assert stats["coalesced_rate"] == 0.8
+
+
+def test_different_kinds_and_keys_run_separately():
+    flight, fn = SingleFlight(), Counted()
+
+    async def run():
+        callers = [
+            asyncio.ensure_future(flight.do(kind, key, fn))
+            for kind, key in (("answer", "a"), ("answer", "b"), ("search", "a"))
+        ]
+        await asyncio.sleep(0)
+        fn.release.set()
+        return await asyncio.gather(*callers)
+
+    asyncio.run(run())
+
+    assert fn.runs == 3
+
+
+def test_nothing_is_kept_after_the_call_finishes():
+    flight, fn = SingleFlight(), Counted()
+
+    async def run():
+        fn.release.set()
+        await flight.do("answer", "key", fn)
+        await flight.do("answer", "key", fn)
+
+    asyncio.run(run())
+
+    assert fn.runs == 2
+
+
+def test_a_cancelled_caller_leaves_the_shared_call_running_for_the_others():
+    flight, fn = SingleFlight(), Counted()
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("answer", "key", fn))
+        second = asyncio.ensure_future(flight.do("answer", "key", fn))
+        await asyncio.sleep(0.01)
+        assert fn.runs == 1
+
+        # the caller that started the call goes away, e.g. its client disconnected
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        fn.release.set()
+        return await second
+
+    assert asyncio.run(run()) == ("result", (), {})
+    assert fn.runs == 1 and not fn.cancelled
+    assert flight.get_stats()["answer"]["failed"] == 0
+
+
+def test_the_shared_call_finishes_even_when_every_caller_is_cancelled():
+    flight, fn = SingleFlight(), Counted()
+
+    async def run():
+        caller = asyncio.ensure_future(flight.do("answer", "key", fn))
+        await asyncio.sleep(0.01)
+        assert fn.runs == 1
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        fn.release.set()
+        # a new caller arriving while it still runs joins it
+        return await flight.do("answer", "key", fn)
+
+    assert asyncio.run(run()) == ("result", (), {})
+    assert fn.runs == 1 and not fn.cancelled
+
+
+def test_errors_reach_every_caller_and_are_not_kept():
+    flight, fn = SingleFlight(), Counted(error=ValueError("generation failed"))
+
+    async def run():
+        callers = [asyncio.ensure_future(flight.do("answer", "key", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        fn.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        fn.error = None
+        return results, await flight.do("answer", "key", fn)
+
+    results, retried = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retried == ("result", (), {})
+    assert fn.runs == 2
+    assert flight.get_stats()["answer"]["failed"] == 1